@@ -0,0 +1,179 @@
+"""
+Synthetic resume corpus generator
+Produces text, DOCX and PDF resumes in varied layouts and lengths for benchmarking
+
+Usage:
+    python -m benchmarks.corpus --out ./bench_corpus --count 300 --seed 7
+"""
+import argparse
+import json
+import os
+import random
+from typing import Dict, List
+
+FIRST_NAMES = ["Ava", "Liam", "Maya", "Noah", "Priya", "Diego", "Chen", "Fatima", "Oliver", "Zara",
+               "Kenji", "Amara", "Lucas", "Ingrid", "Mateo", "Aisha", "Ethan", "Sofia", "Ravi", "Hana"]
+LAST_NAMES = ["Patel", "Nguyen", "Garcia", "Okafor", "Schmidt", "Kim", "Rossi", "Haddad", "Silva",
+              "Johnson", "Tanaka", "Kowalski", "Ahmed", "Murphy", "Lopez", "Larsen", "Chen", "Mensah"]
+COMPANIES = ["Google", "Stripe", "Acme Corp", "Initech", "Globex", "Shopify", "Atlassian", "Datadog",
+             "Spotify", "Cloudflare", "Wayne Enterprises", "Umbrella Labs", "Hooli", "Pied Piper"]
+UNIVERSITIES = ["Stanford University", "University of Toronto", "Massachusetts Institute of Technology",
+                "University of Cambridge", "Georgia Institute of Technology", "ETH Zurich",
+                "University of Melbourne", "Carnegie Mellon University", "Imperial College London"]
+DEGREES = ["Bachelor of Science in Computer Science", "Master of Science in Data Science",
+           "Bachelor of Engineering in Software Engineering", "PhD in Machine Learning",
+           "Master of Business Administration"]
+TITLES = ["Software Engineer", "Senior Backend Engineer", "Data Scientist", "DevOps Engineer",
+          "Engineering Manager", "Machine Learning Engineer", "Full Stack Developer"]
+SKILLS = ["Python", "Java", "JavaScript", "TypeScript", "Go", "Rust", "React", "Django", "FastAPI",
+          "PostgreSQL", "MongoDB", "Redis", "AWS", "GCP", "Docker", "Kubernetes", "Terraform",
+          "TensorFlow", "PyTorch", "Pandas", "NumPy", "Machine Learning", "Leadership", "Agile"]
+VERBS = ["Developed", "Led", "Designed", "Implemented", "Built", "Architected", "Maintained", "Managed"]
+OBJECTS = ["a real-time billing pipeline", "the customer analytics platform", "internal developer tooling",
+           "a recommendation service", "the search infrastructure", "CI/CD workflows",
+           "a multi-region Kubernetes deployment", "data ingestion jobs processing 2TB daily"]
+VENUES = ["NeurIPS", "ICML", "ACL", "KDD", "SIGMOD", "VLDB", "EMNLP", "CVPR"]
+
+LAYOUTS = ["classic", "compact", "academic"]
+LENGTHS = {"short": 2, "medium": 5, "long": 12}
+
+
+def _bullets(rng: random.Random, count: int) -> List[str]:
+    return [
+        f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}"
+        for _ in range(count)
+    ]
+
+
+def build_resume_lines(rng: random.Random, layout: str, length: str) -> List[str]:
+    """Build resume text lines for a layout/length combination"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    email = f"{name.lower().replace(' ', '.')}@example.com"
+    phone = f"({rng.randint(200, 989)}) {rng.randint(200, 989)}-{rng.randint(1000, 9999)}"
+    skills = rng.sample(SKILLS, rng.randint(4, 12))
+    jobs = LENGTHS[length]
+
+    if layout == "compact":
+        lines = [f"{name} | {email} | {phone}", f"Skills: {', '.join(skills)}", ""]
+        for _ in range(jobs):
+            lines.append(f"{rng.choice(TITLES)} @ {rng.choice(COMPANIES)} ({rng.randint(2010, 2023)})")
+            lines.extend(f"- {bullet}" for bullet in _bullets(rng, 2))
+        lines.append(f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)}")
+        return lines
+
+    lines = [name, email, phone, "", "SUMMARY",
+             f"{rng.choice(TITLES)} with {rng.randint(2, 20)} years of experience.", "", "EXPERIENCE"]
+    for _ in range(jobs):
+        start = rng.randint(2005, 2020)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}, {start}-{start + rng.randint(1, 4)}")
+        lines.extend(_bullets(rng, rng.randint(2, 5)))
+        lines.append("")
+    lines.extend(["EDUCATION", rng.choice(DEGREES), f"{rng.choice(UNIVERSITIES)}, {rng.randint(2000, 2020)}", ""])
+    lines.extend(["SKILLS", ", ".join(skills)])
+
+    if layout == "academic":
+        lines.extend(["", "PUBLICATIONS"])
+        for index in range(jobs * 8):
+            lines.append(
+                f"[{index + 1}] {rng.choice(LAST_NAMES)}, {rng.choice(LAST_NAMES)} et al. "
+                f"On {rng.choice(OBJECTS)}. {rng.choice(VENUES)} {rng.randint(2008, 2024)}."
+            )
+    return lines
+
+
+def _pdf_escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path: str, lines: List[str], lines_per_page: int = 55) -> None:
+    """Write a minimal text-only PDF (Helvetica, one content stream per page)"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = []
+    page_ids = [4 + 2 * index for index in range(len(pages))]
+
+    objects.append("<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(f"<< /Type /Pages /Kids [{' '.join(f'{pid} 0 R' for pid in page_ids)}] /Count {len(pages)} >>")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for index, page_lines in enumerate(pages):
+        body = "BT /F1 10 Tf 50 780 Td 13 TL\n" + "".join(
+            f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines
+        ) + "ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_ids[index] + 1} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(body.encode('latin-1', 'replace'))} >>\nstream\n{body}\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1", "replace")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+
+    with open(path, "wb") as file:
+        file.write(output)
+
+
+def write_docx(path: str, lines: List[str]) -> None:
+    """Write a DOCX with one paragraph per line (headers styled as headings)"""
+    import docx
+
+    document = docx.Document()
+    for line in lines:
+        if line.isupper() and line.isalpha():
+            document.add_heading(line.title(), level=2)
+        else:
+            document.add_paragraph(line)
+    document.save(path)
+
+
+def generate_corpus(out_dir: str, count: int, seed: int = 7,
+                    formats: List[str] = ("txt", "docx", "pdf")) -> Dict:
+    """
+    Generate count resumes, cycling through formats, layouts and lengths
+
+    Returns:
+        Manifest dict (also written to <out_dir>/manifest.json)
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    files = []
+
+    for index in range(count):
+        file_format = formats[index % len(formats)]
+        layout = LAYOUTS[(index // len(formats)) % len(LAYOUTS)]
+        length = rng.choices(list(LENGTHS), weights=[5, 4, 1])[0]
+        lines = build_resume_lines(rng, layout, length)
+        name = f"resume_{index:05d}_{layout}_{length}.{file_format}"
+        path = os.path.join(out_dir, name)
+
+        if file_format == "pdf":
+            write_pdf(path, lines)
+        elif file_format == "docx":
+            write_docx(path, lines)
+        else:
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines))
+
+        files.append({"file": name, "format": file_format, "layout": layout, "length": length})
+
+    manifest = {"seed": seed, "count": count, "formats": list(formats), "files": files}
+    with open(os.path.join(out_dir, "manifest.json"), "w") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate a synthetic resume corpus")
+    arg_parser.add_argument("--out", default="./bench_corpus")
+    arg_parser.add_argument("--count", type=int, default=300)
+    arg_parser.add_argument("--seed", type=int, default=7)
+    arg_parser.add_argument("--formats", default="txt,docx,pdf")
+    args = arg_parser.parse_args()
+
+    result = generate_corpus(args.out, args.count, args.seed, args.formats.split(","))
+    print(f"Wrote {result['count']} resumes to {args.out}")
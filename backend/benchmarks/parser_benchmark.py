@@ -0,0 +1,233 @@
+"""
+Resume parsing throughput benchmark
+Measures resumes/second, per-stage p50/p99 latency and peak RSS for
+ResumeParser.parse, ResumeParser.parse_many and the Celery worker path
+
+Usage:
+    python -m benchmarks.corpus --out ./bench_corpus --count 300
+    python -m benchmarks.parser_benchmark --corpus ./bench_corpus --save benchmarks/baselines/local.json
+    python -m benchmarks.parser_benchmark --corpus ./bench_corpus --compare benchmarks/baselines/local.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List
+
+from ml_models.resume_parser.instrumentation import summarize_records
+
+MODES = ["parse", "parse_many", "celery"]
+STAGES = ["extraction", "nlp", "skills", "education", "experience"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """p50/p99/mean in milliseconds"""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def load_files(corpus_dir: str, limit: int = 0) -> List[str]:
+    with open(os.path.join(corpus_dir, "manifest.json")) as file:
+        manifest = json.load(file)
+    names = [entry["file"] for entry in manifest["files"]]
+    return names[:limit] if limit else names
+
+
+def _read(corpus_dir: str, name: str) -> bytes:
+    with open(os.path.join(corpus_dir, name), "rb") as file:
+        return file.read()
+
+
+def stage_summary(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Per-stage p50/p99 from the parser's own metrics records"""
+    samples = summarize_records(records)
+    ordered = STAGES + sorted(set(samples) - set(STAGES))
+    return {stage: summarize(samples[stage]) for stage in ordered if stage in samples}
+
+
+def run_mode(mode: str, corpus_dir: str, files: List[str], batch_size: int, use_cache: bool,
+             instrument: str, full_extraction: bool) -> Dict[str, Any]:
+    """Run one benchmark mode in the current process"""
+    latencies = []
+    records = []
+    os.environ["RESUME_PARSER_INSTRUMENT"] = instrument
+
+    if mode == "celery":
+        # Worker path: storage read + parse cache + parse, as parse_resume_task runs it.
+        # The profile UPDATE is excluded so no database is needed.
+        os.environ["RESUME_STORAGE_BACKEND"] = "local"
+        os.environ["RESUME_STORAGE_ROOT"] = corpus_dir
+        if not use_cache:
+            os.environ["PARSE_CACHE_BACKEND"] = "none"
+        from workers.tasks import resume_processing
+        from shared.storage import read_resume
+
+        started = time.perf_counter()
+        for name in files:
+            item_started = time.perf_counter()
+            resume_processing._parse_resume_bytes(read_resume(resume_processing.storage, name))
+            latencies.append(time.perf_counter() - item_started)
+        elapsed = time.perf_counter() - started
+        parser = resume_processing.get_parser()
+    else:
+        from ml_models.resume_parser.parser import ResumeParser
+
+        parser = ResumeParser(instrument=instrument)
+        payloads = [_read(corpus_dir, name) for name in files]
+
+        started = time.perf_counter()
+        if mode == "parse":
+            for data in payloads:
+                item_started = time.perf_counter()
+                records.append(parser.parse(data, full_extraction=full_extraction).get("metrics"))
+                latencies.append(time.perf_counter() - item_started)
+        else:
+            for offset in range(0, len(payloads), batch_size):
+                batch = payloads[offset:offset + batch_size]
+                item_started = time.perf_counter()
+                results = parser.parse_many(batch, full_extraction=full_extraction, batch_size=batch_size)
+                records.extend(result.get("metrics") for result in results)
+                latencies.extend([(time.perf_counter() - item_started) / len(batch)] * len(batch))
+        elapsed = time.perf_counter() - started
+
+    result = {
+        "resumes": len(files),
+        "seconds": round(elapsed, 3),
+        "resumes_per_second": round(len(files) / elapsed, 2) if elapsed else 0.0,
+        "latency": summarize(latencies),
+        "tiers": parser.tier_stats(),
+        "peak_rss_mb": peak_rss_mb()
+    }
+    if mode == "celery":
+        result["stage_histograms"] = resume_processing.stage_histograms.snapshot()
+    else:
+        result["stages"] = stage_summary(records)
+    return result
+
+
+def _child(queue, *args) -> None:
+    try:
+        queue.put(run_mode(*args))
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(mode: str, *args) -> Dict[str, Any]:
+    """Run a mode in a fresh interpreter so peak RSS is per mode"""
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(queue, mode, *args))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print throughput/latency deltas against a saved baseline"""
+    print(f"\nComparison with baseline {baseline['meta'].get('revision')} ({baseline['meta'].get('created_at')})")
+    print(f"{'mode':<12}{'metric':<22}{'baseline':>12}{'current':>12}{'delta':>10}")
+    for mode, result in current["modes"].items():
+        base = baseline["modes"].get(mode)
+        if not base or "error" in result or "error" in base:
+            continue
+        rows = [
+            ("resumes/s", base["resumes_per_second"], result["resumes_per_second"]),
+            ("p50 ms", base["latency"]["p50_ms"], result["latency"]["p50_ms"]),
+            ("p99 ms", base["latency"]["p99_ms"], result["latency"]["p99_ms"]),
+            ("peak RSS MB", base["peak_rss_mb"], result["peak_rss_mb"]),
+        ]
+        for metric, old, new in rows:
+            delta = f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+            print(f"{mode:<12}{metric:<22}{old:>12}{new:>12}{delta:>10}")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark resume parsing throughput")
+    arg_parser.add_argument("--corpus", default="./bench_corpus")
+    arg_parser.add_argument("--modes", default=",".join(MODES))
+    arg_parser.add_argument("--limit", type=int, default=0, help="Only use the first N resumes")
+    arg_parser.add_argument("--batch-size", type=int, default=32)
+    arg_parser.add_argument("--cache", action="store_true", help="Enable the parse cache on the Celery path")
+    arg_parser.add_argument("--instrument", default="timing", choices=["off", "timing", "memory"])
+    arg_parser.add_argument("--full", action="store_true", help="Force the spaCy tier for every resume")
+    arg_parser.add_argument("--save", help="Write results as a baseline JSON file")
+    arg_parser.add_argument("--compare", help="Compare against a baseline JSON file")
+    args = arg_parser.parse_args()
+
+    corpus_dir = os.path.abspath(args.corpus)
+    files = load_files(corpus_dir, args.limit)
+
+    report = {
+        "meta": {
+            "revision": _git_revision(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus": corpus_dir,
+            "resumes": len(files)
+        },
+        "modes": {}
+    }
+
+    for mode in args.modes.split(","):
+        print(f"Running {mode} on {len(files)} resumes...")
+        result = run_isolated(mode, corpus_dir, files, args.batch_size, args.cache,
+                              args.instrument, args.full)
+        report["modes"][mode] = result
+        if "error" in result:
+            print(f"  {mode} failed: {result['error']}")
+            continue
+        print(f"  {result['resumes_per_second']} resumes/s "
+              f"({result['resumes_per_second'] * 60:.0f}/min), "
+              f"p50 {result['latency']['p50_ms']} ms, p99 {result['latency']['p99_ms']} ms, "
+              f"peak RSS {result['peak_rss_mb']} MB, escalation {result['tiers']['escalation_rate']}")
+        for stage, stats in result.get("stages", {}).items():
+            print(f"    {stage:<12} p50 {stats['p50_ms']} ms  p99 {stats['p99_ms']} ms")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(report, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
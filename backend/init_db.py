@@ -3,6 +3,10 @@ Database initialization and seed data for TalentAI Pro
 
 Creates sample users, employers, candidates, jobs, and applications
 for testing and demonstration purposes.
+
+    python init_db.py            Drop, recreate and seed every table
+    python init_db.py --upgrade  Bring an existing database up to the models
+                                 without dropping data (shared/migrations.py)
 """
 
 from datetime import datetime, timedelta
@@ -33,6 +37,13 @@ def create_all_tables():
     print("✓ Created all tables")
 
 
+def upgrade_tables():
+    """Create missing tables and apply the schema migrations, keeping data"""
+    from shared.migrations import upgrade
+    for name in upgrade():
+        print(f"✓ Applied {name}")
+
+
 def create_seed_data(db: Session):
     """Create seed data for testing"""
     
@@ -380,6 +391,12 @@ def print_credentials():
 
 def main():
     """Main function"""
+    if "--upgrade" in sys.argv[1:]:
+        print("\n🔧 Upgrading TalentAI Pro Database...")
+        upgrade_tables()
+        print("\n✨ Database upgrade complete!\n")
+        return
+    
     print("\n🚀 Initializing TalentAI Pro Database...")
     print("="*60)
     
@@ -399,7 +416,7 @@ def main():
         print("2. Frontend is already running at http://localhost:8080")
         print("3. Login with any of the credentials above")
         print("4. Test the platform!\n")
-        
+    
     except Exception as e:
         print(f"\n❌ Error: {e}")
         db.rollback()
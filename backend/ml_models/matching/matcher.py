@@ -125,8 +125,8 @@ class JobCandidateMatcher:
         job_offer = job.salary_max
         
         if candidate_expectation <= job_offer:
-            # Candidate's expectation is within budget
-            diff_percent = (job_offer - candidate_expectation) / job_offer * 100
+            # Candidate's expectation is within budget (including jobs and
+            # candidates with no salary set)
             return 1.0, [f"Salary expectation: ${candidate_expectation:,} (within budget)"]
         else:
             # Candidate expects more
@@ -220,8 +220,8 @@ class JobCandidateMatcher:
                 **match_result
             })
         
-        # Sort by match score descending
-        matches.sort(key=lambda x: x["match_score"], reverse=True)
+        # Sort by match score descending (ties by id, so input order doesn't matter)
+        matches.sort(key=lambda x: (-x["match_score"], x["candidate_id"]))
         
         return matches[:top_k]
     
@@ -246,8 +246,8 @@ class JobCandidateMatcher:
                 **match_result
             })
         
-        # Sort by match score descending
-        matches.sort(key=lambda x: x["match_score"], reverse=True)
+        # Sort by match score descending (ties by id, so input order doesn't matter)
+        matches.sort(key=lambda x: (-x["match_score"], x["job_id"]))
         
         return matches[:top_k]
 
@@ -0,0 +1,274 @@
+"""
+Content-addressed cache for resume parse results
+Keys are SHA-256 of the file bytes plus the parser/taxonomy version, so a parser
+upgrade invalidates old entries without any explicit flush. The parse mode is
+part of the key too: a fast-tier (regex-only) result is never returned to a
+request that needs the spaCy tier.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+def content_hash(data: Any) -> str:
+    """SHA-256 hex digest of bytes/bytearray/memoryview or text"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+# Parse modes: "tiered" may stop at the fast tier, "full" always runs spaCy
+PARSE_MODES = ("tiered", "full")
+
+
+def parse_mode(full_extraction: bool = False, tiered: bool = True) -> str:
+    """Cache namespace for a parse request"""
+    return "full" if full_extraction or not tiered else "tiered"
+
+
+class MemoryParseCacheBackend:
+    """In-process LRU backend (single worker, tests)"""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            created_at, value = entry
+            if time.time() - created_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SQLiteParseCacheBackend:
+    """
+    On-disk backend shared by all worker processes on a host
+    Entries expire after ttl_seconds; the least recently read entries are
+    evicted once the table grows past max_entries
+    """
+
+    EVICT_EVERY = 100
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so open one per process
+        if self._conn is None or self._conn_pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_parse_cache_accessed ON parse_cache (accessed_at)")
+            conn.commit()
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, created_at FROM parse_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM parse_cache WHERE key = ?", (key,))
+                conn.commit()
+                return None
+            conn.execute("UPDATE parse_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._writes += 1
+            if self._writes % self.EVICT_EVERY == 0:
+                self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then the least recently used beyond max_entries"""
+        conn.execute("DELETE FROM parse_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        conn.execute(
+            "DELETE FROM parse_cache WHERE key IN ("
+            "SELECT key FROM parse_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+
+class RedisParseCacheBackend:
+    """
+    Redis backend shared across hosts
+    TTL is set per key; LRU eviction relies on the server's maxmemory-policy
+    (allkeys-lru or volatile-lru)
+    """
+
+    PREFIX = "parse_cache:"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        if redis is None:
+            raise RuntimeError("redis package is required for the Redis parse cache backend")
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.PREFIX + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set(self, key: str, value: str) -> None:
+        self.client.setex(self.PREFIX + key, self.ttl_seconds, value)
+
+
+class ParseCache:
+    """Parse result cache with hit-rate metrics"""
+
+    def __init__(self, backend: Any, version: str):
+        """
+        Args:
+            backend: Storage backend exposing get(key) / set(key, value)
+            version: Parser/taxonomy version folded into every key
+        """
+        self.backend = backend
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, digest: str, mode: str) -> str:
+        return f"{self.version}:{mode}:{digest}"
+
+    def get(self, digest: str, mode: str = "tiered") -> Optional[Dict[str, Any]]:
+        """Return a cached parse result for a content hash and parse mode, if any"""
+        try:
+            value = self.backend.get(self._key(digest, mode))
+        except Exception:
+            self.errors += 1
+            value = None
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def set(self, digest: str, result: Dict[str, Any], mode: str = "tiered") -> None:
+        """
+        Store a parse result for a content hash and the mode it was parsed in
+
+        A tiered parse that escalated to spaCy also answers full-mode lookups.
+        """
+        # Empty extractions are usually transient (timeouts, bad uploads)
+        if not result.get("confidence_score"):
+            return
+        modes = {mode, "full"} if result.get("tier") == "full" else {mode}
+        try:
+            value = json.dumps(result)
+            for key_mode in modes:
+                self.backend.set(self._key(digest, key_mode), value)
+        except Exception:
+            self.errors += 1
+
+    def get_or_parse(self, data: Any, parse: Callable[[Any], Dict[str, Any]],
+                     mode: str = "tiered") -> Tuple[Dict[str, Any], str]:
+        """
+        Return the cached result for data, parsing and caching it on a miss
+
+        Args:
+            data: Resume bytes (or text)
+            parse: Callable producing a parse result from data
+            mode: Parse mode of the request (see parse_mode)
+
+        Returns:
+            (parse result, content hash)
+        """
+        digest = content_hash(data)
+        result = self.get(digest, mode)
+        if result is None:
+            result = parse(data)
+            self.set(digest, result, mode)
+        return result, digest
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for metrics export"""
+        lookups = self.hits + self.misses
+        return {
+            "version": self.version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def build_parse_cache(version: str) -> Optional[ParseCache]:
+    """
+    Build the parse cache configured by environment variables
+
+    PARSE_CACHE_BACKEND: none | memory | sqlite | redis (default sqlite)
+    PARSE_CACHE_PATH: SQLite file path
+    PARSE_CACHE_TTL: Entry lifetime in seconds
+    PARSE_CACHE_MAX_ENTRIES: LRU bound for memory/sqlite backends
+    """
+    backend_name = os.getenv("PARSE_CACHE_BACKEND", "sqlite").lower()
+    ttl_seconds = int(os.getenv("PARSE_CACHE_TTL", 30 * 24 * 3600))
+    max_entries = int(os.getenv("PARSE_CACHE_MAX_ENTRIES", 100000))
+
+    if backend_name == "none":
+        return None
+    if backend_name == "memory":
+        backend = MemoryParseCacheBackend(ttl_seconds, max_entries)
+    elif backend_name == "redis":
+        backend = RedisParseCacheBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"), ttl_seconds)
+    elif backend_name == "sqlite":
+        backend = SQLiteParseCacheBackend(
+            os.getenv("PARSE_CACHE_PATH", "/tmp/talentai/parse_cache.sqlite3"), ttl_seconds, max_entries
+        )
+    else:
+        raise ValueError(f"Unknown PARSE_CACHE_BACKEND: {backend_name}")
+
+    return ParseCache(backend, version)
@@ -0,0 +1,272 @@
+"""
+Streaming document text extraction for resumes
+Yields page/paragraph text chunks and enforces page, character and time budgets
+so worst-case extraction latency stays bounded regardless of upload size
+
+The time budget is checked between pages, which truncates long documents but
+can't interrupt a single slow page or a pathological PDF header. A hard
+deadline (SIGALRM) backs it up and aborts extraction with ExtractionTimeout.
+Signals only reach the main thread, so code extracting on other threads (the
+embedded executor's pools) gets the between-page checks only.
+"""
+import io
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional
+
+import PyPDF2
+import docx
+
+# Magic bytes used to sniff the real document type
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# PDF readers accept junk before the header within the first 1KB
+SNIFF_BYTES = 1024
+
+# file_type hints that mean "a string argument is a path, not resume text"
+DOCUMENT_TYPES = ("pdf", "docx", "doc")
+
+
+class ExtractionError(Exception):
+    """Raised when a document cannot be decoded"""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Raised when extraction runs past the hard deadline"""
+
+
+@dataclass
+class ExtractionLimits:
+    """Budgets applied while extracting text from a single document"""
+    max_pages: int = int(os.getenv("RESUME_MAX_PAGES", 50))
+    max_chars: int = int(os.getenv("RESUME_MAX_CHARS", 200000))
+    max_seconds: float = float(os.getenv("RESUME_EXTRACTION_TIMEOUT", 10))
+    # Abort (rather than truncate) past this; 0 disables the hard deadline
+    hard_seconds: float = float(os.getenv("RESUME_EXTRACTION_HARD_TIMEOUT", 15))
+
+
+@dataclass
+class ExtractedText:
+    """Result of extracting text from a document"""
+    text: str
+    file_type: str
+    pages: int = 0
+    truncated: bool = False
+    truncation_reason: Optional[str] = None
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Read-only, seekable file object over a bytes-like buffer
+    Wraps bytes/bytearray/memoryview without copying the whole document
+    """
+
+    def __init__(self, data: Any):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._pos + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError("Negative seek position")
+        self._pos = position
+        return position
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        if end <= self._pos:
+            return b""
+        chunk = self._view[self._pos:end].tobytes()
+        self._pos = end
+        return chunk
+
+    def readinto(self, buffer: Any) -> int:
+        size = min(len(buffer), max(len(self._view) - self._pos, 0))
+        buffer[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+
+
+def sniff_file_type(header: bytes) -> str:
+    """Detect document type from its leading bytes"""
+    if PDF_MAGIC in header[:SNIFF_BYTES]:
+        return "pdf"
+    if header.startswith(ZIP_MAGIC):
+        return "docx"
+    if header.startswith(OLE_MAGIC):
+        return "doc"
+    return "text"
+
+
+@contextmanager
+def hard_deadline(seconds: float):
+    """
+    Raise ExtractionTimeout in the block once seconds have passed
+
+    No-op off the main thread or where SIGALRM is unavailable. An outer
+    ITIMER_REAL timer is restored afterwards.
+    """
+    if (seconds <= 0 or not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def _expired(signum, frame):
+        raise ExtractionTimeout(f"Extraction exceeded the {seconds}s hard deadline")
+
+    started = time.monotonic()
+    previous_handler = signal.signal(signal.SIGALRM, _expired)
+    previous_delay, previous_interval = signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+        if previous_delay:
+            remaining = max(previous_delay - (time.monotonic() - started), 0.001)
+            signal.setitimer(signal.ITIMER_REAL, remaining, previous_interval)
+
+
+def iter_pdf_pages(reader: PyPDF2.PdfReader, max_pages: int) -> Iterator[str]:
+    """Yield text page by page, stopping after max_pages"""
+    try:
+        for index, page in enumerate(reader.pages):
+            if index >= max_pages:
+                break
+            yield page.extract_text() or ""
+    except ExtractionTimeout:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Error extracting PDF text: {e}") from e
+
+
+def iter_docx_paragraphs(stream: BinaryIO) -> Iterator[str]:
+    """Yield text paragraph by paragraph"""
+    try:
+        document = docx.Document(stream)
+        for paragraph in document.paragraphs:
+            yield paragraph.text
+    except ExtractionTimeout:
+        raise
+    except Exception as e:
+        raise ExtractionError(f"Error extracting DOCX text: {e}") from e
+
+
+def _collect(chunks: Iterator[str], file_type: str, limits: ExtractionLimits,
+             count_pages: bool) -> ExtractedText:
+    """Consume chunks under the char/time budget and join them once"""
+    deadline = time.monotonic() + limits.max_seconds
+    parts = []
+    total_chars = 0
+    pages = 0
+    reason = None
+
+    for chunk in chunks:
+        pages += 1
+        remaining = max(limits.max_chars - total_chars, 0)
+        if len(chunk) > remaining:
+            parts.append(chunk[:remaining])
+            reason = "chars"
+            break
+        parts.append(chunk)
+        total_chars += len(chunk) + 1
+        if time.monotonic() > deadline:
+            reason = "time"
+            break
+
+    return ExtractedText(
+        text="\n".join(parts),
+        file_type=file_type,
+        pages=pages if count_pages else 0,
+        truncated=reason is not None,
+        truncation_reason=reason
+    )
+
+
+def _extract_stream(stream: BinaryIO, header: bytes, limits: ExtractionLimits) -> ExtractedText:
+    """Extract text from an open binary stream positioned at 0"""
+    file_type = sniff_file_type(header)
+
+    if file_type == "pdf":
+        try:
+            reader = PyPDF2.PdfReader(stream)
+            total_pages = len(reader.pages)
+        except ExtractionTimeout:
+            raise
+        except Exception as e:
+            raise ExtractionError(f"Error reading PDF: {e}") from e
+        result = _collect(iter_pdf_pages(reader, limits.max_pages), "pdf", limits, count_pages=True)
+        if not result.truncated and total_pages > limits.max_pages:
+            result.truncated = True
+            result.truncation_reason = "pages"
+        return result
+    if file_type == "docx":
+        return _collect(iter_docx_paragraphs(stream), "docx", limits, count_pages=False)
+    if file_type == "doc":
+        raise ExtractionError("Legacy .doc files are not supported")
+
+    raw = stream.read(limits.max_chars * 4)
+    text = raw.decode("utf-8", errors="ignore")
+    return _collect(iter([text]), "text", limits, count_pages=False)
+
+
+def extract_text(source: Any, file_type: Optional[str] = None,
+                 limits: Optional[ExtractionLimits] = None) -> ExtractedText:
+    """
+    Extract text from a resume document
+
+    Args:
+        source: File path, bytes/bytearray/memoryview, or plain resume text
+        file_type: Caller's hint. Only used to decide whether a str is a path;
+                   the real type is always sniffed from magic bytes
+        limits: Page/character/time budgets (defaults from environment)
+
+    Returns:
+        ExtractedText with the joined text and truncation metadata
+
+    Raises:
+        ExtractionTimeout: The hard deadline passed (main thread only)
+    """
+    limits = limits or ExtractionLimits()
+    hint = (file_type or "").lower()
+
+    if isinstance(source, str) and hint not in DOCUMENT_TYPES:
+        return _collect(iter([source]), "text", limits, count_pages=False)
+
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as file, hard_deadline(limits.hard_seconds):
+            header = file.read(SNIFF_BYTES)
+            file.seek(0)
+            return _extract_stream(file, header, limits)
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        stream = BufferReader(source)
+        header = stream.read(SNIFF_BYTES)
+        stream.seek(0)
+        with hard_deadline(limits.hard_seconds):
+            return _extract_stream(stream, header, limits)
+
+    raise ExtractionError(f"Unsupported resume source: {type(source).__name__}")
@@ -0,0 +1,160 @@
+"""
+Per-stage timing and memory instrumentation for ResumeParser
+Each instrumented parse carries a ParseMetrics record; workers aggregate the
+records into StageHistograms for export
+"""
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional
+
+INSTRUMENT_MODES = ("off", "timing", "memory")
+
+# Latency bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL_STAGE = nullcontext()
+
+
+class ParseMetrics:
+    """Stage durations, allocations and input sizes for one parse"""
+
+    def __init__(self, track_memory: bool = False):
+        self.track_memory = track_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.sizes: Dict[str, int] = {}
+        self._started = time.perf_counter()
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage; repeated stages accumulate"""
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(name, {"seconds": 0.0})
+            entry["seconds"] += time.perf_counter() - started
+            if self.track_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                entry["alloc_bytes"] = entry.get("alloc_bytes", 0) + max(current - before, 0)
+                entry["peak_bytes"] = max(entry.get("peak_bytes", 0), peak - before)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """Attribute an externally measured duration to a stage"""
+        entry = self.stages.setdefault(name, {"seconds": 0.0})
+        entry["seconds"] += seconds
+
+    def record(self, **sizes: int) -> None:
+        """Record input sizes (pages, characters, tokens)"""
+        self.sizes.update(sizes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_seconds": round(time.perf_counter() - self._started, 6),
+            "stages": {
+                name: {key: round(value, 6) if key == "seconds" else int(value) for key, value in entry.items()}
+                for name, entry in self.stages.items()
+            },
+            **self.sizes
+        }
+
+
+class NullParseMetrics:
+    """No-op stand-in used when instrumentation is off"""
+
+    def stage(self, name: str):
+        return _NULL_STAGE
+
+    def add_time(self, name: str, seconds: float) -> None:
+        pass
+
+    def record(self, **sizes: int) -> None:
+        pass
+
+
+NULL_METRICS = NullParseMetrics()
+
+
+def new_metrics(mode: str) -> Any:
+    """Metrics collector for an instrumentation mode"""
+    if mode == "off":
+        return NULL_METRICS
+    return ParseMetrics(track_memory=mode == "memory")
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus-compatible layout)"""
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = []
+        running = 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            running += count
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "sum": round(self.sum, 6), "count": self.count}
+
+
+class StageHistograms:
+    """Thread-safe aggregation of parse metrics records per stage"""
+
+    SIZE_BUCKETS = {
+        "pages": (1, 2, 3, 5, 10, 20, 50),
+        "characters": (1000, 2500, 5000, 10000, 25000, 50000, 100000, 200000),
+        "tokens": (250, 500, 1000, 2500, 5000, 10000, 25000, 50000),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Histogram] = {}
+        self.total = Histogram()
+        self.sizes = {name: Histogram(buckets) for name, buckets in self.SIZE_BUCKETS.items()}
+
+    def observe(self, record: Optional[Dict[str, Any]]) -> None:
+        if not record:
+            return
+        with self._lock:
+            self.total.observe(record.get("total_seconds", 0.0))
+            for name, entry in record.get("stages", {}).items():
+                self.stages.setdefault(name, Histogram()).observe(entry["seconds"])
+            for name, histogram in self.sizes.items():
+                if name in record:
+                    histogram.observe(record[name])
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total": self.total.snapshot(),
+                "stages": {name: histogram.snapshot() for name, histogram in self.stages.items()},
+                "sizes": {name: histogram.snapshot() for name, histogram in self.sizes.items()}
+            }
+
+
+def summarize_records(records: List[Dict[str, Any]]) -> Dict[str, List[float]]:
+    """Collect per-stage duration samples from a list of records"""
+    samples: Dict[str, List[float]] = {}
+    for record in records:
+        for name, entry in (record or {}).get("stages", {}).items():
+            samples.setdefault(name, []).append(entry["seconds"])
+    return samples
@@ -4,19 +4,119 @@ Extracts structured data from resumes (96% accuracy target)
 """
 import spacy
 import re
-from typing import Dict, List, Any, Optional
+import os
+import time
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
 from pathlib import Path
-import PyPDF2
-import docx
-from io import BytesIO
+
+from ml_models.resume_parser.extraction import (
+    ExtractedText, ExtractionError, ExtractionLimits, extract_text
+)
+from ml_models.resume_parser.instrumentation import (
+    INSTRUMENT_MODES, NULL_METRICS, ParseMetrics, new_metrics
+)
+from ml_models.resume_parser.taxonomy import SKILL_KEYWORDS, parser_version
+
+
+@dataclass
+class ChunkEntity:
+    """Named entity with offsets into the full resume text"""
+    text: str
+    label_: str
+    start_char: int
+    end_char: int
+
+
+@dataclass
+class ChunkSentence:
+    """Sentence with offsets into the full resume text and its entities"""
+    text: str
+    start_char: int
+    end_char: int
+    ents: List[ChunkEntity] = field(default_factory=list)
+
+
+class ChunkedDoc:
+    """
+    Merged NLP result of a long document processed in chunks
+    Exposes the subset of the spaCy Doc API the extractors use (sents, ents, len)
+    """
+    
+    def __init__(self, sents: List[ChunkSentence], ents: List[ChunkEntity], tokens: int, chunks: int):
+        self.sents = sents
+        self.ents = ents
+        self.tokens = tokens
+        self.chunks = chunks
+    
+    def __len__(self) -> int:
+        return self.tokens
+
+
+def split_sentence_chunks(text: str, max_chars: int) -> List[Tuple[int, str]]:
+    """
+    Split text into chunks of at most max_chars that end on sentence or line boundaries
+    
+    Returns:
+        List of (offset into text, chunk text)
+    """
+    boundaries = [match.end() for match in re.finditer(r'[.!?](?=\s)|\n', text)]
+    chunks = []
+    start = 0
+    last_boundary = 0
+    for boundary in boundaries + [len(text)]:
+        while boundary - start > max_chars:
+            # Cut at the last boundary that fits; fall back to whitespace for boundary-less runs
+            cut = last_boundary if last_boundary > start else text.rfind(" ", start, start + max_chars)
+            if cut <= start:
+                cut = start + max_chars
+            chunks.append((start, text[start:cut]))
+            start = cut
+        last_boundary = boundary
+    if start < len(text):
+        chunks.append((start, text[start:]))
+    return chunks
+
 
 class ResumeParser:
-    def __init__(self, model_path: Optional[str] = None):
+    def __init__(self, model_path: Optional[str] = None,
+                 extraction_limits: Optional[ExtractionLimits] = None,
+                 tiered: Optional[bool] = None,
+                 escalation_threshold: Optional[float] = None,
+                 instrument: Optional[str] = None,
+                 nlp_chunk_chars: Optional[int] = None,
+                 max_nlp_chars: Optional[int] = None):
         """
         Initialize Resume Parser
         Args:
             model_path: Path to custom trained spaCy model (if available)
+            extraction_limits: Page/character/time budgets for document extraction
+            tiered: Try the regex-only tier first and escalate to spaCy only when
+                    its confidence is below escalation_threshold
+            escalation_threshold: Minimum fast-tier confidence to skip spaCy
+            instrument: 'off', 'timing' (per-stage durations and input sizes) or
+                        'memory' (timing plus tracemalloc allocations per stage)
+            nlp_chunk_chars: Texts longer than this go through spaCy in
+                             sentence-aligned chunks via nlp.pipe
+            max_nlp_chars: Ceiling on characters sent to spaCy per resume
         """
+        self.extraction_limits = extraction_limits or ExtractionLimits()
+        self.tiered = tiered if tiered is not None else os.getenv("RESUME_PARSER_TIERED", "True") == "True"
+        self.escalation_threshold = (
+            escalation_threshold if escalation_threshold is not None
+            else float(os.getenv("RESUME_ESCALATION_THRESHOLD", 0.75))
+        )
+        
+        self.instrument = (instrument or os.getenv("RESUME_PARSER_INSTRUMENT", "off")).lower()
+        if self.instrument not in INSTRUMENT_MODES:
+            raise ValueError(f"Unknown instrumentation mode: {self.instrument}")
+        
+        self.nlp_chunk_chars = nlp_chunk_chars or int(os.getenv("RESUME_NLP_CHUNK_CHARS", 20000))
+        self.max_nlp_chars = max_nlp_chars or int(os.getenv("RESUME_MAX_NLP_CHARS", 200000))
+        
+        # Tier counters for escalation-rate metrics
+        self.tier_counts = {"fast": 0, "full": 0}
+
         # Load spaCy model (use custom trained model or default)
         try:
             if model_path and Path(model_path).exists():
@@ -30,20 +130,7 @@ class ResumeParser:
             self.nlp = None
         
         # Common skills database (simplified - would be 10K+ in production)
-        self.skill_keywords = {
-            # Programming Languages
-            "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "ruby", "php",
-            # Frameworks
-            "react", "angular", "vue", "django", "flask", "fastapi", "spring", "express", "nodejs",
-            # Databases
-            "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb",
-            # Cloud & DevOps
-            "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "gitlab ci", "github actions",
-            # ML/AI
-            "tensorflow", "pytorch", "scikit-learn", "pandas", "numpy", "jupyter", "machine learning", "deep learning",
-            # Soft Skills
-            "leadership", "communication", "teamwork", "problem-solving", "agile", "scrum"
-        }
+        self.skill_keywords = set(SKILL_KEYWORDS)
         
         # Email regex pattern
         self.email_pattern = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
@@ -62,39 +149,44 @@ class ResumeParser:
             "worked", "developed", "managed", "led", "created", "designed",
             "implemented", "built", "architected", "maintained"
         ]
+        
+        # Section headers recognised by the fast tier (a header sits on its own line)
+        self.section_pattern = re.compile(
+            r'^[ \t]*(?P<header>education|academic background|experience|work experience|'
+            r'professional experience|employment(?: history)?|skills|technical skills|projects|'
+            r'certifications|summary|objective)[ \t]*:?[ \t]*$',
+            re.IGNORECASE | re.MULTILINE
+        )
+        
+        # "Role at Company" / "Role @ Company" / "Role - Company" experience lines
+        self.role_pattern = re.compile(r'^(?P<title>.+?)\s+(?:at|@|-|\|)\s+(?P<company>[A-Z][\w&.,\' -]+)$')
+        
+        # Name line: 2-4 capitalised words, nothing else
+        self.name_pattern = re.compile(r"^[A-Z][a-zA-Z.'-]+(?: [A-Z][a-zA-Z.'-]+){1,3}$")
+    
+    @property
+    def version(self) -> str:
+        """Parser version combined with a fingerprint of the skill taxonomy"""
+        return parser_version(self.skill_keywords)
+    
+    def extract_document(self, file_path_or_bytes: Any, file_type: Optional[str] = None) -> ExtractedText:
+        """
+        Extract text from a PDF/DOCX/plain-text resume under the configured budgets
+        The document type is sniffed from magic bytes; file_type is only a hint
+        """
+        try:
+            return extract_text(file_path_or_bytes, file_type, self.extraction_limits)
+        except (ExtractionError, OSError) as e:
+            print(f"Error extracting resume text: {e}")
+            return ExtractedText(text="", file_type=file_type or "unknown")
     
     def extract_text_from_pdf(self, file_path_or_bytes: Any) -> str:
         """Extract text from PDF file"""
-        try:
-            if isinstance(file_path_or_bytes, (str, Path)):
-                with open(file_path_or_bytes, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    text = ""
-                    for page in pdf_reader.pages:
-                        text += page.extract_text()
-            else:
-                pdf_reader = PyPDF2.PdfReader(BytesIO(file_path_or_bytes))
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text()
-            return text
-        except Exception as e:
-            print(f"Error extracting PDF text: {e}")
-            return ""
+        return self.extract_document(file_path_or_bytes, "pdf").text
     
     def extract_text_from_docx(self, file_path_or_bytes: Any) -> str:
         """Extract text from DOCX file"""
-        try:
-            if isinstance(file_path_or_bytes, (str, Path)):
-                doc = docx.Document(file_path_or_bytes)
-            else:
-                doc = docx.Document(BytesIO(file_path_or_bytes))
-            
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
-            return text
-        except Exception as e:
-            print(f"Error extracting DOCX text: {e}")
-            return ""
+        return self.extract_document(file_path_or_bytes, "docx").text
     
     def extract_contact_info(self, text: str) -> Dict[str, Any]:
         """Extract email and phone number"""
@@ -117,12 +209,111 @@ class ResumeParser:
         
         return list(set(found_skills))  # Remove duplicates
     
-    def extract_education(self, text: str) -> List[Dict[str, Any]]:
+    def extract_sections(self, text: str) -> Dict[str, str]:
+        """Split resume text into sections keyed by normalised header name"""
+        sections = {}
+        matches = list(self.section_pattern.finditer(text))
+        for index, match in enumerate(matches):
+            header = match.group("header").lower()
+            if "education" in header or "academic" in header:
+                key = "education"
+            elif "experience" in header or "employment" in header:
+                key = "experience"
+            elif "skills" in header:
+                key = "skills"
+            else:
+                key = header
+            body_end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+            sections[key] = sections.get(key, "") + text[match.end():body_end]
+        return sections
+    
+    def _section_lines(self, sections: Dict[str, str], key: str, text: str) -> List[str]:
+        """Non-empty lines of a section, or of the whole text if it has no such header"""
+        body = sections.get(key, text if not sections else "")
+        return [line.strip() for line in body.splitlines() if line.strip()]
+    
+    def extract_name_heuristic(self, text: str) -> Optional[str]:
+        """Take the first line that looks like a person's name"""
+        for line in text.strip().splitlines()[:5]:
+            line = line.strip()
+            if self.name_pattern.match(line) and not self.section_pattern.match(line):
+                return line
+        return None
+    
+    def extract_education_heuristic(self, text: str, sections: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Education entries from institution lines in the education section"""
+        institution_words = ("university", "college", "institute", "school")
+        entries = []
+        lines = self._section_lines(sections, "education", text)
+        for index, line in enumerate(lines):
+            if any(word in line.lower() for word in institution_words):
+                # The degree line usually sits right above the institution
+                previous = lines[index - 1] if index > 0 else ""
+                description = f"{previous}\n{line}" if any(
+                    keyword in previous.lower() for keyword in self.education_keywords
+                ) else line
+                entries.append({
+                    "institution": line.split(",")[0].strip(),
+                    "description": description
+                })
+        return entries[:3]
+    
+    def extract_experience_heuristic(self, text: str, sections: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Experience entries from "Role at Company" lines in the experience section"""
+        if "experience" not in sections:
+            return []
+        entries = []
+        for line in self._section_lines(sections, "experience", text):
+            match = self.role_pattern.match(line)
+            if match:
+                entries.append({
+                    "company": match.group("company").split(",")[0].strip(),
+                    "title": match.group("title").strip(),
+                    "description": line
+                })
+        return entries[:5]
+    
+    def analyze(self, text: str) -> Any:
+        """
+        Run spaCy over resume text with bounded memory
+        
+        Short texts return a regular Doc. Longer ones are capped at max_nlp_chars,
+        split into sentence-aligned chunks, streamed through nlp.pipe and merged
+        into a ChunkedDoc with offsets relative to the full text; each chunk's Doc
+        is released before the next one is built.
+        """
+        text = text[:self.max_nlp_chars]
+        if len(text) <= self.nlp_chunk_chars:
+            return self.nlp(text)
+        
+        chunks = split_sentence_chunks(text, self.nlp_chunk_chars)
+        sents = []
+        ents = []
+        tokens = 0
+        docs = self.nlp.pipe((chunk for _, chunk in chunks), batch_size=1)
+        for (offset, _), doc in zip(chunks, docs):
+            tokens += len(doc)
+            doc_ents = [
+                ChunkEntity(ent.text, ent.label_, ent.start_char + offset, ent.end_char + offset)
+                for ent in doc.ents
+            ]
+            ents.extend(doc_ents)
+            for sent in doc.sents:
+                start, end = sent.start_char + offset, sent.end_char + offset
+                sents.append(ChunkSentence(
+                    text=sent.text,
+                    start_char=start,
+                    end_char=end,
+                    ents=[ent for ent in doc_ents if start <= ent.start_char < end]
+                ))
+        return ChunkedDoc(sents, ents, tokens, len(chunks))
+    
+    def extract_education(self, text: str, doc: Any = None) -> List[Dict[str, Any]]:
         """Extract education information"""
         if not self.nlp:
             return []
         
-        doc = self.nlp(text)
+        doc = doc if doc is not None else self.analyze(text)
         education_entries = []
         
         # Simple heuristic: look for education keywords and nearby organizations
@@ -139,12 +330,12 @@ class ResumeParser:
         
         return education_entries[:3]  # Return top 3
     
-    def extract_experience(self, text: str) -> List[Dict[str, Any]]:
+    def extract_experience(self, text: str, doc: Any = None) -> List[Dict[str, Any]]:
         """Extract work experience"""
         if not self.nlp:
             return []
         
-        doc = self.nlp(text)
+        doc = doc if doc is not None else self.analyze(text)
         experience_entries = []
         
         # Extract organizations
@@ -163,53 +354,21 @@ class ResumeParser:
         
         return experience_entries
     
-    def extract_name(self, text: str) -> Optional[str]:
+    def extract_name(self, text: str, doc: Any = None) -> Optional[str]:
         """Extract person's name (usually at the top)"""
         if not self.nlp:
             # Fallback: take first line
             lines = text.strip().split('\n')
             return lines[0].strip() if lines else None
         
-        doc = self.nlp(text[:500])  # Check first 500 chars
-        persons = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
+        if doc is None:
+            doc = self.nlp(text[:500])  # Check first 500 chars
+        persons = [ent.text for ent in doc.ents if ent.label_ == "PERSON" and ent.start_char < 500]
         return persons[0] if persons else None
     
-    def parse(self, resume_path_or_bytes: Any, file_type: str = "pdf") -> Dict[str, Any]:
-        """
-        Parse resume and extract structured data
-        
-        Args:
-            resume_path_or_bytes: File path or bytes
-            file_type: 'pdf' or 'docx'
-        
-        Returns:
-            Dictionary with parsed resume data
-        """
-        # Extract text based on file type
-        if file_type.lower() == "pdf":
-            text = self.extract_text_from_pdf(resume_path_or_bytes)
-        elif file_type.lower() in ["docx", "doc"]:
-            text = self.extract_text_from_docx(resume_path_or_bytes)
-        else:
-            text = resume_path_or_bytes if isinstance(resume_path_or_bytes, str) else ""
-        
-        if not text:
-            return {
-                "personal": {},
-                "education": [],
-                "experience": [],
-                "skills": [],
-                "confidence_score": 0.0
-            }
-        
-        # Extract all components
-        contact_info = self.extract_contact_info(text)
-        name = self.extract_name(text)
-        skills = self.extract_skills(text)
-        education = self.extract_education(text)
-        experience = self.extract_experience(text)
-        
-        # Calculate confidence score based on extracted info
+    def score_confidence(self, name: Optional[str], contact_info: Dict[str, Any], skills: List[str],
+                         education: List[Dict[str, Any]], experience: List[Dict[str, Any]]) -> float:
+        """Calculate confidence score based on extracted info"""
         confidence = 0.0
         if name:
             confidence += 0.2
@@ -223,7 +382,11 @@ class ResumeParser:
             confidence += 0.15
         if experience:
             confidence += 0.15
-        
+        return min(confidence, 1.0)  # Cap at 1.0
+    
+    def _build_result(self, name: Optional[str], contact_info: Dict[str, Any], skills: List[str],
+                      education: List[Dict[str, Any]], experience: List[Dict[str, Any]],
+                      tier: str) -> Dict[str, Any]:
         return {
             "personal": {
                 "name": name,
@@ -233,8 +396,200 @@ class ResumeParser:
             "education": education,
             "experience": experience,
             "skills": skills,
-            "confidence_score": min(confidence, 1.0)  # Cap at 1.0
+            "confidence_score": self.score_confidence(name, contact_info, skills, education, experience),
+            "tier": tier
+        }
+    
+    def parse_fast(self, text: str, metrics: Any = NULL_METRICS) -> Dict[str, Any]:
+        """Regex/heuristic-only tier: contacts, skills, sections and name-from-first-line"""
+        with metrics.stage("sections"):
+            sections = self.extract_sections(text)
+            name = self.extract_name_heuristic(text)
+        with metrics.stage("contacts"):
+            contact_info = self.extract_contact_info(text)
+        with metrics.stage("skills"):
+            skills = self.extract_skills(text)
+        with metrics.stage("education"):
+            education = self.extract_education_heuristic(text, sections)
+        with metrics.stage("experience"):
+            experience = self.extract_experience_heuristic(text, sections)
+        
+        return self._build_result(name, contact_info, skills, education, experience, tier="fast")
+    
+    def parse_full(self, text: str, fast_result: Optional[Dict[str, Any]] = None,
+                   doc: Any = None, metrics: Any = NULL_METRICS) -> Dict[str, Any]:
+        """
+        spaCy tier: one NLP pass feeds name, education and experience extraction
+        Heuristic results fill in whatever the model misses
+        """
+        fast_result = fast_result or self.parse_fast(text, metrics)
+        if not self.nlp:
+            return fast_result
+        
+        if doc is None:
+            with metrics.stage("nlp"):
+                doc = self.analyze(text)
+        metrics.record(tokens=len(doc))
+        if isinstance(doc, ChunkedDoc):
+            metrics.record(nlp_chunks=doc.chunks)
+        
+        personal = fast_result["personal"]
+        with metrics.stage("name"):
+            name = self.extract_name(text, doc) or personal["name"]
+        with metrics.stage("education"):
+            education = self.extract_education(text, doc) or fast_result["education"]
+        with metrics.stage("experience"):
+            experience = self.extract_experience(text, doc) or fast_result["experience"]
+        
+        return self._build_result(name, personal, fast_result["skills"], education, experience, tier="full")
+    
+    def parse_text(self, text: str, full_extraction: bool = False, metrics: Any = None) -> Dict[str, Any]:
+        """
+        Parse already-extracted resume text
+        
+        Args:
+            text: Resume text
+            full_extraction: Always run the spaCy tier, even when the fast tier is confident
+            metrics: Collector to record stages into (created from self.instrument if omitted)
+        
+        Returns:
+            Dictionary with parsed resume data (plus a "metrics" record when instrumented)
+        """
+        metrics = metrics if metrics is not None else new_metrics(self.instrument)
+        
+        if not text:
+            return self._attach_metrics({
+                "personal": {},
+                "education": [],
+                "experience": [],
+                "skills": [],
+                "confidence_score": 0.0
+            }, metrics)
+        
+        metrics.record(characters=len(text))
+        result = self.parse_fast(text, metrics)
+        if self._needs_escalation(result, full_extraction):
+            result = self.parse_full(text, result, metrics=metrics)
+        
+        self.tier_counts[result["tier"]] += 1
+        return self._attach_metrics(result, metrics)
+    
+    def _needs_escalation(self, result: Dict[str, Any], full_extraction: bool) -> bool:
+        return (
+            self.nlp is not None
+            and (full_extraction or not self.tiered or result["confidence_score"] < self.escalation_threshold)
+        )
+    
+    def _attach_metrics(self, result: Dict[str, Any], metrics: Any) -> Dict[str, Any]:
+        if isinstance(metrics, ParseMetrics):
+            result["metrics"] = metrics.to_dict()
+        return result
+    
+    def _extract_with_metrics(self, resume_path_or_bytes: Any, file_type: str, metrics: Any) -> str:
+        with metrics.stage("extraction"):
+            extracted = self.extract_document(resume_path_or_bytes, file_type)
+        metrics.record(pages=extracted.pages)
+        return extracted.text
+    
+    def tier_stats(self) -> Dict[str, Any]:
+        """Fast/full tier counters and the escalation rate"""
+        total = self.tier_counts["fast"] + self.tier_counts["full"]
+        return {
+            **self.tier_counts,
+            "escalation_rate": round(self.tier_counts["full"] / total, 4) if total else 0.0
         }
+    
+    def parse(self, resume_path_or_bytes: Any, file_type: str = "pdf",
+              full_extraction: bool = False, include_text: bool = False) -> Dict[str, Any]:
+        """
+        Parse resume and extract structured data
+        
+        Args:
+            resume_path_or_bytes: File path, bytes/memoryview, or resume text
+            file_type: 'pdf', 'docx' or 'text' (a hint; the real type is sniffed)
+            full_extraction: Always run the spaCy tier
+            include_text: Add the extracted text to the result as "resume_text"
+        
+        Returns:
+            Dictionary with parsed resume data
+        """
+        metrics = new_metrics(self.instrument)
+        text = self._extract_with_metrics(resume_path_or_bytes, file_type, metrics)
+        result = self.parse_text(text, full_extraction=full_extraction, metrics=metrics)
+        if include_text:
+            result["resume_text"] = text
+        return result
+    
+    def parse_many(self, resumes: Iterable[Any], file_type: str = "pdf",
+                   full_extraction: bool = False, batch_size: int = 32,
+                   include_text: bool = False) -> List[Dict[str, Any]]:
+        """
+        Parse a batch of resumes, running escalated ones through a single nlp.pipe pass
+        
+        Args:
+            resumes: File paths, bytes or resume texts
+            file_type: Hint applied to every item (the real type is sniffed)
+            full_extraction: Always run the spaCy tier
+            batch_size: spaCy pipe batch size
+            include_text: Add the extracted text to each result as "resume_text"
+        
+        Returns:
+            Parse results in input order
+        """
+        texts = []
+        metrics_list = []
+        for resume in resumes:
+            metrics = new_metrics(self.instrument)
+            texts.append(self._extract_with_metrics(resume, file_type, metrics))
+            metrics_list.append(metrics)
+        results = self.parse_texts(texts, full_extraction=full_extraction, batch_size=batch_size,
+                                   metrics_list=metrics_list)
+        if include_text:
+            for result, text in zip(results, texts):
+                result["resume_text"] = text
+        return results
+    
+    def parse_texts(self, texts: List[str], full_extraction: bool = False, batch_size: int = 32,
+                    metrics_list: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        """Batched equivalent of parse_text"""
+        metrics_list = metrics_list or [new_metrics(self.instrument) for _ in texts]
+        results = []
+        escalated = []
+        for index, text in enumerate(texts):
+            metrics = metrics_list[index]
+            if not text or not self.nlp:
+                results.append(self.parse_text(text, metrics=metrics))
+                continue
+            metrics.record(characters=len(text))
+            fast_result = self.parse_fast(text, metrics)
+            if self._needs_escalation(fast_result, full_extraction):
+                escalated.append(index)
+            else:
+                self.tier_counts["fast"] += 1
+            results.append(fast_result)
+        
+        # Long documents are chunked individually; the rest share one pipe pass
+        chunked = [index for index in escalated if len(texts[index]) > self.nlp_chunk_chars]
+        piped = [index for index in escalated if len(texts[index]) <= self.nlp_chunk_chars]
+        
+        for index in chunked:
+            results[index] = self.parse_full(texts[index], results[index], metrics=metrics_list[index])
+            self.tier_counts["full"] += 1
+        
+        if piped:
+            docs = iter(self.nlp.pipe((texts[index] for index in piped), batch_size=batch_size))
+            for index in piped:
+                started = time.perf_counter()
+                doc = next(docs)
+                metrics_list[index].add_time("nlp", time.perf_counter() - started)
+                results[index] = self.parse_full(texts[index], results[index], doc=doc,
+                                                 metrics=metrics_list[index])
+                self.tier_counts["full"] += 1
+        
+        return [
+            result if "metrics" in result else self._attach_metrics(result, metrics_list[index])
+            for index, result in enumerate(results)
+        ]
 
 
 # Example usage
@@ -0,0 +1,32 @@
+"""
+Skill taxonomy and parser versioning
+Kept free of spaCy so lightweight extraction workers can compute cache keys
+"""
+import hashlib
+from typing import Iterable
+
+# Bump whenever extraction or scoring logic changes; cached parses and stored
+# profiles produced by an older version are then treated as stale
+PARSER_VERSION = "1.3"
+
+# Common skills database (simplified - would be 10K+ in production)
+SKILL_KEYWORDS = frozenset({
+    # Programming Languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "ruby", "php",
+    # Frameworks
+    "react", "angular", "vue", "django", "flask", "fastapi", "spring", "express", "nodejs",
+    # Databases
+    "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb",
+    # Cloud & DevOps
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "gitlab ci", "github actions",
+    # ML/AI
+    "tensorflow", "pytorch", "scikit-learn", "pandas", "numpy", "jupyter", "machine learning", "deep learning",
+    # Soft Skills
+    "leadership", "communication", "teamwork", "problem-solving", "agile", "scrum"
+})
+
+
+def parser_version(skill_keywords: Iterable[str] = SKILL_KEYWORDS) -> str:
+    """Parser version combined with a fingerprint of the skill taxonomy"""
+    taxonomy = hashlib.sha256(",".join(sorted(skill_keywords)).encode("utf-8")).hexdigest()
+    return f"{PARSER_VERSION}+{taxonomy[:8]}"
@@ -2,19 +2,28 @@
 FastAPI Gateway Service - Main API entry point for TalentAI Pro
 """
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
+from uuid import UUID
 import os
 from dotenv import load_dotenv
 
-from shared.database import get_db, engine, Base
+from shared.database import get_async_db, async_engine, engine, Base
 from shared import models, schemas
 from shared.auth import (
     verify_password, get_password_hash,
     create_access_token, create_refresh_token, decode_token
 )
+from workers.matches import trigger_matching
+from workers.screening import trigger_screening
+from workers.notifications import notify
+from workers.automation import emit_event
+from workers import embedded
 
 # Import AI features router
 try:
@@ -59,7 +68,7 @@ security = HTTPBearer()
 # Dependency to get current user from JWT token
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     token = credentials.credentials
     payload = decode_token(token)
@@ -70,14 +79,15 @@ async def get_current_user(
             detail="Invalid authentication credentials"
         )
     
-    user_id = payload.get("sub")
-    if user_id is None:
+    try:
+        user_id = UUID(payload.get("sub"))
+    except (TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials"
         )
     
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+    user = await db.get(models.User, user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -87,6 +97,22 @@ async def get_current_user(
     return user
 
 
+# Task workers run inside the gateway when TASK_EXECUTOR=embedded
+@app.on_event("startup")
+def start_task_executor():
+    embedded.start()
+
+
+@app.on_event("shutdown")
+def stop_task_executor():
+    embedded.stop()
+
+
+@app.on_event("shutdown")
+async def close_database():
+    await async_engine.dispose()
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -96,18 +122,18 @@ async def health_check():
 # ==================== Authentication Endpoints ====================
 
 @app.post("/api/v1/auth/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-async def register(user_data: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user"""
     # Check if user already exists
-    existing_user = db.query(models.User).filter(models.User.email == user_data.email).first()
+    existing_user = await db.scalar(select(models.User).where(models.User.email == user_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    # Create new user (bcrypt is CPU-bound, so it runs off the event loop)
+    hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
     new_user = models.User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -115,8 +141,8 @@ async def register(user_data: schemas.UserCreate, db: Session = Depends(get_db))
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     # Create corresponding profile based on role
     if user_data.role == models.UserRole.EMPLOYER:
@@ -131,17 +157,17 @@ async def register(user_data: schemas.UserCreate, db: Session = Depends(get_db))
         )
         db.add(candidate_profile)
     
-    db.commit()
+    await db.commit()
     
     return new_user
 
 
 @app.post("/api/v1/auth/login", response_model=schemas.Token)
-async def login(credentials: schemas.UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: schemas.UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login and get access token"""
-    user = db.query(models.User).filter(models.User.email == credentials.email).first()
+    user = await db.scalar(select(models.User).where(models.User.email == credentials.email))
     
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await run_in_threadpool(verify_password, credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -176,7 +202,7 @@ async def get_current_user_info(current_user: models.User = Depends(get_current_
 async def create_job(
     job_data: schemas.JobCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new job posting (employers only)"""
     if current_user.role != models.UserRole.EMPLOYER:
@@ -185,9 +211,9 @@ async def create_job(
             detail="Only employers can post jobs"
         )
     
-    employer_profile = db.query(models.EmployerProfile).filter(
+    employer_profile = await db.scalar(select(models.EmployerProfile).where(
         models.EmployerProfile.user_id == current_user.id
-    ).first()
+    ))
     
     if not employer_profile:
         raise HTTPException(
@@ -201,8 +227,22 @@ async def create_job(
     )
     
     db.add(new_job)
-    db.commit()
-    db.refresh(new_job)
+    await db.commit()
+    await db.refresh(new_job)
+    
+    # Triggers talk to Redis and the broker synchronously; keep them off the event loop
+    await run_in_threadpool(trigger_matching, "job", new_job.id)
+    await run_in_threadpool(
+        emit_event,
+        "job_posted", employer_profile.id,
+        job_id=new_job.id,
+        job_title=new_job.title,
+        job_type=new_job.job_type,
+        work_mode=new_job.work_mode,
+        location=new_job.location,
+        requirements=new_job.requirements or [],
+        employer_user_id=current_user.id
+    )
     
     return new_job
 
@@ -212,24 +252,24 @@ async def list_jobs(
     skip: int = 0,
     limit: int = 20,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List all active job postings"""
-    query = db.query(models.Job)
+    query = select(models.Job)
     
     if status:
-        query = query.filter(models.Job.status == status)
+        query = query.where(models.Job.status == status)
     else:
-        query = query.filter(models.Job.status == models.JobStatus.ACTIVE)
+        query = query.where(models.Job.status == models.JobStatus.ACTIVE)
     
-    jobs = query.offset(skip).limit(limit).all()
+    jobs = (await db.scalars(query.offset(skip).limit(limit))).all()
     return jobs
 
 
 @app.get("/api/v1/jobs/{job_id}", response_model=schemas.JobResponse)
-async def get_job(job_id: str, db: Session = Depends(get_db)):
+async def get_job(job_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Get job details by ID"""
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    job = await db.get(models.Job, job_id)
     
     if not job:
         raise HTTPException(
@@ -246,7 +286,7 @@ async def get_job(job_id: str, db: Session = Depends(get_db)):
 async def create_application(
     application_data: schemas.ApplicationCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Apply to a job (candidates only)"""
     if current_user.role != models.UserRole.CANDIDATE:
@@ -255,9 +295,9 @@ async def create_application(
             detail="Only candidates can apply to jobs"
         )
     
-    candidate_profile = db.query(models.CandidateProfile).filter(
+    candidate_profile = await db.scalar(select(models.CandidateProfile).where(
         models.CandidateProfile.user_id == current_user.id
-    ).first()
+    ))
     
     if not candidate_profile:
         raise HTTPException(
@@ -265,8 +305,12 @@ async def create_application(
             detail="Candidate profile not found"
         )
     
-    # Check if job exists
-    job = db.query(models.Job).filter(models.Job.id == application_data.job_id).first()
+    # Check if job exists (the employer is needed for the notification below)
+    job = await db.scalar(
+        select(models.Job)
+        .options(selectinload(models.Job.employer))
+        .where(models.Job.id == application_data.job_id)
+    )
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -274,10 +318,10 @@ async def create_application(
         )
     
     # Check for duplicate application
-    existing_application = db.query(models.Application).filter(
+    existing_application = await db.scalar(select(models.Application).where(
         models.Application.job_id == application_data.job_id,
         models.Application.candidate_id == candidate_profile.id
-    ).first()
+    ))
     
     if existing_application:
         raise HTTPException(
@@ -293,60 +337,91 @@ async def create_application(
     )
     
     db.add(new_application)
-    db.commit()
-    db.refresh(new_application)
+    await db.commit()
+    await db.refresh(new_application)
+    
+    # Refresh the job's ranking to include the new applicant
+    await run_in_threadpool(trigger_matching, "job", job.id)
+    
+    # Score the application in the next screening micro-batch
+    await run_in_threadpool(trigger_screening)
+    
+    # Employers get one unread digest per job, not one notification per applicant
+    if job.employer:
+        await run_in_threadpool(
+            notify,
+            job.employer.user_id,
+            "application",
+            f"New applications for {job.title}",
+            content=f"{candidate_profile.first_name or 'A candidate'} applied to {job.title}",
+            link=f"/jobs/{job.id}/applications",
+            digest_key=f"applications:{job.id}"
+        )
     
-    # TODO: Trigger automated screening workflow via Celery
+    await run_in_threadpool(
+        emit_event,
+        "application_received", job.employer_id,
+        application_id=new_application.id,
+        job_id=job.id,
+        job_title=job.title,
+        candidate_id=candidate_profile.id,
+        candidate_name=candidate_profile.first_name,
+        candidate_skills=candidate_profile.skills or [],
+        experience_years=candidate_profile.experience_years,
+        location=candidate_profile.location,
+        employer_user_id=job.employer.user_id if job.employer else None,
+        candidate_user_id=current_user.id
+    )
     
     return new_application
 
 
 @app.get("/api/v1/applications", response_model=List[schemas.ApplicationResponse])
 async def list_applications(
-    job_id: Optional[str] = None,
+    job_id: Optional[UUID] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List applications (filtered by user role)"""
     if current_user.role == models.UserRole.CANDIDATE:
         # Candidates see their own applications
-        candidate_profile = db.query(models.CandidateProfile).filter(
+        candidate_profile = await db.scalar(select(models.CandidateProfile).where(
             models.CandidateProfile.user_id == current_user.id
-        ).first()
+        ))
         
         if not candidate_profile:
             return []
         
-        query = db.query(models.Application).filter(
+        query = select(models.Application).where(
             models.Application.candidate_id == candidate_profile.id
         )
     
     elif current_user.role == models.UserRole.EMPLOYER:
         # Employers see applications to their jobs
-        employer_profile = db.query(models.EmployerProfile).filter(
+        employer_profile = await db.scalar(select(models.EmployerProfile).where(
             models.EmployerProfile.user_id == current_user.id
-        ).first()
+        ))
         
         if not employer_profile:
             return []
         
-        job_ids = db.query(models.Job.id).filter(
+        job_ids = select(models.Job.id).where(
             models.Job.employer_id == employer_profile.id
-        ).subquery()
+        )
         
-        query = db.query(models.Application).filter(
+        query = select(models.Application).where(
             models.Application.job_id.in_(job_ids)
         )
         
         if job_id:
-            query = query.filter(models.Application.job_id == job_id)
+            query = query.where(models.Application.job_id == job_id)
     else:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Unauthorized"
         )
     
-    applications = query.all()
+    applications = (await db.scalars(query)).all()
     return applications
 
 
@@ -355,7 +430,7 @@ async def list_applications(
 @app.get("/api/v1/candidates/me", response_model=schemas.CandidateProfileResponse)
 async def get_my_candidate_profile(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's candidate profile"""
     if current_user.role != models.UserRole.CANDIDATE:
@@ -364,9 +439,9 @@ async def get_my_candidate_profile(
             detail="Only candidates can access this endpoint"
         )
     
-    profile = db.query(models.CandidateProfile).filter(
+    profile = await db.scalar(select(models.CandidateProfile).where(
         models.CandidateProfile.user_id == current_user.id
-    ).first()
+    ))
     
     if not profile:
         raise HTTPException(
@@ -381,7 +456,7 @@ async def get_my_candidate_profile(
 async def update_my_candidate_profile(
     profile_data: schemas.CandidateProfileCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user's candidate profile"""
     if current_user.role != models.UserRole.CANDIDATE:
@@ -390,9 +465,9 @@ async def update_my_candidate_profile(
             detail="Only candidates can access this endpoint"
         )
     
-    profile = db.query(models.CandidateProfile).filter(
+    profile = await db.scalar(select(models.CandidateProfile).where(
         models.CandidateProfile.user_id == current_user.id
-    ).first()
+    ))
     
     if not profile:
         raise HTTPException(
@@ -404,8 +479,10 @@ async def update_my_candidate_profile(
     for field, value in profile_data.dict(exclude_unset=True).items():
         setattr(profile, field, value)
     
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
+    
+    await run_in_threadpool(trigger_matching, "candidate", profile.id)
     
     return profile
 
@@ -415,7 +492,7 @@ async def update_my_candidate_profile(
 @app.get("/api/v1/employers/me", response_model=schemas.EmployerProfileResponse)
 async def get_my_employer_profile(
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's employer profile"""
     if current_user.role != models.UserRole.EMPLOYER:
@@ -424,9 +501,9 @@ async def get_my_employer_profile(
             detail="Only employers can access this endpoint"
         )
     
-    profile = db.query(models.EmployerProfile).filter(
+    profile = await db.scalar(select(models.EmployerProfile).where(
         models.EmployerProfile.user_id == current_user.id
-    ).first()
+    ))
     
     if not profile:
         raise HTTPException(
@@ -441,7 +518,7 @@ async def get_my_employer_profile(
 async def update_my_employer_profile(
     profile_data: schemas.EmployerProfileCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user's employer profile"""
     if current_user.role != models.UserRole.EMPLOYER:
@@ -450,9 +527,9 @@ async def update_my_employer_profile(
             detail="Only employers can access this endpoint"
         )
     
-    profile = db.query(models.EmployerProfile).filter(
+    profile = await db.scalar(select(models.EmployerProfile).where(
         models.EmployerProfile.user_id == current_user.id
-    ).first()
+    ))
     
     if not profile:
         raise HTTPException(
@@ -464,8 +541,8 @@ async def update_my_employer_profile(
     for field, value in profile_data.dict(exclude_unset=True).items():
         setattr(profile, field, value)
     
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
     
     return profile
 
@@ -1,10 +1,15 @@
 """
 Database configuration and session management
+Workers and scripts use the synchronous engine; the FastAPI gateway uses the
+async engine so a slow query only suspends its own request instead of
+blocking the event loop.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 import os
 from dotenv import load_dotenv
 
@@ -23,13 +28,50 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async driver for each database the sync URL may point at
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the async one"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.drivername}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=int(os.getenv("DATABASE_POOL_SIZE", 20)),
+    max_overflow=int(os.getenv("DATABASE_MAX_OVERFLOW", 10)),
+    pool_pre_ping=True,
+    echo=os.getenv("DEBUG", "False") == "True"
+)
+
+# Loaded attributes stay readable after commit; reloading them would need
+# an await that response serialization can't do
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
 def get_db():
-    """Database session dependency for FastAPI"""
+    """Synchronous database session dependency"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async database session dependency for FastAPI"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,130 @@
+"""
+Debounced trigger keys
+Repeated triggers for the same key within a window collapse into one run.
+Each key holds the time of its first trigger and a deadline that every new
+trigger pushes out; a run is due at the deadline, or max_delay after the first
+trigger when edits keep arriving
+"""
+import os
+import threading
+import time
+from typing import Dict, List
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+# Atomically check a key and clear it once due; returns seconds left (0 = run now)
+_CLAIM_SCRIPT = """
+local entry = redis.call('HMGET', KEYS[1], 'deadline', 'first')
+if not entry[1] then return '0' end
+local due = math.min(tonumber(entry[1]), tonumber(entry[2]) + tonumber(ARGV[2]))
+local remaining = due - tonumber(ARGV[1])
+if remaining > 0 then return tostring(remaining) end
+redis.call('DEL', KEYS[1])
+return '0'
+"""
+
+
+class RedisDebouncer:
+    """Debounce keys shared by every gateway and worker process"""
+
+    PREFIX = "debounce:"
+
+    def __init__(self, url: str, window_seconds: float, max_delay_seconds: float):
+        if redis is None:
+            raise RuntimeError("redis package is required for the Redis debouncer")
+        self.client = redis.Redis.from_url(url)
+        self.window_seconds = window_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._claim = self.client.register_script(_CLAIM_SCRIPT)
+
+    def touch(self, key: str) -> bool:
+        """
+        Record a trigger for key
+
+        Returns:
+            True if no run was pending, i.e. the caller must schedule one
+        """
+        now = time.time()
+        name = self.PREFIX + key
+        pipe = self.client.pipeline()
+        pipe.hsetnx(name, "first", now)
+        pipe.hset(name, "deadline", now + self.window_seconds)
+        pipe.expire(name, int(self.max_delay_seconds + self.window_seconds) + 60)
+        created, _, _ = pipe.execute()
+        return bool(created)
+
+    def claim(self, key: str) -> float:
+        """Seconds until key's run is due; 0 means due now (and the key is cleared)"""
+        remaining = self._claim(keys=[self.PREFIX + key], args=[time.time(), self.max_delay_seconds])
+        return float(remaining)
+
+    def release(self, key: str) -> None:
+        """Drop a pending key whose run could not be scheduled"""
+        self.client.delete(self.PREFIX + key)
+
+
+class LocalDebouncer:
+    """
+    In-process debounce keys (development, tests, embedded workers)
+    Across separate gateway and worker processes this degrades to one run per
+    fixed window, since the worker cannot see the gateway's deadlines
+    """
+
+    def __init__(self, window_seconds: float, max_delay_seconds: float):
+        self.window_seconds = window_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._entries: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _due(self, entry: List[float]) -> float:
+        first, deadline = entry
+        return min(deadline, first + self.max_delay_seconds)
+
+    def touch(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            # Entries nobody claimed expire once due
+            if entry is not None and self._due(entry) + self.window_seconds > now:
+                entry[1] = now + self.window_seconds
+                return False
+            self._entries[key] = [now, now + self.window_seconds]
+            return True
+
+    def claim(self, key: str) -> float:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return 0.0
+            remaining = self._due(entry) - now
+            if remaining > 0:
+                return remaining
+            del self._entries[key]
+            return 0.0
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+def build_debouncer(prefix: str, window_seconds: float = 30, max_delay_seconds: float = 300):
+    """
+    Build the debouncer configured by environment variables
+
+    <PREFIX>_DEBOUNCE_BACKEND: redis | local (default redis)
+    <PREFIX>_DEBOUNCE_SECONDS: Quiet period before a run (default window_seconds)
+    <PREFIX>_DEBOUNCE_MAX_SECONDS: Longest a run can be postponed by new triggers
+    """
+    backend = os.getenv(f"{prefix}_DEBOUNCE_BACKEND", "redis").lower()
+    window_seconds = float(os.getenv(f"{prefix}_DEBOUNCE_SECONDS", window_seconds))
+    max_delay_seconds = float(os.getenv(f"{prefix}_DEBOUNCE_MAX_SECONDS", max_delay_seconds))
+
+    if backend == "redis":
+        return RedisDebouncer(os.getenv("REDIS_URL", "redis://localhost:6379/0"), window_seconds, max_delay_seconds)
+    if backend == "local":
+        return LocalDebouncer(window_seconds, max_delay_seconds)
+    raise ValueError(f"Unknown {prefix}_DEBOUNCE_BACKEND: {backend}")
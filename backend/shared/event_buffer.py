@@ -0,0 +1,155 @@
+"""
+Buffered events with debounced bulk flushes
+Producers append events to a shared buffer (a Redis list, or an in-process list
+for tests) and make sure a flush is scheduled; the flush task pops events in
+large batches. Bursts become a few bulk writes instead of one Celery message,
+or one DB transaction, per event.
+
+Events a flush can never process (malformed, or rejected by the database)
+go to the buffer's dead-letter list instead of back into the buffer, so one
+bad event can't block the others. The list keeps the newest
+EVENT_DEAD_LETTER_MAX entries for inspection.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, List
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+EVENT_DEAD_LETTER_MAX = int(os.getenv("EVENT_DEAD_LETTER_MAX", 10000))
+
+
+class RedisEventBuffer:
+    """Buffer shared by all producers and workers"""
+
+    def __init__(self, url: str, key: str):
+        if redis is None:
+            raise RuntimeError("redis package is required for the Redis event buffer")
+        self.client = redis.Redis.from_url(url)
+        self.key = key
+
+    def push(self, events: List[Dict[str, Any]]) -> int:
+        """Append events; returns the buffer length"""
+        return self.client.rpush(self.key, *[json.dumps(event, default=str) for event in events])
+
+    def pop(self, count: int) -> List[Dict[str, Any]]:
+        """Remove and return up to count of the oldest events"""
+        pipe = self.client.pipeline()
+        pipe.lrange(self.key, 0, count - 1)
+        pipe.ltrim(self.key, count, -1)
+        values, _ = pipe.execute()
+        return [json.loads(value) for value in values]
+
+    def dead_letter(self, events: List[Dict[str, Any]]) -> None:
+        """Set events aside for inspection (<key>:dead)"""
+        pipe = self.client.pipeline()
+        pipe.rpush(self.key + ":dead", *[json.dumps(event, default=str) for event in events])
+        pipe.ltrim(self.key + ":dead", -EVENT_DEAD_LETTER_MAX, -1)
+        pipe.execute()
+
+    def dead_letters(self, count: int = 100) -> List[Dict[str, Any]]:
+        """Newest dead-lettered events"""
+        return [json.loads(value) for value in self.client.lrange(self.key + ":dead", -count, -1)]
+
+    def __len__(self) -> int:
+        return self.client.llen(self.key)
+
+
+class LocalEventBuffer:
+    """In-process buffer for tests and embedded workers"""
+
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._dead: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def push(self, events: List[Dict[str, Any]]) -> int:
+        with self._lock:
+            self._events.extend(events)
+            return len(self._events)
+
+    def pop(self, count: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            events, self._events = self._events[:count], self._events[count:]
+            return events
+
+    def dead_letter(self, events: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._dead = (self._dead + list(events))[-EVENT_DEAD_LETTER_MAX:]
+
+    def dead_letters(self, count: int = 100) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self._dead[-count:]
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+
+def build_event_buffer(prefix: str, key: str):
+    """
+    Build the buffer configured by environment variables
+
+    <PREFIX>_BUFFER_BACKEND: redis | local (default redis)
+    """
+    backend = os.getenv(f"{prefix}_BUFFER_BACKEND", "redis").lower()
+    if backend == "redis":
+        return RedisEventBuffer(os.getenv("REDIS_URL", "redis://localhost:6379/0"), key)
+    if backend == "local":
+        return LocalEventBuffer()
+    raise ValueError(f"Unknown {prefix}_BUFFER_BACKEND: {backend}")
+
+
+def publish_events(buffer, debouncer, debounce_key: str, flush_size: int,
+                   events: List[Dict[str, Any]], schedule_flush: Callable[..., Any]) -> bool:
+    """
+    Buffer events and make sure a flush is coming
+
+    A buffer holding flush_size events is flushed immediately; otherwise the
+    first event of a burst schedules a debounced flush and later ones join it.
+
+    Args:
+        schedule_flush: Called as schedule_flush(countdown=..., force=...) to send the flush task
+
+    Returns:
+        True if the events were buffered
+    """
+    if not events:
+        return True
+    try:
+        length = buffer.push(events)
+    except Exception as e:
+        logger.error(f"Could not buffer {len(events)} events for {debounce_key}: {str(e)}")
+        return False
+
+    if length >= flush_size:
+        try:
+            schedule_flush(countdown=0, force=True)
+        except Exception as e:
+            # Buffered events are picked up by the next flush
+            logger.warning(f"Could not schedule flush for {debounce_key}: {str(e)}")
+        return True
+
+    try:
+        if not debouncer.touch(debounce_key):
+            return True
+        countdown = debouncer.window_seconds
+    except Exception as e:
+        logger.warning(f"Debouncer unavailable for {debounce_key}, flushing now: {str(e)}")
+        countdown = 0
+
+    try:
+        schedule_flush(countdown=countdown, force=False)
+    except Exception as e:
+        logger.warning(f"Could not schedule flush for {debounce_key}: {str(e)}")
+        try:
+            debouncer.release(debounce_key)
+        except Exception:
+            pass
+    return True
@@ -0,0 +1,95 @@
+"""
+Schema upgrades for existing databases
+init_db.py builds a fresh database with create_all, which creates missing
+tables but never alters tables that already exist. Each migration below
+brings an existing (Postgres) database up to shared/models.py; every
+statement is idempotent, so
+
+    python init_db.py --upgrade
+
+can be re-run safely and only applies what is missing. Append new
+migrations at the end; they run in order.
+"""
+import logging
+from typing import List, Tuple
+
+from sqlalchemy import text
+
+from shared.database import Base, engine
+from shared import models  # noqa: F401  (registers the tables on Base.metadata)
+
+logger = logging.getLogger(__name__)
+
+# (name, statements) in the order they were introduced
+MIGRATIONS: List[Tuple[str, List[str]]] = [
+    ("candidate_profiles.resume_content_hash", [
+        "ALTER TABLE candidate_profiles ADD COLUMN IF NOT EXISTS resume_content_hash VARCHAR(64)",
+        "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_resume_content_hash "
+        "ON candidate_profiles (resume_content_hash)",
+    ]),
+    ("candidate_profiles.parser_version", [
+        "ALTER TABLE candidate_profiles ADD COLUMN IF NOT EXISTS parser_version VARCHAR(32)",
+        "CREATE INDEX IF NOT EXISTS ix_candidate_profiles_parser_version "
+        "ON candidate_profiles (parser_version)",
+    ]),
+    # Older databases may hold several rows per pair; keep the newest before
+    # adding the constraint the upserts conflict on
+    ("job_matches.uq_job_matches_job_candidate", [
+        "ALTER TABLE job_matches ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITHOUT TIME ZONE",
+        "DELETE FROM job_matches older USING job_matches newer "
+        "WHERE older.job_id = newer.job_id AND older.candidate_id = newer.candidate_id "
+        "AND (COALESCE(older.updated_at, older.created_at), older.id) "
+        "< (COALESCE(newer.updated_at, newer.created_at), newer.id)",
+        "DO $$ BEGIN "
+        "IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'uq_job_matches_job_candidate') THEN "
+        "ALTER TABLE job_matches ADD CONSTRAINT uq_job_matches_job_candidate UNIQUE (job_id, candidate_id); "
+        "END IF; END $$",
+    ]),
+    # Existing rows count as held by both sides until a run of either side drops them
+    ("job_matches.ranked_for_job", [
+        "ALTER TABLE job_matches ADD COLUMN IF NOT EXISTS ranked_for_job BOOLEAN NOT NULL DEFAULT true",
+        "ALTER TABLE job_matches ADD COLUMN IF NOT EXISTS ranked_for_candidate BOOLEAN NOT NULL DEFAULT true",
+    ]),
+    ("applications.screening_attempts", [
+        "ALTER TABLE applications ADD COLUMN IF NOT EXISTS screening_attempts INTEGER NOT NULL DEFAULT 0",
+    ]),
+    # Rows written before updated_at existed take their creation time, so
+    # retention compaction sees their real age
+    ("job_matches.updated_at_backfill", [
+        "UPDATE job_matches SET updated_at = COALESCE(created_at, now() AT TIME ZONE 'utc') "
+        "WHERE updated_at IS NULL",
+    ]),
+    ("job_matches.compaction_indexes", [
+        "CREATE INDEX IF NOT EXISTS ix_job_matches_job_rank "
+        "ON job_matches (job_id, match_score DESC, candidate_id)",
+        "CREATE INDEX IF NOT EXISTS ix_job_matches_job_updated ON job_matches (job_id, updated_at)",
+        "CREATE INDEX IF NOT EXISTS ix_job_matches_candidate ON job_matches (candidate_id)",
+    ]),
+    # Notification digests: the buffered flush upserts against the partial
+    # unique index, so it must exist before workers run
+    ("notifications.digest_key", [
+        "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS digest_key VARCHAR(255)",
+        "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS digest_count INTEGER DEFAULT 1",
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_notifications_unread_digest "
+        "ON notifications (user_id, digest_key) WHERE is_read = false AND digest_key IS NOT NULL",
+    ]),
+]
+
+
+def upgrade(bind=None) -> List[str]:
+    """
+    Create missing tables (e.g. task_checkpoints), then apply the migrations
+
+    Returns:
+        Names of the migrations that were run
+    """
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    applied = []
+    with bind.begin() as connection:
+        for name, statements in MIGRATIONS:
+            for statement in statements:
+                connection.execute(text(statement))
+            applied.append(name)
+            logger.info(f"Applied schema migration {name}")
+    return applied
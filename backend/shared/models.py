@@ -1,7 +1,7 @@
 """
 SQLAlchemy ORM Models for TalentAI Pro
 """
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, ARRAY, JSON, ForeignKey, Float, Enum as SQLEnum
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, Text, ARRAY, JSON, ForeignKey, Float, UniqueConstraint, Index, text, true, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -84,6 +84,8 @@ class CandidateProfile(Base):
     location = Column(String(255))
     resume_url = Column(String(500))
     resume_text = Column(Text)  # Parsed resume text for search
+    resume_content_hash = Column(String(64), index=True)  # SHA-256 of the parsed resume file
+    parser_version = Column(String(32), index=True)  # ResumeParser version that produced skills/education/experience
     skills = Column(JSONB, default=list)  # Array of skills with proficiency
     experience_years = Column(Integer)
     education = Column(JSONB, default=list)  # Array of education entries
@@ -144,6 +146,7 @@ class Application(Base):
     cover_letter = Column(Text)
     screening_score = Column(Float)  # 0-100 ML-generated score
     ai_summary = Column(Text)  # AI-generated match summary
+    screening_attempts = Column(Integer, nullable=False, default=0, server_default=text("0"))  # Failed scoring runs
     applied_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -174,13 +177,26 @@ class Interview(Base):
 
 class JobMatch(Base):
     __tablename__ = "job_matches"
+    __table_args__ = (
+        # One row per pair; matching tasks upsert against this
+        UniqueConstraint("job_id", "candidate_id", name="uq_job_matches_job_candidate"),
+        # Compaction (workers/matches.py): per-job rank order for top-N trimming,
+        # per-job age for retention, per-candidate deletes
+        Index("ix_job_matches_job_rank", "job_id", text("match_score DESC"), "candidate_id"),
+        Index("ix_job_matches_job_updated", "job_id", "updated_at"),
+        Index("ix_job_matches_candidate", "candidate_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     job_id = Column(UUID(as_uuid=True), ForeignKey("jobs.id"))
     candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidate_profiles.id"))
     match_score = Column(Float, nullable=False)  # 0.0-1.0
     match_reasons = Column(JSONB, default=list)  # Array of reason strings
+    # Which side's match set holds the pair; the row is deleted once neither does
+    ranked_for_job = Column(Boolean, nullable=False, server_default=true())
+    ranked_for_candidate = Column(Boolean, nullable=False, server_default=true())
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
     job = relationship("Job", back_populates="matches")
@@ -189,6 +205,14 @@ class JobMatch(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # At most one unread digest per user and digest key; bursts fold into it
+        Index(
+            "uq_notifications_unread_digest", "user_id", "digest_key", unique=True,
+            postgresql_where=text("is_read = false AND digest_key IS NOT NULL"),
+            sqlite_where=text("is_read = 0 AND digest_key IS NOT NULL")
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
@@ -196,6 +220,8 @@ class Notification(Base):
     title = Column(String(255), nullable=False)
     content = Column(Text)
     link = Column(String(500))
+    digest_key = Column(String(255))  # e.g. "applications:<job_id>"
+    digest_count = Column(Integer, default=1)  # Events folded into this notification
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -239,3 +265,15 @@ class AuditLog(Base):
 
     # Relationships
     user = relationship("User")
+
+
+class TaskCheckpoint(Base):
+    __tablename__ = "task_checkpoints"
+
+    name = Column(String(100), primary_key=True)  # e.g. "reparse_backfill:1.2+4635f883"
+    last_key = Column(String(64))  # Last keyset-pagination key processed
+    processed = Column(Integer, default=0)
+    state = Column(JSONB, default=dict)  # Job-specific progress details
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
@@ -0,0 +1,163 @@
+"""
+Resume file storage backends
+Local filesystem (also a stand-in for S3 in development) and S3-compatible storage,
+both read as streams with a hard size cap
+"""
+import os
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from dotenv import load_dotenv
+
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+load_dotenv()
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StorageError(Exception):
+    """Raised when a resume cannot be fetched"""
+
+
+class ResumeTooLargeError(StorageError):
+    """Raised when a resume exceeds the configured size cap"""
+
+
+def _split_url(url: str) -> Tuple[str, str, str]:
+    """Return (scheme, bucket, key) for s3://bucket/key, file:///path or a bare path"""
+    parsed = urlparse(url)
+    if parsed.scheme == "s3":
+        return "s3", parsed.netloc, parsed.path.lstrip("/")
+    if parsed.scheme in ("", "file"):
+        return "file", "", parsed.path if parsed.scheme == "file" else url
+    raise StorageError(f"Unsupported resume URL scheme: {parsed.scheme}")
+
+
+class LocalResumeStorage:
+    """
+    Filesystem storage rooted at a directory
+    s3://bucket/key URLs map to <root>/bucket/key so S3 URLs work unchanged in development
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root).resolve()
+
+    def _resolve(self, url: str) -> Path:
+        scheme, bucket, key = _split_url(url)
+        relative = Path(bucket) / key if scheme == "s3" else Path(key.lstrip("/"))
+        path = (self.root / relative).resolve()
+        if self.root not in path.parents:
+            raise StorageError(f"Resume path escapes storage root: {url}")
+        return path
+
+    def size(self, url: str) -> Optional[int]:
+        try:
+            return self._resolve(url).stat().st_size
+        except FileNotFoundError as e:
+            raise StorageError(f"Resume not found: {url}") from e
+
+    def version(self, url: str) -> str:
+        """Token that changes whenever the file is rewritten"""
+        try:
+            stat = self._resolve(url).stat()
+        except FileNotFoundError as e:
+            raise StorageError(f"Resume not found: {url}") from e
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def iter_chunks(self, url: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        try:
+            with open(self._resolve(url), "rb") as file:
+                while True:
+                    chunk = file.read(chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+        except FileNotFoundError as e:
+            raise StorageError(f"Resume not found: {url}") from e
+
+
+class S3ResumeStorage:
+    """S3 or S3-compatible (MinIO, R2) object storage"""
+
+    def __init__(self, default_bucket: str, endpoint_url: Optional[str] = None, region: Optional[str] = None):
+        if boto3 is None:
+            raise RuntimeError("boto3 is required for S3 resume storage")
+        self.default_bucket = default_bucket
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+
+    def _locate(self, url: str) -> Tuple[str, str]:
+        scheme, bucket, key = _split_url(url)
+        return (bucket if scheme == "s3" else self.default_bucket), key.lstrip("/")
+
+    def size(self, url: str) -> Optional[int]:
+        bucket, key = self._locate(url)
+        try:
+            return self.client.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        except Exception as e:
+            raise StorageError(f"Cannot stat resume {url}: {e}") from e
+
+    def version(self, url: str) -> str:
+        """Token that changes whenever the object is rewritten"""
+        bucket, key = self._locate(url)
+        try:
+            head = self.client.head_object(Bucket=bucket, Key=key)
+        except Exception as e:
+            raise StorageError(f"Cannot stat resume {url}: {e}") from e
+        return f"{head['ETag']}:{head['LastModified'].isoformat()}"
+
+    def iter_chunks(self, url: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        bucket, key = self._locate(url)
+        try:
+            body = self.client.get_object(Bucket=bucket, Key=key)["Body"]
+        except Exception as e:
+            raise StorageError(f"Cannot fetch resume {url}: {e}") from e
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
+
+def read_resume(storage, url: str, max_bytes: Optional[int] = None) -> bytearray:
+    """
+    Stream a resume into memory, aborting once it exceeds max_bytes
+
+    Returns:
+        bytearray with the file contents (accepted by the parser without copying)
+    """
+    max_bytes = max_bytes or int(os.getenv("RESUME_MAX_BYTES", 10 * 1024 * 1024))
+
+    size = storage.size(url)
+    if size is not None and size > max_bytes:
+        raise ResumeTooLargeError(f"Resume is {size} bytes (limit {max_bytes})")
+
+    buffer = bytearray()
+    for chunk in storage.iter_chunks(url):
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise ResumeTooLargeError(f"Resume exceeds {max_bytes} bytes")
+    return buffer
+
+
+def get_resume_storage():
+    """
+    Build the storage backend configured by environment variables
+
+    RESUME_STORAGE_BACKEND: local | s3 (default local)
+    RESUME_STORAGE_ROOT: Root directory for local storage
+    AWS_S3_BUCKET / AWS_S3_ENDPOINT_URL / AWS_REGION: S3 settings
+    """
+    backend = os.getenv("RESUME_STORAGE_BACKEND", "local").lower()
+    if backend == "s3":
+        return S3ResumeStorage(
+            default_bucket=os.getenv("AWS_S3_BUCKET", "talentai-resumes"),
+            endpoint_url=os.getenv("AWS_S3_ENDPOINT_URL") or None,
+            region=os.getenv("AWS_REGION")
+        )
+    if backend == "local":
+        return LocalResumeStorage(os.getenv("RESUME_STORAGE_ROOT", "./storage"))
+    raise ValueError(f"Unknown RESUME_STORAGE_BACKEND: {backend}")
@@ -0,0 +1,65 @@
+"""
+Test configuration
+Tests run against a SQLite file and the in-process backends, so they need no
+Postgres, Redis or broker. Settings are set before any application module is
+imported, since modules read them at import time.
+"""
+import os
+import sqlite3
+import tempfile
+import uuid
+
+import pytest
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(prefix="talentai-tests-"), "test.db")
+
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{DATABASE_PATH}",
+    "CELERY_BROKER_URL": "memory://",
+    "CELERY_RESULT_BACKEND": "cache+memory://",
+    "TASK_METRICS_PORT": "0",
+    "PARSE_CACHE_BACKEND": "none",
+    "BACKPRESSURE_DEPTH_BACKEND": "local",
+    "BLOB_STORE_BACKEND": "local",
+    "BLOB_STORE_PATH": os.path.join(os.path.dirname(DATABASE_PATH), "blobs"),
+    "IDEMPOTENCY_BACKEND": "local",
+    "MATCH_DEBOUNCE_BACKEND": "local",
+    "SCREENING_DEBOUNCE_BACKEND": "local",
+    "NOTIFICATION_DEBOUNCE_BACKEND": "local",
+    "NOTIFICATION_BUFFER_BACKEND": "local",
+    "AUTOMATION_DEBOUNCE_BACKEND": "local",
+    "AUTOMATION_BUFFER_BACKEND": "local",
+})
+
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+
+
+# Postgres column types the models use, stored as their SQLite equivalents
+@compiles(JSONB, "sqlite")
+@compiles(ARRAY, "sqlite")
+def _compile_json(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+sqlite3.register_adapter(uuid.UUID, lambda value: value.hex)
+
+
+@pytest.fixture
+def db():
+    """Session on freshly created tables"""
+    from shared.database import Base, SessionLocal, engine
+    from shared import models  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
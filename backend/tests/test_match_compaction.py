@@ -0,0 +1,66 @@
+"""JobMatch compaction (workers.tasks.matching.compact_job_matches)"""
+from datetime import datetime, timedelta
+
+from shared import models
+from workers import matches
+from workers.tasks import matching
+
+
+def _job_with_matches(db, scores, candidate_held=()):
+    """An active job matched to one new candidate per score; rows at candidate_held indexes are candidate-side"""
+    job = models.Job(title="Data Engineer", description="Pipelines", status=models.JobStatus.ACTIVE)
+    db.add(job)
+    db.flush()
+    rows = []
+    for index, score in enumerate(scores):
+        candidate = models.CandidateProfile()
+        db.add(candidate)
+        db.flush()
+        held = index in candidate_held
+        rows.append(models.JobMatch(
+            job_id=job.id, candidate_id=candidate.id, match_score=score,
+            ranked_for_job=not held, ranked_for_candidate=held
+        ))
+    db.add_all(rows)
+    db.commit()
+    return job, rows
+
+
+def _compact(keep_top_n):
+    return matching.compact_job_matches_task.apply(kwargs={'keep_top_n': keep_top_n, 'batch_size': 2}).result
+
+
+def test_beyond_top_n_keeps_candidate_held_rows(db):
+    # Five job-only rows, plus a candidate's own match ranked last for the job
+    job, rows = _job_with_matches(db, [0.9, 0.8, 0.7, 0.6, 0.5, 0.1], candidate_held={5})
+
+    result = _compact(keep_top_n=3)
+
+    assert result['status'] == 'complete'
+    assert result['deleted']['beyond_top_n'] == 2
+    remaining = {match.candidate_id for match in db.query(models.JobMatch).filter(models.JobMatch.job_id == job.id)}
+    assert remaining == {rows[0].candidate_id, rows[1].candidate_id, rows[2].candidate_id, rows[5].candidate_id}
+
+
+def test_jobs_over_top_counts_job_only_rows(db):
+    crowded, _ = _job_with_matches(db, [0.9, 0.8, 0.7])
+    shared_job, _ = _job_with_matches(db, [0.9, 0.8, 0.7], candidate_held={1, 2})
+
+    over, last = matches.jobs_over_top(db, 2)
+
+    assert over == [str(crowded.id)]
+    assert last == max(str(crowded.id), str(shared_job.id))
+
+
+def test_inactive_job_matches_without_updated_at_are_stale(db):
+    job, rows = _job_with_matches(db, [0.9, 0.8])
+    job.status = models.JobStatus.CLOSED
+    db.query(models.JobMatch).update(
+        {'updated_at': None, 'created_at': datetime.utcnow() - timedelta(days=90)}, synchronize_session=False
+    )
+    db.commit()
+
+    result = _compact(keep_top_n=10)
+
+    assert result['deleted']['inactive_jobs'] == 2
+    assert db.query(models.JobMatch).count() == 0
@@ -0,0 +1,52 @@
+"""LLM summaries of screened applications (workers.tasks.screening.summarize_application)"""
+from types import SimpleNamespace
+from unittest import mock
+
+from shared import models
+from workers.tasks import screening
+
+
+def _application(db):
+    job = models.Job(title="Backend Engineer", description="APIs", requirements=["python", "sql"])
+    candidate = models.CandidateProfile(skills=["python"], experience_years=4)
+    db.add_all([job, candidate])
+    db.flush()
+    application = models.Application(
+        job_id=job.id, candidate_id=candidate.id, screening_score=72.0, ai_summary="72% match."
+    )
+    db.add(application)
+    db.commit()
+    return application
+
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_summary_uses_chat_completions_client(db):
+    application = _application(db)
+    client = mock.Mock()
+    client.chat.completions.create.return_value = _completion("  Strong Python fit; light on SQL.  ")
+
+    with mock.patch.object(screening, "get_llm_client", return_value=client):
+        result = screening.summarize_application_task(application.id)
+
+    assert result == {'status': 'success', 'application_id': application.id}
+    request = client.chat.completions.create.call_args.kwargs
+    assert request["messages"][0]["role"] == "user"
+    assert "Backend Engineer" in request["messages"][0]["content"]
+    db.expire_all()
+    assert db.get(models.Application, application.id).ai_summary == "Strong Python fit; light on SQL."
+
+
+def test_summary_error_keeps_reason_summary(db):
+    application = _application(db)
+    client = mock.Mock()
+    client.chat.completions.create.side_effect = RuntimeError("rate limited")
+
+    with mock.patch.object(screening, "get_llm_client", return_value=client):
+        result = screening.summarize_application_task(application.id)
+
+    assert result['status'] == 'error'
+    db.expire_all()
+    assert db.get(models.Application, application.id).ai_summary == "72% match."
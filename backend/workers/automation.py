@@ -0,0 +1,506 @@
+"""
+Automation workflow engine
+Employers' AutomationWorkflow rows are evaluated against events such as
+"job_posted", "application_received" and "application_screened".
+
+Producers call emit_event(); events are buffered (shared/event_buffer.py) and
+a debounced task evaluates them in batches. Enabled workflows are kept in an
+in-memory index keyed by (trigger_type, employer_id), with their conditions
+compiled to predicates once and recompiled only when a row's updated_at
+changes, so an event is only tested against its own employer's workflows for
+that trigger (plus global workflows with no employer).
+
+Conditions (JSON, all keys must hold):
+    {"field": value}                    Equality; a list field matches if it contains value
+    {"field": {"gte": 70, "lt": 90}}    Operators: eq, ne, gt, gte, lt, lte, in, not_in,
+                                        contains, contains_any, exists
+    {"all": [...]}, {"any": [...]}, {"not": {...}}
+    Fields are event payload keys; dotted paths reach nested values.
+
+Actions (JSON list, dispatched once per batch by type):
+    {"type": "notify", "recipient": "employer" | "candidate", "title": "...",
+     "content": "...", "link": "...", "digest_key": "..."}
+    {"type": "update_status", "status": "screening" | "interview" | "rejected" | ...}
+    {"type": "rematch", "target": "job" | "candidate"}
+    {"type": "screen"}
+    {"type": "task", "name": "<a WORKFLOW_TASKS name>", "kwargs": {...}}
+    String values may reference payload fields, e.g. "New applicant for {job_title}".
+
+"task" actions may only send the tasks in WORKFLOW_TASKS, with keyword
+arguments checked by each task's validators after rendering. Actions whose
+dispatch fails are retried by workers.tasks.automation.retry_actions and
+dead-lettered (automation buffer's <key>:dead list) once retries run out.
+"""
+import logging
+import os
+import threading
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from shared import models
+from shared.debounce import build_debouncer
+from shared.event_buffer import build_event_buffer, publish_events
+from workers.celery_app import app
+
+logger = logging.getLogger(__name__)
+
+AUTOMATION_KEY = "automation:flush"
+
+# Events evaluated per flush; a fuller buffer flushes immediately
+AUTOMATION_BATCH_SIZE = int(os.getenv("AUTOMATION_BATCH_SIZE", 1000))
+
+automation_buffer = build_event_buffer("AUTOMATION", "automation:events")
+automation_debouncer = build_debouncer("AUTOMATION", window_seconds=1, max_delay_seconds=5)
+
+_MISSING = object()
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda value, expected: value == expected,
+    "ne": lambda value, expected: value != expected,
+    "gt": lambda value, expected: value is not None and value > expected,
+    "gte": lambda value, expected: value is not None and value >= expected,
+    "lt": lambda value, expected: value is not None and value < expected,
+    "lte": lambda value, expected: value is not None and value <= expected,
+    "in": lambda value, expected: value in expected,
+    "not_in": lambda value, expected: value not in expected,
+    "contains": lambda value, expected: _lower(expected) in _lowered(value),
+    "contains_any": lambda value, expected: bool(_lowered(value) & {_lower(item) for item in expected}),
+}
+
+
+def _lower(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+def _lowered(value: Any) -> set:
+    if value is None:
+        return set()
+    if isinstance(value, (list, tuple, set)):
+        return {_lower(item) for item in value}
+    return {_lower(value)}
+
+
+def _getter(field: str) -> Callable[[dict], Any]:
+    path = field.split(".")
+    if len(path) == 1:
+        return lambda payload: payload.get(field, _MISSING)
+
+    def get(payload: dict) -> Any:
+        value = payload
+        for part in path:
+            if not isinstance(value, dict) or part not in value:
+                return _MISSING
+            value = value[part]
+        return value
+    return get
+
+
+def _compile_field(field: str, spec: Any) -> Callable[[dict], bool]:
+    get = _getter(field)
+    if not isinstance(spec, dict):
+        def equals(payload: dict) -> bool:
+            value = get(payload)
+            if isinstance(value, list):
+                return spec in value
+            return value == spec
+        return equals
+
+    checks = []
+    for op, expected in spec.items():
+        if op == "exists":
+            checks.append(lambda value, expected=bool(expected): (value is not _MISSING) == expected)
+            continue
+        if op not in _OPERATORS:
+            raise ValueError(f"Unknown condition operator: {op}")
+        if op in ("in", "not_in", "contains_any") and not isinstance(expected, list):
+            raise ValueError(f"Operator {op} needs a list")
+        compare = _OPERATORS[op]
+        checks.append(lambda value, compare=compare, expected=expected:
+                      value is not _MISSING and compare(value, expected))
+
+    def check(payload: dict) -> bool:
+        value = get(payload)
+        return all(test(value) for test in checks)
+    return check
+
+
+def compile_conditions(conditions: Optional[dict]) -> Callable[[dict], bool]:
+    """
+    Compile a workflow's conditions into a predicate over event payloads
+
+    Raises:
+        ValueError: If the conditions are malformed
+    """
+    if not conditions:
+        return lambda payload: True
+    if not isinstance(conditions, dict):
+        raise ValueError("Conditions must be an object")
+
+    predicates = []
+    for key, spec in conditions.items():
+        if key in ("all", "any"):
+            if not isinstance(spec, list):
+                raise ValueError(f"'{key}' needs a list of conditions")
+            parts = [compile_conditions(part) for part in spec]
+            combine = all if key == "all" else any
+            predicates.append(lambda payload, parts=parts, combine=combine:
+                              combine(part(payload) for part in parts))
+        elif key == "not":
+            inner = compile_conditions(spec)
+            predicates.append(lambda payload, inner=inner: not inner(payload))
+        else:
+            predicates.append(_compile_field(key, spec))
+
+    if len(predicates) == 1:
+        return predicates[0]
+    return lambda payload: all(predicate(payload) for predicate in predicates)
+
+
+@dataclass
+class CompiledWorkflow:
+    """An enabled workflow with its conditions compiled"""
+    id: str
+    employer_id: Optional[str]
+    name: str
+    trigger_type: str
+    updated_at: Optional[datetime]
+    predicate: Callable[[dict], bool]
+    actions: List[dict]
+
+    def matches(self, payload: dict) -> bool:
+        try:
+            return self.predicate(payload)
+        except Exception as e:
+            # e.g. comparing a number with a string; treated as no match
+            logger.debug(f"Workflow {self.id} condition error: {str(e)}")
+            return False
+
+
+class WorkflowIndex:
+    """Enabled workflows indexed by (trigger_type, employer_id)"""
+
+    def __init__(self):
+        self._workflows: Dict[str, CompiledWorkflow] = {}
+        self._by_trigger: Dict[Tuple[str, Optional[str]], List[CompiledWorkflow]] = {}
+        self._version = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._workflows)
+
+    def refresh(self, db) -> bool:
+        """
+        Sync with the automation_workflows table
+
+        One aggregate query when nothing changed; otherwise only added or
+        updated rows are loaded and compiled.
+
+        Returns:
+            True if the index changed
+        """
+        workflow = models.AutomationWorkflow
+        version = tuple(db.query(func.count(workflow.id), func.max(workflow.updated_at)).one())
+        if version == self._version:
+            return False
+
+        with self._lock:
+            current = {
+                str(workflow_id): updated_at
+                for workflow_id, updated_at in db.query(workflow.id, workflow.updated_at).filter(
+                    workflow.enabled.is_(True)
+                ).all()
+            }
+            stale = [workflow_id for workflow_id, updated_at in current.items()
+                     if workflow_id not in self._workflows
+                     or self._workflows[workflow_id].updated_at != updated_at]
+
+            workflows = {workflow_id: compiled for workflow_id, compiled in self._workflows.items()
+                         if workflow_id in current and workflow_id not in stale}
+            if stale:
+                for row in db.query(workflow).filter(workflow.id.in_(stale)).all():
+                    compiled = self._compile(row)
+                    if compiled is not None:
+                        workflows[compiled.id] = compiled
+
+            by_trigger = defaultdict(list)
+            for compiled in workflows.values():
+                by_trigger[(compiled.trigger_type, compiled.employer_id)].append(compiled)
+
+            self._workflows = workflows
+            self._by_trigger = dict(by_trigger)
+            self._version = version
+
+        logger.info(f"Workflow index refreshed: {len(workflows)} enabled, {len(stale)} compiled")
+        return True
+
+    @staticmethod
+    def _compile(row) -> Optional[CompiledWorkflow]:
+        try:
+            predicate = compile_conditions(row.conditions)
+        except ValueError as e:
+            logger.warning(f"Skipping workflow {row.id} ({row.name}): {str(e)}")
+            return None
+        return CompiledWorkflow(
+            id=str(row.id),
+            employer_id=str(row.employer_id) if row.employer_id else None,
+            name=row.name,
+            trigger_type=row.trigger_type,
+            updated_at=row.updated_at,
+            predicate=predicate,
+            actions=[action for action in (row.actions or []) if isinstance(action, dict)]
+        )
+
+    def candidates(self, trigger_type: str, employer_id: Optional[str]) -> List[CompiledWorkflow]:
+        """Workflows that can fire for an event, before conditions"""
+        scoped = self._by_trigger.get((trigger_type, employer_id), []) if employer_id else []
+        return scoped + self._by_trigger.get((trigger_type, None), [])
+
+    def evaluate(self, events: List[dict]) -> List[Tuple[CompiledWorkflow, dict]]:
+        """(workflow, event) pairs whose conditions hold"""
+        matched = []
+        for event in events:
+            payload = event.get('payload') or {}
+            for compiled in self.candidates(event.get('trigger_type'), event.get('employer_id')):
+                if compiled.matches(payload):
+                    matched.append((compiled, event))
+        return matched
+
+
+workflow_index = WorkflowIndex()
+
+
+class _Fields(dict):
+    def __missing__(self, key):
+        return ""
+
+
+def render(value: Any, payload: dict) -> Any:
+    """Fill {field} references in an action string from the event payload"""
+    if not isinstance(value, str) or "{" not in value:
+        return value
+    try:
+        return value.format_map(_Fields(payload))
+    except (ValueError, IndexError, AttributeError):
+        return value
+
+
+def _dispatch_notify(items: list) -> int:
+    from workers.notifications import publish_notifications
+
+    notifications = []
+    for compiled, action, payload in items:
+        recipient = action.get('recipient', 'employer')
+        user_id = payload.get(f"{recipient}_user_id")
+        if not user_id:
+            continue
+        notifications.append({
+            'user_id': str(user_id),
+            'type': 'automation',
+            'title': render(action.get('title'), payload) or compiled.name,
+            'content': render(action.get('content'), payload),
+            'link': render(action.get('link'), payload),
+            'digest_key': render(action.get('digest_key'), payload)
+        })
+    publish_notifications(notifications)
+    return len(notifications)
+
+
+def _dispatch_update_status(items: list) -> int:
+    statuses = {status.value for status in models.ApplicationStatus}
+    updates = {}
+    for compiled, action, payload in items:
+        status = action.get('status')
+        if payload.get('application_id') and status in statuses:
+            # Later workflows win for the same application
+            updates[str(payload['application_id'])] = status
+    if updates:
+        app.send_task('workers.tasks.automation.update_application_status',
+                      args=[[{'id': application_id, 'status': status}
+                             for application_id, status in updates.items()]])
+    return len(updates)
+
+
+def _dispatch_rematch(items: list) -> int:
+    from workers.matches import trigger_matching
+
+    targets = set()
+    for compiled, action, payload in items:
+        target = action.get('target', 'job')
+        if target in ('job', 'candidate') and payload.get(f"{target}_id"):
+            targets.add((target, str(payload[f"{target}_id"])))
+    for target, entity_id in targets:
+        trigger_matching(target, entity_id)
+    return len(targets)
+
+
+def _dispatch_screen(items: list) -> int:
+    from workers.screening import trigger_screening
+
+    trigger_screening()
+    return 1
+
+
+def _uuid_argument(value: Any) -> str:
+    return str(uuid.UUID(str(value)))
+
+
+def _top_k_argument(value: Any) -> int:
+    top_k = int(value)
+    if not 1 <= top_k <= 500:
+        raise ValueError("top_k must be between 1 and 500")
+    return top_k
+
+
+# Tasks a workflow's "task" action may send: keyword argument -> (validator, required)
+WORKFLOW_TASKS: Dict[str, Dict[str, Tuple[Callable[[Any], Any], bool]]] = {
+    "workers.tasks.matching.match_candidates_for_job": {
+        "job_id": (_uuid_argument, True),
+        "top_k": (_top_k_argument, False),
+    },
+    "workers.tasks.matching.match_jobs_for_candidate": {
+        "candidate_id": (_uuid_argument, True),
+        "top_k": (_top_k_argument, False),
+    },
+    "workers.tasks.screening.summarize_application": {
+        "application_id": (_uuid_argument, True),
+    },
+}
+
+
+def validate_task_kwargs(name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check a "task" action against WORKFLOW_TASKS
+
+    Returns:
+        The validated keyword arguments
+
+    Raises:
+        ValueError: If the task isn't allowed or an argument is missing, unknown or invalid
+    """
+    spec = WORKFLOW_TASKS.get(name)
+    if spec is None:
+        raise ValueError(f"Task {name} is not available to workflows")
+    unknown = set(kwargs) - set(spec)
+    if unknown:
+        raise ValueError(f"Unknown arguments for {name}: {', '.join(sorted(unknown))}")
+    validated = {}
+    for key, (validator, required) in spec.items():
+        if key not in kwargs or kwargs[key] in (None, ""):
+            if required:
+                raise ValueError(f"Missing argument {key} for {name}")
+            continue
+        try:
+            validated[key] = validator(kwargs[key])
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid {key} for {name}: {str(e)}") from e
+    return validated
+
+
+def _dispatch_task(items: list) -> int:
+    sent = 0
+    for compiled, action, payload in items:
+        name = action.get('name') or ''
+        kwargs = {key: render(value, payload) for key, value in (action.get('kwargs') or {}).items()}
+        try:
+            kwargs = validate_task_kwargs(name, kwargs)
+        except ValueError as e:
+            logger.warning(f"Workflow {compiled.id} task action rejected: {str(e)}")
+            continue
+        app.send_task(name, kwargs=kwargs)
+        sent += 1
+    return sent
+
+
+ACTION_HANDLERS: Dict[str, Callable[[list], int]] = {
+    "notify": _dispatch_notify,
+    "update_status": _dispatch_update_status,
+    "rematch": _dispatch_rematch,
+    "screen": _dispatch_screen,
+    "task": _dispatch_task,
+}
+
+
+@dataclass
+class WorkflowRef:
+    """The parts of a workflow action handlers use, for actions being retried"""
+    id: str
+    name: str
+
+
+def _dispatch_grouped(grouped: Dict[str, list]) -> Tuple[Dict[str, int], List[dict]]:
+    dispatched = {}
+    failed = []
+    for action_type, items in grouped.items():
+        handler = ACTION_HANDLERS.get(action_type)
+        if handler is None:
+            logger.warning(f"Unknown workflow action type: {action_type}")
+            continue
+        try:
+            dispatched[action_type] = handler(items)
+        except Exception as e:
+            # One failing action type doesn't block the others
+            logger.error(f"Error dispatching {len(items)} '{action_type}' actions: {str(e)}")
+            failed.extend(
+                {'workflow_id': compiled.id, 'workflow_name': compiled.name,
+                 'action': action, 'payload': payload, 'error': str(e)}
+                for compiled, action, payload in items
+            )
+    return dispatched, failed
+
+
+def dispatch_actions(matched: List[Tuple[CompiledWorkflow, dict]]) -> Tuple[Dict[str, int], List[dict]]:
+    """
+    Dispatch the actions of matched workflows, grouped by action type
+
+    Returns:
+        (dispatched count per action type, failed actions to retry)
+    """
+    grouped = defaultdict(list)
+    for compiled, event in matched:
+        payload = event.get('payload') or {}
+        for action in compiled.actions:
+            grouped[action.get('type')].append((compiled, action, payload))
+    return _dispatch_grouped(grouped)
+
+
+def dispatch_failed_actions(failed: List[dict]) -> Tuple[Dict[str, int], List[dict]]:
+    """Dispatch actions returned as failed by an earlier dispatch"""
+    grouped = defaultdict(list)
+    for item in failed:
+        action = item['action']
+        grouped[action.get('type')].append(
+            (WorkflowRef(item['workflow_id'], item['workflow_name']), action, item['payload'])
+        )
+    return _dispatch_grouped(grouped)
+
+
+def _schedule_flush(countdown: float, force: bool) -> None:
+    app.send_task('workers.tasks.automation.process_events',
+                  kwargs={'force': force}, countdown=countdown)
+
+
+def publish_automation_events(events: List[Dict[str, Any]]) -> bool:
+    """Buffer automation events for batched evaluation"""
+    return publish_events(automation_buffer, automation_debouncer, AUTOMATION_KEY,
+                          AUTOMATION_BATCH_SIZE, events, _schedule_flush)
+
+
+def emit_event(trigger_type: str, employer_id: Any, **payload) -> bool:
+    """
+    Buffer one automation event
+
+    Args:
+        trigger_type: Workflow trigger, e.g. "application_received"
+        employer_id: Employer profile whose workflows apply
+        **payload: Fields available to conditions and action templates
+    """
+    return publish_automation_events([{
+        'trigger_type': trigger_type,
+        'employer_id': str(employer_id) if employer_id else None,
+        'payload': payload
+    }])
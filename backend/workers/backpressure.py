@@ -0,0 +1,276 @@
+"""
+Backpressure for bulk producers
+Bulk work (bulk parse, full rematch, backfills) goes to a low-priority
+"<queue>.bulk" sibling of each task's normal queue, and is enqueued no faster
+than workers drain it: a producer keeps at most BULK_TARGET_BACKLOG messages
+waiting in the bulk queue and pauses until it drains below half of that.
+Interactive tasks keep their own queues and never wait behind a backfill.
+
+Run dedicated workers for the bulk queues, e.g.
+    celery -A workers.celery_app worker -Q matching.bulk,resume.bulk --concurrency 2
+so bulk throughput is capped by their concurrency rather than competing with
+the interactive pools.
+
+Queue depth comes from the broker (a passive queue declare, which reports the
+messages ready in RabbitMQ or Redis), or from a counter incremented when a
+message is published to a bulk queue and decremented when a worker finishes
+it, for when the broker can't be asked (BACKPRESSURE_DEPTH_BACKEND=counter).
+"""
+import fnmatch
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from celery import current_task
+from celery.signals import before_task_publish, task_postrun
+
+from workers.celery_app import app
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+BULK_QUEUE_SUFFIX = ".bulk"
+
+# Messages a bulk producer keeps waiting in its queue
+BULK_TARGET_BACKLOG = int(os.getenv("BULK_TARGET_BACKLOG", 200))
+# Seconds between depth checks while paused
+BULK_POLL_SECONDS = float(os.getenv("BULK_POLL_SECONDS", 2))
+
+
+def queue_for(task_name: str) -> str:
+    """Queue a task is routed to by app.conf.task_routes"""
+    for pattern, route in (app.conf.task_routes or {}).items():
+        if fnmatch.fnmatchcase(task_name, pattern):
+            return route['queue']
+    return app.conf.task_default_queue
+
+
+def bulk_queue(task_name: str) -> str:
+    """Low-priority queue for bulk invocations of a task"""
+    return queue_for(task_name) + BULK_QUEUE_SUFFIX
+
+
+class BrokerQueueDepth:
+    """Messages ready in a queue, as reported by the broker"""
+
+    def __init__(self):
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def depth(self, queue: str) -> int:
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._connection = app.connection_for_read()
+                _, message_count, _ = self._connection.default_channel.queue_declare(queue=queue, passive=True)
+                return message_count
+            except Exception as e:
+                # A queue nobody has declared yet is empty
+                logger.debug(f"Queue depth probe for {queue} failed: {str(e)}")
+                self._reset()
+                return 0
+
+    def _reset(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.release()
+            except Exception:
+                pass
+        self._connection = None
+
+    def record(self, queue: str, count: int = 1) -> None:
+        pass
+
+    def done(self, queue: str, count: int = 1) -> None:
+        pass
+
+
+class RedisQueueDepth:
+    """Counter of messages sent minus messages finished, shared through Redis"""
+
+    PREFIX = "backpressure:depth:"
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("redis package is required for the Redis queue depth counter")
+        self.client = redis.Redis.from_url(url)
+
+    def depth(self, queue: str) -> int:
+        return max(int(self.client.get(self.PREFIX + queue) or 0), 0)
+
+    def record(self, queue: str, count: int = 1) -> None:
+        self.client.incrby(self.PREFIX + queue, count)
+
+    def done(self, queue: str, count: int = 1) -> None:
+        self.client.decrby(self.PREFIX + queue, count)
+
+
+class LocalQueueDepth:
+    """In-process counter for tests and embedded workers"""
+
+    def __init__(self):
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def depth(self, queue: str) -> int:
+        return max(self._counts.get(queue, 0), 0)
+
+    def record(self, queue: str, count: int = 1) -> None:
+        with self._lock:
+            self._counts[queue] = self._counts.get(queue, 0) + count
+
+    def done(self, queue: str, count: int = 1) -> None:
+        with self._lock:
+            self._counts[queue] = self._counts.get(queue, 0) - count
+
+
+def build_queue_depth():
+    """
+    Build the queue depth source configured by environment variables
+
+    BACKPRESSURE_DEPTH_BACKEND: broker | counter | local (default broker)
+    """
+    backend = os.getenv("BACKPRESSURE_DEPTH_BACKEND", "broker").lower()
+    if backend == "broker":
+        return BrokerQueueDepth()
+    if backend == "counter":
+        return RedisQueueDepth(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if backend == "local":
+        return LocalQueueDepth()
+    raise ValueError(f"Unknown BACKPRESSURE_DEPTH_BACKEND: {backend}")
+
+
+queue_depth = build_queue_depth()
+
+
+def in_bulk_message() -> bool:
+    """True while the current task was delivered from a bulk queue"""
+    request = getattr(current_task, 'request', None)
+    delivery_info = getattr(request, 'delivery_info', None) or {}
+    return (delivery_info.get('routing_key') or '').endswith(BULK_QUEUE_SUFFIX)
+
+
+def to_bulk(signature):
+    """Route a signature to its task's bulk queue"""
+    return signature.set(queue=bulk_queue(signature.task))
+
+
+def keep_bulk(signature):
+    """Route a subtask signature to its bulk queue when the current task is bulk work"""
+    return to_bulk(signature) if in_bulk_message() else signature
+
+
+@before_task_publish.connect
+def _count_published(routing_key=None, **kwargs):
+    """Increment counter-based depth when a message is published to a bulk queue"""
+    queue = routing_key or ''
+    if queue.endswith(BULK_QUEUE_SUFFIX):
+        try:
+            queue_depth.record(queue)
+        except Exception as e:
+            logger.debug(f"Could not update depth counter for {queue}: {str(e)}")
+
+
+@task_postrun.connect
+def _count_finished(task=None, **kwargs):
+    """Decrement counter-based depth when a bulk message is processed"""
+    delivery_info = getattr(getattr(task, 'request', None), 'delivery_info', None) or {}
+    queue = delivery_info.get('routing_key') or ''
+    if queue.endswith(BULK_QUEUE_SUFFIX):
+        try:
+            queue_depth.done(queue)
+        except Exception as e:
+            logger.debug(f"Could not update depth counter for {queue}: {str(e)}")
+
+
+class BulkProducer:
+    """
+    Enqueue bulk work for one task at the rate its workers drain it
+
+    Usage:
+        producer = BulkProducer('workers.tasks.matching.match_jobs_for_candidate')
+        producer.send_many(candidate_ids)
+    """
+
+    def __init__(self, task_name: str, queue: Optional[str] = None,
+                 target_backlog: int = BULK_TARGET_BACKLOG, poll_seconds: float = BULK_POLL_SECONDS,
+                 depth=None, sleep: Callable[[float], Any] = time.sleep):
+        self.task_name = task_name
+        self.queue = queue or bulk_queue(task_name)
+        self.target_backlog = max(int(target_backlog), 1)
+        # Resume once the backlog falls to half the target
+        self.resume_backlog = self.target_backlog // 2
+        self.poll_seconds = poll_seconds
+        self.depth = depth or queue_depth
+        self.sleep = sleep
+        self.sent = 0
+        self.waited_seconds = 0.0
+        self._headroom = 0
+
+    def headroom(self) -> int:
+        """Messages that can be sent now without exceeding the target backlog"""
+        self._headroom = max(self.target_backlog - self.depth.depth(self.queue), 0)
+        return self._headroom
+
+    def wait(self, max_wait: Optional[float] = None) -> bool:
+        """
+        Block until the queue has room
+
+        Returns:
+            False if max_wait passed first
+        """
+        if self._headroom > 0 or self.headroom() > 0:
+            return True
+        started = time.monotonic()
+        while True:
+            self.sleep(self.poll_seconds)
+            waited = time.monotonic() - started
+            if self.depth.depth(self.queue) <= self.resume_backlog:
+                self.waited_seconds += waited
+                self.headroom()
+                return True
+            if max_wait is not None and waited >= max_wait:
+                self.waited_seconds += waited
+                return False
+
+    def send(self, args: Optional[list] = None, kwargs: Optional[dict] = None, block: bool = True, **options):
+        """
+        Send one message, first waiting for room in the queue
+
+        Args:
+            block: Wait for room; callers that checked headroom() or wait() themselves pass False
+        """
+        if block:
+            self.wait()
+        # Counter-based depth is recorded by _count_published
+        result = app.send_task(self.task_name, args=args, kwargs=kwargs, queue=self.queue, **options)
+        self._headroom -= 1
+        self.sent += 1
+        return result
+
+    def send_many(self, items: Iterable[Any], build: Callable[[Any], dict] = None, **send_options) -> List[Any]:
+        """
+        Send one message per item
+
+        Args:
+            items: Work items, e.g. candidate ids
+            build: Maps an item to send() keyword arguments; default args=[str(item)]
+            send_options: Passed to every send(), e.g. block=False
+
+        Returns:
+            One AsyncResult per item
+        """
+        return [
+            self.send(**(build(item) if build else {'args': [str(item)]}), **send_options)
+            for item in items
+        ]
+
+    def stats(self) -> dict:
+        return {'queue': self.queue, 'sent': self.sent, 'waited_seconds': round(self.waited_seconds, 1)}
+
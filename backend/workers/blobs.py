@@ -0,0 +1,165 @@
+"""
+Blob store for large task payloads
+Payloads above BLOB_THRESHOLD_BYTES travel through the broker and result
+backend as a small reference ({"__blob__": key}) instead of inline; tasks call
+resolve() on arguments and shard results that may be references
+"""
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Optional
+
+from workers.serialization import dumps, loads
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+BLOB_THRESHOLD_BYTES = int(os.getenv("BLOB_THRESHOLD_BYTES", 64 * 1024))
+BLOB_TTL = int(os.getenv("BLOB_TTL", 6 * 3600))
+# Seconds between sweeps of expired local blobs
+BLOB_SWEEP_SECONDS = int(os.getenv("BLOB_SWEEP_SECONDS", 600))
+
+BLOB_KEY = "__blob__"
+
+logger = logging.getLogger(__name__)
+
+
+class RedisBlobBackend:
+    """Blobs in Redis with a TTL (shared by all workers)"""
+
+    PREFIX = "task_blob:"
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("redis package is required for the Redis blob store")
+        self.client = redis.Redis.from_url(url)
+
+    def put(self, key: str, data: bytes, ttl_seconds: int) -> None:
+        self.client.setex(self.PREFIX + key, ttl_seconds, data)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.PREFIX + key)
+
+
+class LocalBlobBackend:
+    """
+    Blobs as files under a directory (single host, tests)
+
+    A file's mtime is its expiry time. Blobs nobody reads again (a failed
+    chord, a dropped message) are removed by a sweep that put runs at most
+    every sweep_seconds.
+    """
+
+    def __init__(self, root: str, sweep_seconds: int = BLOB_SWEEP_SECONDS):
+        self.root = Path(root)
+        self.sweep_seconds = sweep_seconds
+        self._next_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+
+    def put(self, key: str, data: bytes, ttl_seconds: int) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / key
+        path.write_bytes(data)
+        expires = time.time() + ttl_seconds
+        os.utime(path, (expires, expires))
+        self._maybe_sweep()
+
+    def sweep(self) -> int:
+        """
+        Delete expired blobs
+
+        Returns:
+            Number of blobs deleted
+        """
+        now = time.time()
+        deleted = 0
+        try:
+            paths = list(self.root.iterdir())
+        except FileNotFoundError:
+            return 0
+        for path in paths:
+            try:
+                if path.stat().st_mtime < now:
+                    path.unlink()
+                    deleted += 1
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    def _maybe_sweep(self) -> None:
+        now = time.monotonic()
+        if now < self._next_sweep or not self._sweep_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_sweep = now + self.sweep_seconds
+            deleted = self.sweep()
+            if deleted:
+                logger.info(f"Swept {deleted} expired blobs from {self.root}")
+        except OSError as e:
+            logger.warning(f"Could not sweep blobs in {self.root}: {str(e)}")
+        finally:
+            self._sweep_lock.release()
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.root / key
+        try:
+            if path.stat().st_mtime < time.time():
+                path.unlink()
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+
+def build_blob_backend():
+    """
+    Build the blob backend configured by environment variables
+
+    BLOB_STORE_BACKEND: redis | local (default redis)
+    BLOB_STORE_PATH: Directory for the local backend
+    """
+    backend = os.getenv("BLOB_STORE_BACKEND", "redis").lower()
+    if backend == "redis":
+        return RedisBlobBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if backend == "local":
+        return LocalBlobBackend(os.getenv("BLOB_STORE_PATH", "/tmp/talentai/blobs"))
+    raise ValueError(f"Unknown BLOB_STORE_BACKEND: {backend}")
+
+
+backend = build_blob_backend()
+
+
+def put_blob(obj: Any, ttl_seconds: int = BLOB_TTL) -> dict:
+    """Store obj and return a reference to pass in its place"""
+    key = uuid.uuid4().hex
+    backend.put(key, dumps(obj), ttl_seconds)
+    return {BLOB_KEY: key}
+
+
+def maybe_blob(obj: Any, threshold: int = BLOB_THRESHOLD_BYTES, ttl_seconds: int = BLOB_TTL) -> Any:
+    """Return obj, or a blob reference when its encoded size exceeds threshold"""
+    data = dumps(obj)
+    if len(data) <= threshold:
+        return obj
+    key = uuid.uuid4().hex
+    backend.put(key, data, ttl_seconds)
+    return {BLOB_KEY: key}
+
+
+def is_blob(obj: Any) -> bool:
+    return isinstance(obj, dict) and len(obj) == 1 and BLOB_KEY in obj
+
+
+def resolve(obj: Any) -> Any:
+    """Return the payload behind a blob reference (other values pass through)"""
+    if not is_blob(obj):
+        return obj
+    data = backend.get(obj[BLOB_KEY])
+    if data is None:
+        raise LookupError(f"Task blob {obj[BLOB_KEY]} has expired or does not exist")
+    return loads(data)
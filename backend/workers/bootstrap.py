@@ -0,0 +1,126 @@
+"""
+Worker warm-up and readiness
+With the prefork pool, worker_init runs in the parent before the pool forks.
+Models loaded there (spaCy parser, skill taxonomy, matcher) are shared with
+every child copy-on-write, including children recycled by
+worker_max_tasks_per_child, so no child pays the load on its first task.
+Once the pool is up, a readiness file is written for health checks.
+"""
+import gc
+import json
+import logging
+import os
+import time
+
+from celery.signals import worker_init, worker_process_init, worker_ready, worker_shutdown
+
+logger = logging.getLogger(__name__)
+
+# auto: load what the consumed queues need | all | none
+WORKER_WARMUP = os.getenv("WORKER_WARMUP", "auto").lower()
+WORKER_READY_FILE = os.getenv("WORKER_READY_FILE", "/tmp/talentai/worker_ready")
+
+# Queues whose tasks use each model
+WARMUP_QUEUES = {
+    "parser": {"resume"},
+    "matcher": {"matching", "screening"},
+}
+
+warmup_report = {"status": "starting", "models": [], "seconds": 0.0}
+
+
+def _consumed_queues(worker):
+    """Queue names this worker consumes, or None when it consumes all of them"""
+    try:
+        consume_from = worker.app.amqp.queues.consume_from
+    except AttributeError:
+        return None
+    return set(consume_from) if consume_from else None
+
+
+def _is_prefork(worker) -> bool:
+    pool_cls = getattr(worker, "pool_cls", None)
+    name = getattr(pool_cls, "__module__", None) or str(pool_cls or "prefork")
+    return "prefork" in name
+
+
+def models_to_warm(queues) -> list:
+    """Models to preload for a set of consumed queues"""
+    if WORKER_WARMUP == "none":
+        return []
+    if WORKER_WARMUP == "all" or queues is None:
+        return list(WARMUP_QUEUES)
+    return [model for model, needed in WARMUP_QUEUES.items() if needed & queues]
+
+
+def warm_up(models: list) -> dict:
+    """Load models into this process and freeze them out of the GC's reach"""
+    started = time.perf_counter()
+    if "parser" in models:
+        from workers.tasks import resume_processing
+        parser = resume_processing.get_parser()
+        # Exercise the pipeline once so lazily built state exists before forking
+        parser.parse_text("Warm Up\nPython developer\nwarm.up@example.com", full_extraction=True)
+    if "matcher" in models:
+        from workers.tasks import matching
+        from ml_models.matching.matcher import CandidateProfile, JobPosting
+        matching.matcher.calculate_match(
+            CandidateProfile(id="warmup", skills=["python"], experience_years=1, location="",
+                             salary_expectation=0, preferences={}),
+            JobPosting(id="warmup", required_skills=["python"], nice_to_have_skills=[],
+                       experience_required=0, location="", salary_max=0, job_type="full-time")
+        )
+
+    # Move everything loaded so far to the permanent generation; otherwise the
+    # collector's refcount writes in each child would un-share those pages
+    gc.collect()
+    gc.freeze()
+    return {"status": "warm", "models": models, "seconds": round(time.perf_counter() - started, 3)}
+
+
+@worker_init.connect
+def preload_models(sender=None, **kwargs):
+    """Preload models in the parent process before the pool forks"""
+    if not _is_prefork(sender):
+        logger.info("Skipping model preload: pool is not prefork")
+        warmup_report.update(status="skipped")
+        return
+
+    models = models_to_warm(_consumed_queues(sender))
+    if not models:
+        warmup_report.update(status="skipped")
+        return
+
+    try:
+        warmup_report.update(warm_up(models))
+        logger.info(f"Worker warm-up loaded {', '.join(models)} in {warmup_report['seconds']}s")
+    except Exception as e:
+        # Children fall back to loading lazily on their first task
+        logger.error(f"Worker warm-up failed: {str(e)}")
+        warmup_report.update(status="failed", error=str(e))
+
+
+@worker_process_init.connect
+def reset_child_connections(**kwargs):
+    """Drop database connections inherited from the parent across the fork"""
+    from shared.database import engine
+    engine.dispose(close=False)
+
+
+@worker_ready.connect
+def mark_ready(sender=None, **kwargs):
+    """Write the readiness file once the pool is accepting tasks"""
+    directory = os.path.dirname(WORKER_READY_FILE)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(WORKER_READY_FILE, "w") as file:
+        json.dump({**warmup_report, "pid": os.getpid(), "ready_at": time.time()}, file)
+    logger.info(f"Worker ready ({warmup_report['status']})")
+
+
+@worker_shutdown.connect
+def clear_ready(**kwargs):
+    try:
+        os.remove(WORKER_READY_FILE)
+    except FileNotFoundError:
+        pass
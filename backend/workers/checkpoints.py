@@ -0,0 +1,46 @@
+"""
+Checkpoint persistence for long-running, resumable worker jobs
+Checkpoints are written in the same transaction as the work they describe
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from shared import models
+
+
+def load_checkpoint(db, name: str) -> models.TaskCheckpoint:
+    """Return the checkpoint row for a job, creating it on first use"""
+    checkpoint = db.query(models.TaskCheckpoint).filter(models.TaskCheckpoint.name == name).first()
+    if checkpoint is None:
+        checkpoint = models.TaskCheckpoint(name=name, processed=0, state={})
+        db.add(checkpoint)
+        db.flush()
+    return checkpoint
+
+
+def advance_checkpoint(checkpoint: models.TaskCheckpoint, last_key: Any, processed: int,
+                       state: Optional[Dict[str, Any]] = None) -> None:
+    """Record progress; the caller commits together with the chunk's writes"""
+    checkpoint.last_key = str(last_key)
+    checkpoint.processed = (checkpoint.processed or 0) + processed
+    if state:
+        checkpoint.state = {**(checkpoint.state or {}), **state}
+
+
+def complete_checkpoint(checkpoint: models.TaskCheckpoint) -> None:
+    checkpoint.completed_at = datetime.utcnow()
+
+
+def reset_checkpoint(checkpoint: models.TaskCheckpoint) -> None:
+    """Start the job over from the beginning"""
+    checkpoint.last_key = None
+    checkpoint.processed = 0
+    checkpoint.state = {}
+    checkpoint.started_at = datetime.utcnow()
+    checkpoint.completed_at = None
+
+
+def is_stalled(checkpoint: models.TaskCheckpoint, stall_seconds: float) -> bool:
+    """True when the job has recorded no progress for stall_seconds"""
+    last_progress = checkpoint.updated_at or checkpoint.started_at
+    return last_progress is None or datetime.utcnow() - last_progress > timedelta(seconds=stall_seconds)
@@ -0,0 +1,288 @@
+"""
+Embedded task executor
+With TASK_EXECUTOR=embedded the gateway runs the task functions itself: the
+broker is kombu's in-memory transport, results live in process memory, and
+Celery workers consume the queues from threads inside the gateway process.
+Single-node deployments and benchmark runs need no RabbitMQ, Redis or
+separate worker processes, and a task reaches its worker without a network
+round trip.
+
+Everything above the transport is unchanged: tasks are routed by
+app.conf.task_routes, retries and countdowns go through the worker's timer,
+chords join in the result backend, and bulk work still lands on the
+"<queue>.bulk" queues (see workers/backpressure.py).
+
+Each EMBEDDED_WORKERS entry is one worker with its own thread pool, so
+interactive queues keep their concurrency no matter how much bulk work is
+queued:
+    EMBEDDED_WORKERS=resume:2,matching:2,resume.bulk+matching.bulk:1
+runs two threads for "resume", two for "matching", and one shared thread for
+both bulk queues. Queues not listed are not consumed.
+
+Messages, results, debounce windows and event buffers are process-local in
+this mode; anything still queued when the process exits is lost. Run the
+gateway with a single process (one uvicorn worker) when the executor is
+embedded.
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+from celery.backends.cache import CacheBackend, DummyClient
+from celery.result import _set_task_join_will_block
+
+logger = logging.getLogger(__name__)
+
+# Settings are read when used, so values loaded from .env at app import apply
+DEFAULT_EMBEDDED_WORKERS = (
+    "resume:2,extraction:1,matching:2,screening:1,llm:2,notifications:1,automation:1,celery:1,"
+    "resume.bulk+matching.bulk:1"
+)
+# Seconds between in-memory queue polls
+DEFAULT_POLL_SECONDS = 0.01
+DEFAULT_START_TIMEOUT = 30
+DEFAULT_BEAT_SCHEDULE = "/tmp/talentai/celerybeat-schedule"
+
+# Shared stores that default to Redis; in-process equivalents are used instead
+# unless configured explicitly
+LOCAL_BACKEND_SETTINGS = [
+    "MATCH_DEBOUNCE_BACKEND",
+    "SCREENING_DEBOUNCE_BACKEND",
+    "NOTIFICATION_DEBOUNCE_BACKEND",
+    "NOTIFICATION_BUFFER_BACKEND",
+    "AUTOMATION_DEBOUNCE_BACKEND",
+    "AUTOMATION_BUFFER_BACKEND",
+    "IDEMPOTENCY_BACKEND",
+    "BLOB_STORE_BACKEND",
+]
+
+
+# Results of every thread in the process
+_result_store = DummyClient()
+
+
+class InProcessResultBackend(CacheBackend):
+    """
+    Memory cache result backend with one store per process
+
+    app.backend is created per thread, and cache+memory:// would give each
+    thread its own store, so a worker thread's result (or chord counter)
+    would never be seen by the thread waiting on it.
+    """
+
+    def __init__(self, app, **kwargs):
+        super().__init__(app, backend="memory://", **kwargs)
+
+    @property
+    def client(self):
+        return _result_store
+
+
+def is_enabled() -> bool:
+    """True when TASK_EXECUTOR selects the embedded executor (default celery)"""
+    return os.getenv("TASK_EXECUTOR", "celery").lower() == "embedded"
+
+
+def parse_workers(spec: str) -> List[Tuple[List[str], int]]:
+    """
+    Parse an EMBEDDED_WORKERS value
+
+    Returns:
+        [(queues, concurrency)] for "queue[+queue...][:concurrency]" entries
+    """
+    workers = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        queues, _, concurrency = entry.partition(":")
+        names = [name.strip() for name in queues.split("+") if name.strip()]
+        if not names:
+            raise ValueError(f"Invalid EMBEDDED_WORKERS entry: {entry}")
+        workers.append((names, max(int(concurrency or 1), 1)))
+    return workers
+
+
+def configure(app) -> bool:
+    """
+    Switch the app to the in-memory broker and result backend
+
+    Called while workers/celery_app.py is imported, before any module builds
+    its debouncer, buffer or blob store.
+
+    Returns:
+        True if the embedded executor is selected
+    """
+    if not is_enabled():
+        return False
+    for name in LOCAL_BACKEND_SETTINGS:
+        os.environ.setdefault(name, "local")
+    app.conf.update(
+        broker_url="memory://localhost//",
+        result_backend="workers.embedded:InProcessResultBackend",
+        broker_transport_options={
+            "polling_interval": float(os.getenv("EMBEDDED_POLL_SECONDS", DEFAULT_POLL_SECONDS))
+        },
+        worker_hijack_root_logger=False,
+        worker_enable_remote_control=False,
+    )
+    return True
+
+
+class EmbeddedExecutor:
+    """
+    Celery workers running on threads of the current process
+
+    Usage:
+        executor = EmbeddedExecutor(app)
+        executor.start()
+        ...
+        executor.stop()
+    """
+
+    def __init__(self, app, workers: Optional[List[Tuple[List[str], int]]] = None, beat: Optional[bool] = None):
+        self.app = app
+        self.specs = workers if workers is not None else parse_workers(
+            os.getenv("EMBEDDED_WORKERS", DEFAULT_EMBEDDED_WORKERS)
+        )
+        self.beat = beat if beat is not None else os.getenv("EMBEDDED_BEAT", "True") == "True"
+        self.beat_schedule = os.getenv("EMBEDDED_BEAT_SCHEDULE", DEFAULT_BEAT_SCHEDULE)
+        self.start_timeout = float(os.getenv("EMBEDDED_START_TIMEOUT", DEFAULT_START_TIMEOUT))
+        self.workers = []
+        self._threads: List[threading.Thread] = []
+        self._beat_service = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return bool(self.workers)
+
+    def _worker_class(self):
+        class EmbeddedWorker(self.app.WorkController):
+            def __init__(self, *args, **kwargs):
+                self.consumer_ready = threading.Event()
+                super().__init__(*args, **kwargs)
+
+            def on_consumer_ready(self, consumer):
+                self.consumer_ready.set()
+
+        return EmbeddedWorker
+
+    def _start_worker(self, worker_class, queues: List[str], concurrency: int):
+        name = "+".join(queues)
+        worker = worker_class(
+            app=self.app,
+            hostname=f"embedded-{name}@{os.uname().nodename}",
+            queues=queues,
+            pool_cls="threads",
+            concurrency=concurrency,
+            without_heartbeat=True,
+            without_mingle=True,
+            without_gossip=True,
+        )
+        thread = threading.Thread(target=worker.start, name=f"embedded-worker-{name}", daemon=True)
+        thread.start()
+        self.workers.append(worker)
+        self._threads.append(thread)
+        # The queue selection is app-wide until a consumer has subscribed, so
+        # workers start one at a time
+        if not worker.consumer_ready.wait(self.start_timeout):
+            raise RuntimeError(f"Embedded worker for {name} did not start within {self.start_timeout}s")
+        logger.info(f"Embedded worker consuming {name} with {concurrency} threads")
+
+    def start(self) -> None:
+        """Start one worker per queue group, then the beat scheduler"""
+        with self._lock:
+            if self.running:
+                return
+            # Pool threads resolve current_app to the default app
+            self.app.set_default()
+            worker_class = self._worker_class()
+            try:
+                for queues, concurrency in self.specs:
+                    self._start_worker(worker_class, queues, concurrency)
+            except Exception:
+                self._stop_workers()
+                raise
+            # Starting a worker marks the whole process as one, which makes
+            # result.get() raise; code outside tasks here may still wait on results
+            _set_task_join_will_block(False)
+
+            if self.beat:
+                from celery.beat import EmbeddedService
+
+                directory = os.path.dirname(self.beat_schedule)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._beat_service = EmbeddedService(
+                    self.app, thread=True, schedule_filename=self.beat_schedule
+                )
+                self._beat_service.start()
+
+    def _stop_workers(self) -> None:
+        for worker in self.workers:
+            try:
+                worker.stop(in_sighandler=False)
+            except Exception as e:
+                logger.error(f"Error stopping embedded worker {worker.hostname}: {str(e)}")
+        for thread in self._threads:
+            thread.join(self.start_timeout)
+        self.workers = []
+        self._threads = []
+
+    def stop(self) -> None:
+        """Stop the scheduler, then let each worker finish its running tasks"""
+        with self._lock:
+            if self._beat_service is not None:
+                self._beat_service.stop()
+                self._beat_service = None
+            self._stop_workers()
+
+
+_executor: Optional[EmbeddedExecutor] = None
+
+
+def start() -> bool:
+    """
+    Start the embedded executor when it is selected
+
+    Returns:
+        True if tasks run in this process
+    """
+    global _executor
+    if not is_enabled():
+        return False
+    from workers.celery_app import app
+
+    if _executor is None:
+        _executor = EmbeddedExecutor(app)
+    _executor.start()
+    return True
+
+
+def stop() -> None:
+    if _executor is not None:
+        _executor.stop()
+
+
+@contextmanager
+def running(workers: Optional[List[Tuple[List[str], int]]] = None, beat: bool = False):
+    """
+    Run embedded workers for the duration of a block, e.g. in a benchmark
+
+    Requires TASK_EXECUTOR=embedded before workers.celery_app is imported.
+    Results are polled, so pass a short interval when timing them:
+        result.get(timeout=10, interval=0.005)
+    """
+    if not is_enabled():
+        raise RuntimeError("Set TASK_EXECUTOR=embedded before importing workers.celery_app")
+    from workers.celery_app import app
+
+    executor = EmbeddedExecutor(app, workers=workers, beat=beat)
+    executor.start()
+    try:
+        yield executor
+    finally:
+        executor.stop()
@@ -0,0 +1,244 @@
+"""
+Idempotency for Celery tasks
+The idempotent decorator gives a task an entity lock key, so only one
+invocation per entity runs at a time, and reuses the result of a recently
+completed identical invocation
+
+    @app.task(name='workers.tasks.resume_processing.parse_resume', bind=True)
+    @idempotent("parse:{candidate_id}")
+    def parse_resume_task(self, candidate_id, resume_url): ...
+
+A duplicate of the running invocation (same arguments) returns immediately; a
+different invocation for the same entity is re-enqueued until the lock frees up.
+
+Arguments alone may not identify the work: a resume re-uploaded to the same
+URL, or a rematch requested because the data changed while the previous one
+ran. A version callable adds a token to the fingerprint (e.g. the stored
+file's etag), so neither the cached result nor a running invocation answers
+for the new version; defer_duplicates re-enqueues same-argument calls behind
+the running one instead of dropping them.
+"""
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from celery import Task, current_task
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Lock lifetime must outlast task_time_limit so a live run never loses its lock
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", 360))
+IDEMPOTENCY_RESULT_TTL = int(os.getenv("IDEMPOTENCY_RESULT_TTL", 300))
+
+# Delete the lock only if we still hold it
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+return 0
+"""
+
+
+class RedisIdempotencyStore:
+    """Locks and results shared by all workers"""
+
+    LOCK_PREFIX = "task_lock:"
+    RESULT_PREFIX = "task_result:"
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise RuntimeError("redis package is required for the Redis idempotency store")
+        self.client = redis.Redis.from_url(url)
+        self._release = self.client.register_script(_RELEASE_SCRIPT)
+
+    def acquire(self, key: str, value: str, ttl_seconds: int) -> bool:
+        return bool(self.client.set(self.LOCK_PREFIX + key, value, nx=True, ex=ttl_seconds))
+
+    def holder(self, key: str) -> Optional[str]:
+        value = self.client.get(self.LOCK_PREFIX + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def release(self, key: str, value: str) -> None:
+        self._release(keys=[self.LOCK_PREFIX + key], args=[value])
+
+    def get_result(self, key: str) -> Optional[str]:
+        value = self.client.get(self.RESULT_PREFIX + key)
+        return value.decode("utf-8") if value is not None else None
+
+    def set_result(self, key: str, value: str, ttl_seconds: int) -> None:
+        self.client.setex(self.RESULT_PREFIX + key, ttl_seconds, value)
+
+
+class LocalIdempotencyStore:
+    """In-process stand-in for tests and single-process workers"""
+
+    def __init__(self):
+        self._locks: Dict[str, Tuple[str, float]] = {}
+        self._results: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, entries: Dict[str, Tuple[str, float]], key: str) -> Optional[str]:
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] < time.time():
+            del entries[key]
+            return None
+        return entry[0]
+
+    def acquire(self, key: str, value: str, ttl_seconds: int) -> bool:
+        with self._lock:
+            if self._live(self._locks, key) is not None:
+                return False
+            self._locks[key] = (value, time.time() + ttl_seconds)
+            return True
+
+    def holder(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._live(self._locks, key)
+
+    def release(self, key: str, value: str) -> None:
+        with self._lock:
+            if self._live(self._locks, key) == value:
+                del self._locks[key]
+
+    def get_result(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._live(self._results, key)
+
+    def set_result(self, key: str, value: str, ttl_seconds: int) -> None:
+        with self._lock:
+            self._results[key] = (value, time.time() + ttl_seconds)
+
+
+def build_idempotency_store():
+    """
+    Build the store configured by environment variables
+
+    IDEMPOTENCY_BACKEND: redis | local (default redis)
+    """
+    backend = os.getenv("IDEMPOTENCY_BACKEND", "redis").lower()
+    if backend == "redis":
+        return RedisIdempotencyStore(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if backend == "local":
+        return LocalIdempotencyStore()
+    raise ValueError(f"Unknown IDEMPOTENCY_BACKEND: {backend}")
+
+
+store = build_idempotency_store()
+
+
+def _fingerprint(arguments: Dict[str, Any], version: Any = None) -> str:
+    payload = json.dumps([arguments, version], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _defer(args: tuple, kwargs: dict, countdown: int) -> None:
+    """
+    Re-enqueue the running task on the queue it was delivered from
+
+    Errors propagate: a call that cannot be deferred must not run without the lock.
+    """
+    task = args[0] if args and isinstance(args[0], Task) else current_task
+    if not task:
+        raise RuntimeError("Idempotent call can only be deferred from inside a task")
+    call_args = args[1:] if args and isinstance(args[0], Task) else args
+    # Bulk messages stay on their bulk queue
+    delivery_info = getattr(task.request, 'delivery_info', None) or {}
+    options = {'queue': delivery_info['routing_key']} if delivery_info.get('routing_key') else {}
+    task.apply_async(args=call_args, kwargs=kwargs, countdown=countdown, **options)
+
+
+def idempotent(key: str, reuse_seconds: int = IDEMPOTENCY_RESULT_TTL,
+               lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS, defer_seconds: int = 10,
+               version: Optional[Callable[[Dict[str, Any]], Any]] = None,
+               defer_duplicates: bool = False) -> Callable:
+    """
+    Make a task function idempotent (apply below @app.task)
+
+    Args:
+        key: Entity key template formatted with the task's arguments, e.g. "parse:{candidate_id}"
+        reuse_seconds: How long a completed invocation's result answers identical calls (0 disables)
+        lock_seconds: Lock lifetime, longer than the task time limit
+        defer_seconds: Countdown before retrying an invocation blocked by a different one
+        version: Called with the task's arguments; its result is part of the
+            fingerprint. If it raises, the call neither reuses a result nor
+            counts as a duplicate
+        defer_duplicates: Re-enqueue a same-fingerprint call behind the running
+            one instead of returning 'duplicate'
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {
+                name: value for name, value in bound.arguments.items() if not isinstance(value, Task)
+            }
+            lock_key = key.format(**arguments)
+            versioned = True
+            token_version = None
+            if version is not None:
+                try:
+                    token_version = version(arguments)
+                except Exception as e:
+                    logger.warning(f"Could not determine version for {lock_key}: {str(e)}")
+                    versioned = False
+            # Without a version the call is unique: no reuse, never a duplicate
+            fingerprint = _fingerprint(arguments, token_version) if versioned else uuid.uuid4().hex
+            result_key = f"{lock_key}:{fingerprint}"
+            token = f"{uuid.uuid4().hex}:{fingerprint}"
+
+            try:
+                if reuse_seconds and versioned:
+                    cached = store.get_result(result_key)
+                    if cached is not None:
+                        logger.info(f"Reusing recent result for {lock_key}")
+                        return json.loads(cached)
+
+                acquired = store.acquire(lock_key, token, lock_seconds)
+                holder = None if acquired else store.holder(lock_key) or ""
+            except Exception as e:
+                # Fail open: a store outage must not stop processing
+                logger.warning(f"Idempotency store unavailable for {lock_key}: {str(e)}")
+                return func(*args, **kwargs)
+
+            if not acquired:
+                if holder.endswith(f":{fingerprint}") and not defer_duplicates:
+                    logger.info(f"Skipping duplicate of running task {lock_key}")
+                    return {'status': 'duplicate', 'key': lock_key}
+                # Another invocation holds the entity; run this one after it
+                _defer(args, kwargs, defer_seconds)
+                logger.info(f"Deferred task {lock_key} behind a running invocation")
+                return {'status': 'deferred', 'key': lock_key}
+
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                try:
+                    store.release(lock_key, token)
+                except Exception as e:
+                    logger.warning(f"Could not release task lock {lock_key}: {str(e)}")
+
+            if reuse_seconds and versioned and isinstance(result, dict) and result.get('status') != 'error':
+                try:
+                    store.set_result(result_key, json.dumps(result, default=str), reuse_seconds)
+                except Exception as e:
+                    logger.warning(f"Could not store result for {lock_key}: {str(e)}")
+            return result
+
+        return wrapper
+
+    return decorator
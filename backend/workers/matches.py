@@ -0,0 +1,271 @@
+"""
+JobMatch persistence and matching triggers
+All matches of a run are written with one INSERT ... ON CONFLICT DO UPDATE on
+(job_id, candidate_id). A pair can be in a job's match set, a candidate's, or
+both; ranked_for_job and ranked_for_candidate record which. A run only drops
+pairs from its own side's set, and a row is deleted once neither side holds
+it, so job runs and candidate runs never erase each other's matches. Writes
+that affect matching call trigger_matching, which coalesces bursts of edits
+to the same entity into one matching run
+
+Compaction helpers delete at most batch_size rows per statement, each batch
+selected through one of the job_matches indexes, so the table can be trimmed
+while matching keeps writing
+"""
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from shared import models
+from shared.debounce import build_debouncer
+from workers.celery_app import app
+
+logger = logging.getLogger(__name__)
+
+# Pending matching runs per entity (MATCH_DEBOUNCE_* settings)
+match_debouncer = build_debouncer("MATCH")
+
+# Match set (fixed side of a run) -> (fixed id column, ranked id column, flag column)
+SIDES = {
+    "job": ("job_id", "candidate_id", "ranked_for_job"),
+    "candidate": ("candidate_id", "job_id", "ranked_for_candidate"),
+}
+
+_UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _as_uuid(value: Any) -> uuid.UUID:
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+
+def match_rows(matches: List[Dict[str, Any]], job_id: Optional[str] = None,
+               candidate_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Convert matcher output into job_matches rows
+
+    Matcher results carry either candidate_id (rank_candidates) or job_id
+    (rank_jobs); the fixed side of the run fills in the other.
+    """
+    now = datetime.utcnow()
+    rows = {}
+    for match in matches:
+        row = {
+            "job_id": _as_uuid(job_id or match["job_id"]),
+            "candidate_id": _as_uuid(candidate_id or match["candidate_id"]),
+            "match_score": match["match_score"],
+            "match_reasons": match["match_reasons"],
+            "ranked_for_job": job_id is not None,
+            "ranked_for_candidate": candidate_id is not None,
+        }
+        # A statement may only touch each conflict target once
+        rows[(row["job_id"], row["candidate_id"])] = {**row, "id": uuid.uuid4(), "created_at": now, "updated_at": now}
+    return list(rows.values())
+
+
+def upsert_matches(db, rows: List[Dict[str, Any]], side: str) -> None:
+    """
+    Insert or update match rows in a single statement (no commit)
+
+    An existing pair keeps the other side's flag; only side's flag is set.
+    """
+    if not rows:
+        return
+    table = models.JobMatch.__table__
+    flag = SIDES[side][2]
+    insert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+
+    if insert is None:
+        # Dialects without ON CONFLICT: update the pairs that exist, insert the rest
+        for row in rows:
+            updated = db.execute(update(table).where(
+                table.c.job_id == row["job_id"], table.c.candidate_id == row["candidate_id"]
+            ).values(
+                match_score=row["match_score"], match_reasons=row["match_reasons"],
+                updated_at=row["updated_at"], **{flag: True}
+            )).rowcount
+            if not updated:
+                db.execute(table.insert(), [row])
+        return
+
+    statement = insert(table).values(rows)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.job_id, table.c.candidate_id],
+        set_={
+            "match_score": statement.excluded.match_score,
+            "match_reasons": statement.excluded.match_reasons,
+            "updated_at": statement.excluded.updated_at,
+            flag: True,
+        }
+    ))
+
+
+def _replace_matches(db, side: str, entity_id: str, rows: List[Dict[str, Any]]) -> int:
+    fixed, ranked, flag = SIDES[side]
+    other_flag = SIDES["candidate" if side == "job" else "job"][2]
+    table = models.JobMatch.__table__
+    dropped = [table.c[fixed] == _as_uuid(entity_id), table.c[flag]]
+    if rows:
+        dropped.append(table.c[ranked].notin_([row[ranked] for row in rows]))
+    # Pairs only this side held go; pairs the other side still ranks are released
+    deleted = db.execute(delete(table).where(*dropped, ~table.c[other_flag])).rowcount
+    released = db.execute(update(table).where(*dropped).values({flag: False})).rowcount
+    upsert_matches(db, rows, side)
+    return deleted + released
+
+
+def replace_job_matches(db, job_id: str, rows: List[Dict[str, Any]]) -> int:
+    """
+    Make rows the complete match set for a job (no commit)
+
+    Candidates' own match sets are left alone: a pair dropped here is only
+    deleted if no candidate run ranks it.
+
+    Returns:
+        Number of matches dropped from the job's set
+    """
+    return _replace_matches(db, "job", job_id, rows)
+
+
+def replace_candidate_matches(db, candidate_id: str, rows: List[Dict[str, Any]]) -> int:
+    """
+    Make rows the complete match set for a candidate (no commit)
+
+    Jobs' own match sets are left alone: a pair dropped here is only deleted
+    if no job run ranks it.
+
+    Returns:
+        Number of matches dropped from the candidate's set
+    """
+    return _replace_matches(db, "candidate", candidate_id, rows)
+
+
+def delete_stale_job_matches(db, job_id: Any, before: datetime, batch_size: int) -> int:
+    """
+    Delete one batch of a job's matches last written before a cutoff (no commit)
+
+    Rows without updated_at predate the column and count as stale.
+
+    Returns:
+        Rows deleted
+    """
+    table = models.JobMatch.__table__
+    batch = select(table.c.id).where(
+        table.c.job_id == _as_uuid(job_id),
+        or_(table.c.updated_at < before, table.c.updated_at.is_(None))
+    ).limit(batch_size)
+    return db.execute(delete(table).where(table.c.id.in_(batch))).rowcount
+
+
+def delete_matches_beyond_top(db, job_id: Any, top_n: int, batch_size: int) -> int:
+    """
+    Delete one batch of a job's matches ranked below its top_n (no commit)
+
+    Ranking is the matcher's order: score descending, then candidate id.
+    Only rows held by the job alone are ranked; rows in a candidate's match
+    set stay until a candidate run drops them.
+
+    Returns:
+        Rows deleted
+    """
+    table = models.JobMatch.__table__
+    batch = select(table.c.id).where(
+        table.c.job_id == _as_uuid(job_id), table.c.ranked_for_candidate.is_(False)
+    ).order_by(
+        table.c.match_score.desc(), table.c.candidate_id
+    ).offset(top_n).limit(batch_size)
+    return db.execute(delete(table).where(table.c.id.in_(batch))).rowcount
+
+
+def jobs_over_top(db, top_n: int, after: Optional[str] = None,
+                  limit: int = 100) -> Tuple[List[str], Optional[str]]:
+    """
+    Jobs with more than top_n job-only matches among the next page of jobs after a keyset cursor
+
+    Pages walk the jobs primary key and matches are counted for that page
+    only, so each call stays bounded however large job_matches grows.
+
+    Returns:
+        (ids of the page's jobs over top_n, last job id of the page, or None
+        once every job has been scanned)
+    """
+    jobs = models.Job.__table__
+    table = models.JobMatch.__table__
+    page = select(jobs.c.id)
+    if after:
+        page = page.where(jobs.c.id > _as_uuid(after))
+    page_ids = [str(job_id) for job_id in db.execute(page.order_by(jobs.c.id).limit(limit)).scalars()]
+    if not page_ids:
+        return [], None
+    counts = select(table.c.job_id).where(
+        table.c.job_id.in_([_as_uuid(job_id) for job_id in page_ids]),
+        table.c.ranked_for_candidate.is_(False)
+    ).group_by(table.c.job_id).having(func.count() > top_n)
+    over = {str(job_id) for job_id in db.execute(counts).scalars()}
+    return [job_id for job_id in page_ids if job_id in over], page_ids[-1]
+
+
+def delete_orphan_matches(db, batch_size: int) -> int:
+    """
+    Delete one batch of matches whose job or candidate no longer exists (no commit)
+
+    Returns:
+        Rows deleted
+    """
+    table = models.JobMatch.__table__
+    jobs = models.Job.__table__
+    candidates = models.CandidateProfile.__table__
+    batch = select(table.c.id).select_from(
+        table.outerjoin(jobs, jobs.c.id == table.c.job_id).outerjoin(
+            candidates, candidates.c.id == table.c.candidate_id
+        )
+    ).where(or_(jobs.c.id.is_(None), candidates.c.id.is_(None))).limit(batch_size)
+    return db.execute(delete(table).where(table.c.id.in_(batch))).rowcount
+
+
+def debounce_key(kind: str, entity_id: str) -> str:
+    return f"match:{kind}:{entity_id}"
+
+
+def trigger_matching(kind: str, entity_id: Any) -> bool:
+    """
+    Request a matching run for a job or candidate after a write
+
+    The first trigger schedules workers.tasks.matching.debounced_match after the
+    debounce window; triggers arriving before it runs only push the deadline out.
+    If the debouncer is unreachable the run is scheduled immediately.
+
+    Args:
+        kind: 'job' or 'candidate'
+        entity_id: Job or candidate profile id
+
+    Returns:
+        True if a run was scheduled
+    """
+    entity_id = str(entity_id)
+    key = debounce_key(kind, entity_id)
+    try:
+        if not match_debouncer.touch(key):
+            return False
+        countdown = match_debouncer.window_seconds
+    except Exception as e:
+        logger.warning(f"Match debouncer unavailable, scheduling {kind} {entity_id} now: {str(e)}")
+        countdown = 0
+
+    try:
+        app.send_task('workers.tasks.matching.debounced_match', args=[kind, entity_id], countdown=countdown)
+    except Exception as e:
+        # The write itself succeeded; let the next trigger schedule the run
+        logger.error(f"Could not schedule matching for {kind} {entity_id}: {str(e)}")
+        try:
+            match_debouncer.release(key)
+        except Exception:
+            pass
+        return False
+    return True
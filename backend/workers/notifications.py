@@ -0,0 +1,54 @@
+"""
+Notification event buffer
+Producers call notify() or publish_notifications(); events are appended to a
+shared buffer (shared/event_buffer.py) and a debounced flush task writes them
+in bulk. Events are never one Celery message, or one DB transaction, each.
+
+Event fields:
+    user_id, type, title, content, link
+    digest_key: Optional; events with the same user and digest_key collapse into
+                one unread notification whose digest_count grows
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+from shared.debounce import build_debouncer
+from shared.event_buffer import build_event_buffer, publish_events
+from workers.celery_app import app
+
+NOTIFICATION_KEY = "notifications:flush"
+
+# Events written per flush; a fuller buffer flushes immediately
+NOTIFICATION_FLUSH_SIZE = int(os.getenv("NOTIFICATION_FLUSH_SIZE", 5000))
+
+notification_buffer = build_event_buffer("NOTIFICATION", "notifications:buffer")
+notification_debouncer = build_debouncer("NOTIFICATION", window_seconds=1, max_delay_seconds=5)
+
+
+def _schedule_flush(countdown: float, force: bool) -> None:
+    app.send_task('workers.tasks.notifications.flush_notifications',
+                  kwargs={'force': force}, countdown=countdown)
+
+
+def publish_notifications(events: List[Dict[str, Any]]) -> bool:
+    """
+    Buffer notification events and make sure a flush is coming
+
+    Returns:
+        True if the events were buffered
+    """
+    return publish_events(notification_buffer, notification_debouncer, NOTIFICATION_KEY,
+                          NOTIFICATION_FLUSH_SIZE, events, _schedule_flush)
+
+
+def notify(user_id: Any, type: str, title: str, content: Optional[str] = None,
+           link: Optional[str] = None, digest_key: Optional[str] = None) -> bool:
+    """Buffer a single notification event"""
+    return publish_notifications([{
+        'user_id': str(user_id),
+        'type': type,
+        'title': title,
+        'content': content,
+        'link': link,
+        'digest_key': digest_key
+    }])
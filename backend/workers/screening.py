@@ -0,0 +1,46 @@
+"""
+Application screening triggers
+New applications are screened in micro-batches: every application write calls
+trigger_screening, the first trigger schedules a flush after
+SCREENING_DEBOUNCE_SECONDS and later ones join that flush (never delayed past
+SCREENING_DEBOUNCE_MAX_SECONDS). Pending work is simply the applications whose
+screening_score is still NULL (and that have not failed SCREENING_MAX_ATTEMPTS
+times), so nothing is lost if a trigger is dropped.
+"""
+import logging
+
+from shared.debounce import build_debouncer
+from workers.celery_app import app
+
+logger = logging.getLogger(__name__)
+
+SCREENING_KEY = "screening:pending"
+
+screening_debouncer = build_debouncer("SCREENING", window_seconds=2, max_delay_seconds=5)
+
+
+def trigger_screening() -> bool:
+    """
+    Request a screening flush for newly submitted applications
+
+    Returns:
+        True if a flush was scheduled
+    """
+    try:
+        if not screening_debouncer.touch(SCREENING_KEY):
+            return False
+        countdown = screening_debouncer.window_seconds
+    except Exception as e:
+        logger.warning(f"Screening debouncer unavailable, flushing now: {str(e)}")
+        countdown = 0
+
+    try:
+        app.send_task('workers.tasks.screening.screen_pending_applications', countdown=countdown)
+    except Exception as e:
+        logger.error(f"Could not schedule application screening: {str(e)}")
+        try:
+            screening_debouncer.release(SCREENING_KEY)
+        except Exception:
+            pass
+        return False
+    return True
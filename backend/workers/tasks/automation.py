@@ -0,0 +1,150 @@
+"""
+Automation Workflow Tasks
+Evaluates buffered automation events in batches (see workers/automation.py)
+"""
+from sqlalchemy import update
+from workers.celery_app import app
+from workers.automation import (
+    AUTOMATION_BATCH_SIZE, AUTOMATION_KEY, automation_buffer, automation_debouncer,
+    dispatch_actions, dispatch_failed_actions, workflow_index
+)
+from shared.database import SessionLocal
+from shared import models
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Retries for actions whose dispatch failed, before they are dead-lettered
+AUTOMATION_ACTION_RETRIES = int(os.getenv("AUTOMATION_ACTION_RETRIES", 3))
+AUTOMATION_ACTION_RETRY_SECONDS = 30
+
+
+def _dead_letter_actions(failed: list) -> None:
+    try:
+        automation_buffer.dead_letter(failed)
+        logger.error(f"Dead-lettered {len(failed)} workflow actions")
+    except Exception as e:
+        logger.error(f"Could not dead-letter {len(failed)} workflow actions, dropping them: {str(e)}")
+
+
+def _retry_actions_later(failed: list) -> None:
+    try:
+        retry_actions_task.apply_async(args=[failed], countdown=AUTOMATION_ACTION_RETRY_SECONDS)
+    except Exception as e:
+        logger.error(f"Could not schedule a retry of {len(failed)} workflow actions: {str(e)}")
+        _dead_letter_actions(failed)
+
+
+@app.task(name='workers.tasks.automation.process_events', bind=True, ignore_result=True)
+def process_automation_events_task(self, force: bool = False, batch_size: int = AUTOMATION_BATCH_SIZE) -> dict:
+    """
+    Evaluate one batch of buffered automation events
+    
+    Args:
+        force: Evaluate now even if the debounce window is still open
+        batch_size: Events popped per batch
+    
+    Returns:
+        Dictionary with evaluation status
+    """
+    if not force:
+        try:
+            remaining = automation_debouncer.claim(AUTOMATION_KEY)
+        except Exception as e:
+            logger.warning(f"Automation debouncer unavailable, evaluating now: {str(e)}")
+            remaining = 0
+        if remaining > 0:
+            self.apply_async(kwargs={'batch_size': batch_size}, countdown=remaining)
+            return {'status': 'deferred', 'countdown': remaining}
+    
+    events = automation_buffer.pop(batch_size)
+    if not events:
+        return {'status': 'success', 'events': 0}
+    
+    db = SessionLocal()
+    try:
+        workflow_index.refresh(db)
+    except Exception as e:
+        logger.error(f"Error loading workflows, returning {len(events)} events to the buffer: {str(e)}")
+        automation_buffer.push(events)
+        raise self.retry(exc=e, countdown=30, max_retries=None)
+    finally:
+        db.close()
+    
+    matched = workflow_index.evaluate(events)
+    dispatched, failed = dispatch_actions(matched) if matched else ({}, [])
+    if failed:
+        _retry_actions_later(failed)
+    
+    # Keep draining while the buffer is backed up
+    if len(events) == batch_size:
+        self.apply_async(kwargs={'force': True, 'batch_size': batch_size})
+    
+    logger.info(f"Evaluated {len(events)} automation events: {len(matched)} workflow matches")
+    return {
+        'status': 'success',
+        'events': len(events),
+        'matched': len(matched),
+        'dispatched': dispatched,
+        'failed': len(failed)
+    }
+
+
+@app.task(name='workers.tasks.automation.retry_actions', bind=True, ignore_result=True)
+def retry_actions_task(self, failed: list) -> dict:
+    """
+    Dispatch workflow actions that failed in an earlier batch
+    
+    Actions still failing after AUTOMATION_ACTION_RETRIES attempts are
+    dead-lettered instead of retried again.
+    
+    Args:
+        failed: Failed actions as returned by dispatch_actions
+    
+    Returns:
+        Dictionary with dispatch status
+    """
+    dispatched, still_failed = dispatch_failed_actions(failed)
+    if still_failed:
+        if self.request.retries >= AUTOMATION_ACTION_RETRIES:
+            _dead_letter_actions(still_failed)
+        else:
+            raise self.retry(args=[still_failed], countdown=AUTOMATION_ACTION_RETRY_SECONDS,
+                             max_retries=AUTOMATION_ACTION_RETRIES)
+    
+    return {'status': 'success', 'dispatched': dispatched, 'failed': len(still_failed)}
+
+
+@app.task(name='workers.tasks.automation.update_application_status', ignore_result=True)
+def update_application_status_task(updates: list) -> dict:
+    """
+    Set application statuses chosen by workflows, in one bulk UPDATE
+    
+    Args:
+        updates: [{'id': application UUID, 'status': ApplicationStatus value}]
+    
+    Returns:
+        Dictionary with update status
+    """
+    db = SessionLocal()
+    try:
+        rows = [
+            {'id': uuid.UUID(str(item['id'])), 'status': models.ApplicationStatus(item['status'])}
+            for item in updates
+        ]
+        db.execute(update(models.Application), rows)
+        db.commit()
+        
+        return {'status': 'success', 'updated': len(rows)}
+    
+    except Exception as e:
+        logger.error(f"Error updating {len(updates)} application statuses: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'error': str(e)
+        }
+    finally:
+        db.close()
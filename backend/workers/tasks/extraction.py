@@ -0,0 +1,103 @@
+"""
+Document Extraction Tasks
+CPU-bound PDF/DOCX decoding on its own queue, decoupled from NLP workers
+
+Extraction workers never load a spaCy model, so the two tiers scale independently:
+    celery -A workers.celery_app worker -Q extraction --concurrency=8
+    celery -A workers.celery_app worker -Q resume --concurrency=2
+"""
+from celery import Task
+from workers.blobs import maybe_blob
+from workers.celery_app import app
+from workers.idempotency import idempotent
+from workers.tasks.resume_processing import (
+    CURRENT_PARSER_VERSION, PARSE_MODE, parse_cache, parse_resume_text_task, resume_version,
+    storage, store_parsed_resume
+)
+from ml_models.resume_parser.cache import content_hash
+from ml_models.resume_parser.extraction import ExtractionError, ExtractionLimits, extract_text
+from shared.database import SessionLocal
+from shared.storage import ResumeTooLargeError, StorageError, read_resume
+from shared import models
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Page/character/time budgets (from environment)
+limits = ExtractionLimits()
+
+
+@app.task(name='workers.tasks.extraction.extract_resume', bind=True, ignore_result=True,
+          max_retries=3, default_retry_delay=30)
+@idempotent("extract:{candidate_id}", version=resume_version)
+def extract_resume_task(self: Task, candidate_id: str, resume_url: str) -> dict:
+    """
+    Fetch and decode a resume, then hand plain text to an NLP worker
+    
+    Unchanged files are skipped and cached parse results are applied directly,
+    so only new documents reach the resume queue.
+    
+    Args:
+        candidate_id: UUID of candidate
+        resume_url: s3://bucket/key, file:// URL or path relative to the storage root
+    
+    Returns:
+        Dictionary with extraction status
+    """
+    db = SessionLocal()
+    try:
+        data = read_resume(storage, resume_url)
+        digest = content_hash(data)
+        
+        current = db.query(
+            models.CandidateProfile.resume_content_hash,
+            models.CandidateProfile.parser_version
+        ).filter(models.CandidateProfile.id == candidate_id).first()
+        if current is not None and tuple(current) == (digest, CURRENT_PARSER_VERSION):
+            return {'status': 'unchanged', 'candidate_id': candidate_id, 'content_hash': digest}
+        
+        cached = parse_cache.get(digest, PARSE_MODE) if parse_cache is not None else None
+        if cached is not None:
+            return store_parsed_resume(db, candidate_id, resume_url, cached, digest)
+        
+        started = time.perf_counter()
+        extracted = extract_text(data, limits=limits)
+        logger.info(
+            f"Extracted {len(extracted.text)} chars ({extracted.file_type}, {extracted.pages} pages) "
+            f"for candidate {candidate_id} in {time.perf_counter() - started:.3f}s"
+            + (f", truncated by {extracted.truncation_reason} budget" if extracted.truncated else "")
+        )
+        
+        parse_resume_text_task.apply_async(
+            args=[candidate_id, resume_url, maybe_blob(extracted.text), digest],
+            queue='resume'
+        )
+        
+        return {
+            'status': 'extracted',
+            'candidate_id': candidate_id,
+            'content_hash': digest,
+            'characters': len(extracted.text)
+        }
+    
+    except (ResumeTooLargeError, ExtractionError) as e:
+        logger.warning(f"Rejected resume for candidate {candidate_id}: {str(e)}")
+        return {
+            'status': 'error',
+            'candidate_id': candidate_id,
+            'error': str(e)
+        }
+    except StorageError as e:
+        logger.warning(f"Storage error for candidate {candidate_id}, retrying: {str(e)}")
+        raise self.retry(exc=e)
+    except Exception as e:
+        logger.error(f"Error extracting resume for candidate {candidate_id}: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'candidate_id': candidate_id,
+            'error': str(e)
+        }
+    finally:
+        db.close()
@@ -1,100 +1,246 @@
 """
 Job-Candidate Matching Tasks
 Automated matching and ranking
+
+Matching covers the whole population: the coordinator tasks split candidates
+(or active jobs) into keyset id ranges, score each range in a shard task on the
+matching queue and merge the shard top-k lists in a chord callback, which
+writes the final match set. Populations that fit in one shard are scored inline.
+
+Writes from the gateway and the resume pipeline go through
+workers.matches.trigger_matching and arrive here as debounced_match.
+
+nightly_rematch (scheduled by Celery beat) refreshes every active job's match
+set in keyset-ordered, checkpointed batches on the matching.bulk queue, and
+compact_job_matches trims job_matches to what is still worth keeping.
 """
-from celery import Task
+from celery import Task, chord
+from sqlalchemy import or_
+from workers.backpressure import bulk_queue, keep_bulk
+from workers.blobs import maybe_blob, resolve
 from workers.celery_app import app
+from workers.checkpoints import advance_checkpoint, complete_checkpoint, is_stalled, load_checkpoint
+from workers.idempotency import idempotent
+from workers.matches import (
+    debounce_key, delete_matches_beyond_top, delete_orphan_matches, delete_stale_job_matches, jobs_over_top,
+    match_debouncer, match_rows, replace_candidate_matches, replace_job_matches
+)
 from ml_models.matching.matcher import JobCandidateMatcher, CandidateProfile, JobPosting
 from shared.database import SessionLocal
 from shared import models
+from datetime import datetime, timedelta
 import logging
+import os
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
 # Initialize matcher
 matcher = JobCandidateMatcher()
 
+# Rows scored per shard task
+MATCH_SHARD_SIZE = int(os.getenv("MATCH_SHARD_SIZE", 2000))
+
+# Nightly full rematch: jobs per batch (adapted toward REMATCH_BATCH_SECONDS),
+# JobMatch rows written per second, and how long a run may sit idle before the
+# watchdog continues it
+REMATCH_BATCH_SIZE = int(os.getenv("REMATCH_BATCH_SIZE", 20))
+REMATCH_BATCH_SECONDS = float(os.getenv("REMATCH_BATCH_SECONDS", 60))
+REMATCH_WRITE_BUDGET = float(os.getenv("REMATCH_WRITE_BUDGET", 500))
+REMATCH_STALL_SECONDS = int(os.getenv("REMATCH_STALL_SECONDS", 1800))
+REMATCH_TOP_K = 100
+REMATCH_CHECKPOINT_PREFIX = "nightly_rematch:"
+
+# JobMatch compaction: matches of inactive jobs are kept this long after their
+# last write, each job keeps at most its top N, and deletes run in batches
+MATCH_RETENTION_DAYS = int(os.getenv("MATCH_RETENTION_DAYS", 30))
+MATCH_KEEP_TOP_N = int(os.getenv("MATCH_KEEP_TOP_N", 200))
+COMPACTION_BATCH_SIZE = int(os.getenv("COMPACTION_BATCH_SIZE", 5000))
+COMPACTION_RUN_SECONDS = float(os.getenv("COMPACTION_RUN_SECONDS", 30))
+COMPACTION_PHASES = ("inactive_jobs", "beyond_top_n", "orphans")
+
 
-@app.task(name='workers.tasks.matching.match_candidates_for_job', bind=True)
-def match_candidates_for_job_task(self: Task, job_id: str, top_k: int = 100) -> dict:
+def to_candidate_profile(candidate: models.CandidateProfile) -> CandidateProfile:
+    """Convert a candidate row to matching model format"""
+    return CandidateProfile(
+        id=str(candidate.id),
+        skills=candidate.skills or [],
+        experience_years=candidate.experience_years or 0,
+        location=candidate.location or '',
+        salary_expectation=candidate.preferences.get('salary_min', 0) if candidate.preferences else 0,
+        preferences=candidate.preferences or {}
+    )
+
+
+def to_job_posting(job: models.Job) -> JobPosting:
+    """Convert a job row to matching model format"""
+    return JobPosting(
+        id=str(job.id),
+        required_skills=job.requirements or [],
+        nice_to_have_skills=job.nice_to_have or [],
+        experience_required=0,  # Could be extracted from description
+        location=job.location or '',
+        salary_max=job.salary_max or 0,
+        job_type=job.job_type or 'full-time'
+    )
+
+
+def _shard_bounds(query, column, shard_size: int) -> list:
     """
-    Find and rank top candidates for a job posting
+    Split the rows of query into keyset ranges of about shard_size rows
+    
+    Returns:
+        List of (lower, upper) id strings; a shard covers lower < id <= upper,
+        with None meaning unbounded
+    """
+    bounds = []
+    lower = None
+    while True:
+        page = query.filter(column > uuid.UUID(lower)) if lower else query
+        upper = page.with_entities(column).order_by(column).offset(shard_size - 1).limit(1).scalar()
+        if upper is None:
+            bounds.append((lower, None))
+            return bounds
+        bounds.append((lower, str(upper)))
+        lower = str(upper)
+
+
+def _in_shard(query, column, lower, upper):
+    if lower:
+        query = query.filter(column > uuid.UUID(lower))
+    if upper:
+        query = query.filter(column <= uuid.UUID(upper))
+    return query
+
+
+def _merge_top(shard_matches: list, id_field: str, top_k: int) -> list:
+    """Merge shard top-k lists into the global top-k (same ordering as the matcher)"""
+    merged = [match for shard in shard_matches for match in resolve(shard)]
+    merged.sort(key=lambda match: (-match['match_score'], match[id_field]))
+    return merged[:top_k]
+
+
+def _active_jobs(db):
+    return db.query(models.Job).filter(models.Job.status == models.JobStatus.ACTIVE)
+
+
+def _store_job_matches(job_id: str, matches: list) -> dict:
+    db = SessionLocal()
+    try:
+        stale = replace_job_matches(db, job_id, match_rows(matches, job_id=job_id))
+        db.commit()
+        logger.info(f"Stored {len(matches)} matches for job {job_id} ({stale} stale removed)")
+        
+        return {
+            'status': 'success',
+            'job_id': job_id,
+            'matches_count': len(matches),
+            'stale_removed': stale
+        }
+    
+    except Exception as e:
+        logger.error(f"Error storing matches for job {job_id}: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'job_id': job_id,
+            'error': str(e)
+        }
+    finally:
+        db.close()
+
+
+def _store_candidate_matches(candidate_id: str, matches: list) -> dict:
+    db = SessionLocal()
+    try:
+        stale = replace_candidate_matches(db, candidate_id, match_rows(matches, candidate_id=candidate_id))
+        db.commit()
+        logger.info(f"Stored {len(matches)} matches for candidate {candidate_id} ({stale} stale removed)")
+        
+        return {
+            'status': 'success',
+            'candidate_id': candidate_id,
+            'matches_count': len(matches),
+            'stale_removed': stale
+        }
+    
+    except Exception as e:
+        logger.error(f"Error storing matches for candidate {candidate_id}: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'candidate_id': candidate_id,
+            'error': str(e)
+        }
+    finally:
+        db.close()
+
+
+def score_candidates_for_job(db, job_id: str, lower, upper, top_k: int) -> list:
+    """Top-k candidate matches for a job within one id range"""
+    job = db.query(models.Job).filter(models.Job.id == job_id).first()
+    if not job:
+        return []
+    profile = models.CandidateProfile
+    candidates = _in_shard(db.query(profile), profile.id, lower, upper).all()
+    return matcher.rank_candidates([to_candidate_profile(c) for c in candidates], to_job_posting(job), top_k=top_k)
+
+
+def score_jobs_for_candidate(db, candidate_id: str, lower, upper, top_k: int) -> list:
+    """Top-k job matches for a candidate within one id range of active jobs"""
+    candidate = db.query(models.CandidateProfile).filter(
+        models.CandidateProfile.id == candidate_id
+    ).first()
+    if not candidate:
+        return []
+    jobs = _in_shard(_active_jobs(db), models.Job.id, lower, upper).all()
+    return matcher.rank_jobs(to_candidate_profile(candidate), [to_job_posting(j) for j in jobs], top_k=top_k)
+
+
+@app.task(name='workers.tasks.matching.match_candidates_for_job', bind=True, ignore_result=True)
+@idempotent("match:job:{job_id}", reuse_seconds=0, defer_duplicates=True)
+def match_candidates_for_job_task(self: Task, job_id: str, top_k: int = 100,
+                                  shard_size: int = MATCH_SHARD_SIZE) -> dict:
+    """
+    Find and rank top candidates for a job posting across all candidates
     
     Args:
         job_id: UUID of job posting
         top_k: Number of top candidates to return
+        shard_size: Candidates scored per shard task
     
     Returns:
-        Dictionary with matched candidates
+        Dictionary with matched candidates, or the dispatched chord for large populations
     """
     db = SessionLocal()
     try:
         logger.info(f"Matching candidates for job {job_id}")
         
         # Fetch job
-        job = db.query(models.Job).filter(models.Job.id == job_id).first()
-        if not job:
+        if not db.query(models.Job.id).filter(models.Job.id == job_id).first():
             return {'status': 'error', 'message': 'Job not found'}
         
-        # Convert to matching model format
-        job_posting = JobPosting(
-            id=str(job.id),
-            required_skills=job.requirements or [],
-            nice_to_have_skills=job.nice_to_have or [],
-            experience_required=0,  # Could be extracted from description
-            location=job.location or '',
-            salary_max=job.salary_max or 0,
-            job_type=job.job_type or 'full-time'
-        )
-        
-        # Fetch all active candidates
-        candidates = db.query(models.CandidateProfile).limit(1000).all()
-        
-        candidate_profiles = []
-        for candidate in candidates:
-            candidate_profiles.append(CandidateProfile(
-                id=str(candidate.id),
-                skills=candidate.skills or [],
-                experience_years=candidate.experience_years or 0,
-                location=candidate.location or '',
-                salary_expectation=candidate.preferences.get('salary_min', 0) if candidate.preferences else 0,
-                preferences=candidate.preferences or {}
-            ))
-        
-        # Run matching
-        matches = matcher.rank_candidates(candidate_profiles, job_posting, top_k=top_k)
-        
-        # Store matches in database
-        for match_data in matches:
-            existing_match = db.query(models.JobMatch).filter(
-                models.JobMatch.job_id == job_id,
-                models.JobMatch.candidate_id == match_data['candidate_id']
-            ).first()
-            
-            if existing_match:
-                existing_match.match_score = match_data['match_score']
-                existing_match.match_reasons = match_data['match_reasons']
-            else:
-                new_match = models.JobMatch(
-                    job_id=job_id,
-                    candidate_id=match_data['candidate_id'],
-                    match_score=match_data['match_score'],
-                    match_reasons=match_data['match_reasons']
-                )
-                db.add(new_match)
-        
-        db.commit()
-        logger.info(f"Created {len(matches)} matches for job {job_id}")
-        
-        return {
-            'status': 'success',
-            'job_id': job_id,
-            'matches_count': len(matches)
-        }
+        profile = models.CandidateProfile
+        bounds = _shard_bounds(db.query(profile), profile.id, shard_size)
         
+        if len(bounds) == 1:
+            matches = score_candidates_for_job(db, job_id, None, None, top_k)
+        else:
+            merge = chord(
+                keep_bulk(score_candidate_shard_task.s(job_id, lower, upper, top_k))
+                for lower, upper in bounds
+            )(keep_bulk(merge_candidate_shards_task.s(job_id, top_k)))
+            logger.info(f"Dispatched {len(bounds)} candidate shards for job {job_id}")
+            return {
+                'status': 'dispatched',
+                'job_id': job_id,
+                'shards': len(bounds),
+                'merge_task_id': merge.id
+            }
+    
     except Exception as e:
         logger.error(f"Error matching candidates for job {job_id}: {str(e)}")
-        db.rollback()
         return {
             'status': 'error',
             'job_id': job_id,
@@ -102,96 +248,436 @@ def match_candidates_for_job_task(self: Task, job_id: str, top_k: int = 100) ->
         }
     finally:
         db.close()
+    
+    return _store_job_matches(job_id, matches)
 
 
-@app.task(name='workers.tasks.matching.match_jobs_for_candidate')
-def match_jobs_for_candidate_task(candidate_id: str, top_k: int = 50) -> dict:
+@app.task(name='workers.tasks.matching.score_candidate_shard')
+def score_candidate_shard_task(job_id: str, lower: str, upper: str, top_k: int) -> list:
+    """Score one candidate id range for a job; returns that shard's top-k (or a blob reference)"""
+    db = SessionLocal()
+    try:
+        return maybe_blob(score_candidates_for_job(db, job_id, lower, upper, top_k))
+    finally:
+        db.close()
+
+
+@app.task(name='workers.tasks.matching.merge_candidate_shards', ignore_result=True)
+def merge_candidate_shards_task(shard_matches: list, job_id: str, top_k: int) -> dict:
+    """Chord callback: merge shard top-k lists and write the job's match set"""
+    return _store_job_matches(job_id, _merge_top(shard_matches, 'candidate_id', top_k))
+
+
+@app.task(name='workers.tasks.matching.match_jobs_for_candidate', ignore_result=True)
+@idempotent("match:candidate:{candidate_id}", reuse_seconds=0, defer_duplicates=True)
+def match_jobs_for_candidate_task(candidate_id: str, top_k: int = 50,
+                                  shard_size: int = MATCH_SHARD_SIZE) -> dict:
     """
-    Find and rank top jobs for a candidate
+    Find and rank top jobs for a candidate across all active jobs
     
     Args:
         candidate_id: UUID of candidate
         top_k: Number of top jobs to return
+        shard_size: Jobs scored per shard task
     
     Returns:
-        Dictionary with matched jobs
+        Dictionary with matched jobs, or the dispatched chord for large populations
     """
     db = SessionLocal()
     try:
         logger.info(f"Matching jobs for candidate {candidate_id}")
         
         # Fetch candidate
-        candidate = db.query(models.CandidateProfile).filter(
+        if not db.query(models.CandidateProfile.id).filter(
             models.CandidateProfile.id == candidate_id
-        ).first()
-        
-        if not candidate:
+        ).first():
             return {'status': 'error', 'message': 'Candidate not found'}
         
-        # Convert to matching model format
-        candidate_profile = CandidateProfile(
-            id=str(candidate.id),
-            skills=candidate.skills or [],
-            experience_years=candidate.experience_years or 0,
-            location=candidate.location or '',
-            salary_expectation=candidate.preferences.get('salary_min', 0) if candidate.preferences else 0,
-            preferences=candidate.preferences or {}
-        )
-        
-        # Fetch active jobs
-        jobs = db.query(models.Job).filter(
-            models.Job.status == models.JobStatus.ACTIVE
-        ).limit(500).all()
+        bounds = _shard_bounds(_active_jobs(db), models.Job.id, shard_size)
         
-        job_postings = []
+        if len(bounds) == 1:
+            matches = score_jobs_for_candidate(db, candidate_id, None, None, top_k)
+        else:
+            merge = chord(
+                keep_bulk(score_job_shard_task.s(candidate_id, lower, upper, top_k))
+                for lower, upper in bounds
+            )(keep_bulk(merge_job_shards_task.s(candidate_id, top_k)))
+            logger.info(f"Dispatched {len(bounds)} job shards for candidate {candidate_id}")
+            return {
+                'status': 'dispatched',
+                'candidate_id': candidate_id,
+                'shards': len(bounds),
+                'merge_task_id': merge.id
+            }
+    
+    except Exception as e:
+        logger.error(f"Error matching jobs for candidate {candidate_id}: {str(e)}")
+        return {
+            'status': 'error',
+            'candidate_id': candidate_id,
+            'error': str(e)
+        }
+    finally:
+        db.close()
+    
+    return _store_candidate_matches(candidate_id, matches)
+
+
+@app.task(name='workers.tasks.matching.score_job_shard')
+def score_job_shard_task(candidate_id: str, lower: str, upper: str, top_k: int) -> list:
+    """Score one active-job id range for a candidate; returns that shard's top-k (or a blob reference)"""
+    db = SessionLocal()
+    try:
+        return maybe_blob(score_jobs_for_candidate(db, candidate_id, lower, upper, top_k))
+    finally:
+        db.close()
+
+
+@app.task(name='workers.tasks.matching.merge_job_shards', ignore_result=True)
+def merge_job_shards_task(shard_matches: list, candidate_id: str, top_k: int) -> dict:
+    """Chord callback: merge shard top-k lists and write the candidate's match set"""
+    return _store_candidate_matches(candidate_id, _merge_top(shard_matches, 'job_id', top_k))
+
+
+@app.task(name='workers.tasks.matching.debounced_match', bind=True, ignore_result=True)
+def debounced_match_task(self: Task, kind: str, entity_id: str) -> dict:
+    """
+    Run matching for an entity once its debounce deadline has passed
+    
+    Args:
+        kind: 'job' or 'candidate'
+        entity_id: Job or candidate profile id
+    
+    Returns:
+        Matching result, or a deferral when newer triggers moved the deadline
+    """
+    try:
+        remaining = match_debouncer.claim(debounce_key(kind, entity_id))
+    except Exception as e:
+        logger.warning(f"Match debouncer unavailable, matching {kind} {entity_id} now: {str(e)}")
+        remaining = 0
+    
+    if remaining > 0:
+        self.apply_async(args=[kind, entity_id], countdown=remaining)
+        return {'status': 'deferred', 'kind': kind, 'id': entity_id, 'countdown': remaining}
+    
+    if kind == 'job':
+        return match_candidates_for_job_task(entity_id)
+    return match_jobs_for_candidate_task(entity_id)
+
+
+def rematch_job_batch(db, job_ids: list, top_k: int = REMATCH_TOP_K,
+                      shard_size: int = MATCH_SHARD_SIZE) -> dict:
+    """
+    Top-k candidate matches for several jobs in one pass over the candidates
+    
+    Candidates are loaded one keyset shard at a time and scored against every
+    job in the batch, so each candidate row is read once per batch, not per job.
+    
+    Returns:
+        {job_id: matches}
+    """
+    jobs = [
+        to_job_posting(job)
+        for job in db.query(models.Job).filter(models.Job.id.in_([uuid.UUID(job_id) for job_id in job_ids])).all()
+    ]
+    top = {job.id: [] for job in jobs}
+    profile = models.CandidateProfile
+    lower = None
+    while jobs:
+        shard = _in_shard(db.query(profile), profile.id, lower, None).order_by(profile.id).limit(shard_size).all()
+        if not shard:
+            break
+        candidates = [to_candidate_profile(candidate) for candidate in shard]
         for job in jobs:
-            job_postings.append(JobPosting(
-                id=str(job.id),
-                required_skills=job.requirements or [],
-                nice_to_have_skills=job.nice_to_have or [],
-                experience_required=0,
-                location=job.location or '',
-                salary_max=job.salary_max or 0,
-                job_type=job.job_type or 'full-time'
-            ))
-        
-        # Run matching
-        matches = matcher.rank_jobs(candidate_profile, job_postings, top_k=top_k)
-        
-        # Store matches
-        for match_data in matches:
-            existing_match = db.query(models.JobMatch).filter(
-                models.JobMatch.job_id == match_data['job_id'],
-                models.JobMatch.candidate_id == candidate_id
-            ).first()
-            
-            if existing_match:
-                existing_match.match_score = match_data['match_score']
-                existing_match.match_reasons = match_data['match_reasons']
+            shard_top = matcher.rank_candidates(candidates, job, top_k=top_k)
+            top[job.id] = _merge_top([top[job.id], shard_top], 'candidate_id', top_k)
+        lower = str(shard[-1].id)
+    return top
+
+
+def _rematch_progress(state: dict, processed: int, jobs: int, rows: int, elapsed: float) -> dict:
+    """Cumulative progress and throughput for the run's checkpoint state"""
+    rows_written = state.get('rows_written', 0) + rows
+    busy_seconds = state.get('busy_seconds', 0.0) + elapsed
+    total = state.get('total_jobs') or processed
+    jobs_per_second = processed / busy_seconds if busy_seconds else 0.0
+    return {
+        'rows_written': rows_written,
+        'busy_seconds': round(busy_seconds, 3),
+        'percent': round(min(processed / total, 1.0) * 100, 1) if total else 100.0,
+        'jobs_per_second': round(jobs_per_second, 2),
+        'rows_per_second': round(rows_written / busy_seconds, 1) if busy_seconds else 0.0,
+        'last_batch': {'jobs': jobs, 'rows': rows, 'seconds': round(elapsed, 3)},
+        'eta_seconds': round((total - processed) / jobs_per_second) if jobs_per_second and total > processed else 0
+    }
+
+
+def _current_rematch(db):
+    """Most recent unfinished nightly rematch checkpoint"""
+    checkpoint = models.TaskCheckpoint
+    return db.query(checkpoint).filter(
+        checkpoint.name.like(f"{REMATCH_CHECKPOINT_PREFIX}%"),
+        checkpoint.completed_at.is_(None)
+    ).order_by(checkpoint.started_at.desc()).first()
+
+
+@app.task(name='workers.tasks.matching.nightly_rematch', bind=True, ignore_result=True)
+def nightly_rematch_task(self: Task, run: str = None, token: str = None, batch_size: int = REMATCH_BATCH_SIZE,
+                         write_budget: float = REMATCH_WRITE_BUDGET, resume_only: bool = False) -> dict:
+    """
+    Refresh the match sets of all active jobs, one checkpointed batch per run
+    
+    Beat starts a run each night (run=None), keyed by date: an unfinished run
+    from an earlier night is marked abandoned, so a slow run never skips the
+    next one. A watchdog invocation (resume_only=True) continues a run whose
+    chain stopped, e.g. after a worker crash. Each batch writes its jobs' matches in the same transaction as the
+    checkpoint, then re-enqueues itself with a countdown that keeps JobMatch
+    writes under write_budget rows per second. Continuations carry the run's
+    token, so a chain replaced by the watchdog stops at its next step.
+    
+    Args:
+        run: Run name (its start date); None to start a run or find the current one
+        token: Chain token, set on continuations
+        batch_size: Jobs per batch
+        write_budget: Maximum sustained JobMatch rows written per second
+        resume_only: Only continue a stalled run, never start one
+    
+    Returns:
+        Progress summary for this batch
+    """
+    continuation = token is not None
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        
+        if run is None:
+            current = _current_rematch(db)
+            if resume_only:
+                if current is None:
+                    db.commit()
+                    return {'status': 'idle'}
+                if not is_stalled(current, REMATCH_STALL_SECONDS):
+                    db.commit()
+                    return {'status': 'running', 'run': current.name[len(REMATCH_CHECKPOINT_PREFIX):]}
+                run = current.name[len(REMATCH_CHECKPOINT_PREFIX):]
+                batch_size = (current.state or {}).get('batch_size', batch_size)
+                logger.warning(f"Nightly rematch {run} stalled, resuming from its checkpoint")
             else:
-                new_match = models.JobMatch(
-                    job_id=match_data['job_id'],
-                    candidate_id=candidate_id,
-                    match_score=match_data['match_score'],
-                    match_reasons=match_data['match_reasons']
-                )
-                db.add(new_match)
+                run = datetime.utcnow().strftime("%Y-%m-%d")
+                if current is not None and current.name != REMATCH_CHECKPOINT_PREFIX + run:
+                    # Tonight's run supersedes an earlier one even while its chain is
+                    # still going; that chain finds its checkpoint complete and stops
+                    previous = db.query(models.TaskCheckpoint).filter(
+                        models.TaskCheckpoint.name == current.name
+                    ).populate_existing().with_for_update().one()
+                    if previous.completed_at is None:
+                        logger.warning(f"Superseding unfinished rematch {previous.name}")
+                        previous.state = {**(previous.state or {}), 'abandoned': True}
+                        complete_checkpoint(previous)
+                elif current is not None and not is_stalled(current, REMATCH_STALL_SECONDS):
+                    db.commit()
+                    return {'status': 'running', 'run': run}
+        
+        name = REMATCH_CHECKPOINT_PREFIX + run
+        load_checkpoint(db, name)
+        # Overlapping invocations of a run serialize on its checkpoint row
+        checkpoint = db.query(models.TaskCheckpoint).filter(
+            models.TaskCheckpoint.name == name
+        ).populate_existing().with_for_update().one()
+        state = dict(checkpoint.state or {})
+        
+        if checkpoint.completed_at is not None:
+            db.commit()
+            return {'status': 'complete', 'run': run, 'processed': checkpoint.processed}
+        if continuation and state.get('token') != token:
+            db.commit()
+            return {'status': 'superseded', 'run': run}
+        if not continuation:
+            # A new chain for this run; any older chain stops at its next step
+            token = uuid.uuid4().hex
+            state['token'] = token
+        if 'total_jobs' not in state:
+            state['total_jobs'] = _active_jobs(db).count()
         
+        job = models.Job
+        query = _active_jobs(db).with_entities(job.id)
+        if checkpoint.last_key:
+            query = query.filter(job.id > uuid.UUID(checkpoint.last_key))
+        job_ids = [str(row.id) for row in query.order_by(job.id).limit(batch_size).all()]
+        
+        if not job_ids:
+            checkpoint.state = {**state, 'percent': 100.0, 'eta_seconds': 0}
+            complete_checkpoint(checkpoint)
+            db.commit()
+            logger.info(f"Nightly rematch {run} complete: {checkpoint.processed} jobs, "
+                        f"{state.get('rows_written', 0)} rows written")
+            return {'status': 'complete', 'run': run, 'processed': checkpoint.processed}
+        
+        top = rematch_job_batch(db, job_ids)
+        rows = 0
+        for job_id in job_ids:
+            matches = top.get(job_id, [])
+            rows += len(matches) + replace_job_matches(db, job_id, match_rows(matches, job_id=job_id))
+        
+        elapsed = time.monotonic() - started
+        state.update(_rematch_progress(state, (checkpoint.processed or 0) + len(job_ids), len(job_ids), rows, elapsed))
+        # Size the next batch toward REMATCH_BATCH_SECONDS (at most doubling)
+        next_batch = max(1, min(batch_size * 2, int(batch_size * REMATCH_BATCH_SECONDS / max(elapsed, 0.001))))
+        state['batch_size'] = next_batch
+        advance_checkpoint(checkpoint, job_ids[-1], len(job_ids), state)
         db.commit()
-        logger.info(f"Created {len(matches)} matches for candidate {candidate_id}")
         
+        delay = max(rows / write_budget - elapsed, 0)
+        self.apply_async(
+            kwargs={'run': run, 'token': token, 'batch_size': next_batch, 'write_budget': write_budget},
+            countdown=delay,
+            queue=bulk_queue(self.name)
+        )
+        
+        logger.info(
+            f"Nightly rematch {run}: {checkpoint.processed}/{state['total_jobs']} jobs ({state['percent']}%), "
+            f"{state['jobs_per_second']} jobs/s, {state['rows_per_second']} rows/s, "
+            f"ETA {state['eta_seconds']}s, next batch of {next_batch} in {delay:.1f}s"
+        )
         return {
-            'status': 'success',
-            'candidate_id': candidate_id,
-            'matches_count': len(matches)
+            'status': 'in_progress',
+            'run': run,
+            'batch': len(job_ids),
+            'rows_written': rows,
+            'processed': checkpoint.processed,
+            'percent': state['percent']
         }
+    
+    except Exception as e:
+        # The chain stops here; the watchdog resumes from the checkpoint
+        logger.error(f"Error in nightly rematch {run}: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'run': run,
+            'error': str(e)
+        }
+    finally:
+        db.close()
+
+
+def _inactive_jobs_after(db, after, limit: int = 100) -> list:
+    job = models.Job
+    query = db.query(job.id).filter(or_(job.status != models.JobStatus.ACTIVE, job.status.is_(None)))
+    if after:
+        query = query.filter(job.id > uuid.UUID(after))
+    return [str(row.id) for row in query.order_by(job.id).limit(limit).all()]
+
+
+@app.task(name='workers.tasks.matching.compact_job_matches', bind=True, ignore_result=True)
+def compact_job_matches_task(self: Task, run: str = None, batch_size: int = COMPACTION_BATCH_SIZE,
+                             retention_days: int = MATCH_RETENTION_DAYS, keep_top_n: int = MATCH_KEEP_TOP_N) -> dict:
+    """
+    Delete job_matches rows that are no longer worth keeping, in bounded batches
+    
+    Phases, in order:
+        inactive_jobs: matches of non-active jobs not written for retention_days
+        beyond_top_n: each job's matches ranked below its top keep_top_n, unless a
+                      candidate's match set also holds them
+        orphans: matches whose job or candidate no longer exists
+    
+    Every batch deletes at most batch_size rows through an index range and
+    commits together with the checkpoint; a run works for COMPACTION_RUN_SECONDS
+    and then re-enqueues itself on matching.bulk, so compaction never holds long
+    locks or competes with interactive matching for long.
+    
+    Args:
+        run: Run name (its start date); None for today's
+        batch_size: Rows deleted per statement
+        retention_days: Age after which inactive jobs' matches are deleted
+        keep_top_n: Matches kept per job
+    
+    Returns:
+        Rows reclaimed so far, per phase
+    """
+    run = run or datetime.utcnow().strftime("%Y-%m-%d")
+    name = f"job_match_compaction:{run}"
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        checkpoint = load_checkpoint(db, name)
+        state = dict(checkpoint.state or {})
+        deleted = dict(state.get('deleted') or {phase: 0 for phase in COMPACTION_PHASES})
+        if checkpoint.completed_at is not None:
+            db.commit()
+            return {'status': 'complete', 'run': run, 'deleted': deleted}
+        phase = state.get('phase', COMPACTION_PHASES[0])
+        
+        def commit_batch(rows: int, cursor) -> None:
+            deleted[phase] = deleted.get(phase, 0) + rows
+            checkpoint.last_key = cursor
+            checkpoint.processed = (checkpoint.processed or 0) + rows
+            checkpoint.state = {**state, 'phase': phase, 'deleted': dict(deleted)}
+            db.commit()
+        
+        def drain(delete_batch, job_id, cursor) -> bool:
+            """Delete a job's rows batch by batch; False if the time budget ran out first"""
+            while time.monotonic() - started < COMPACTION_RUN_SECONDS:
+                rows = delete_batch(job_id)
+                # The job's cursor only advances once it has nothing left to delete
+                commit_batch(rows, job_id if rows < batch_size else cursor)
+                if rows < batch_size:
+                    return True
+            return False
+        
+        out_of_time = False
+        while not out_of_time and phase != 'done':
+            cursor = checkpoint.last_key
+            if phase == 'orphans':
+                rows = delete_orphan_matches(db, batch_size)
+                commit_batch(rows, None)
+                if rows < batch_size:
+                    phase = 'done'
+            else:
+                if phase == 'inactive_jobs':
+                    job_ids = _inactive_jobs_after(db, cursor)
+                    scanned = job_ids[-1] if job_ids else None
+                    delete_batch = lambda job_id: delete_stale_job_matches(db, job_id, cutoff, batch_size)
+                else:
+                    job_ids, scanned = jobs_over_top(db, keep_top_n, after=cursor)
+                    delete_batch = lambda job_id: delete_matches_beyond_top(db, job_id, keep_top_n, batch_size)
+                
+                if scanned is None:
+                    phase = COMPACTION_PHASES[COMPACTION_PHASES.index(phase) + 1]
+                    commit_batch(0, None)
+                    continue
+                for job_id in job_ids:
+                    if not drain(delete_batch, job_id, cursor):
+                        break
+                    cursor = job_id
+                else:
+                    # Jobs of the page with nothing to trim are done as well
+                    commit_batch(0, scanned)
+            out_of_time = time.monotonic() - started >= COMPACTION_RUN_SECONDS
         
+        total = sum(deleted.values())
+        if phase == 'done':
+            complete_checkpoint(checkpoint)
+            db.commit()
+            logger.info(f"JobMatch compaction {run} complete: reclaimed {total} rows {deleted}")
+            return {'status': 'complete', 'run': run, 'deleted': deleted, 'total': total}
+        
+        self.apply_async(
+            kwargs={'run': run, 'batch_size': batch_size, 'retention_days': retention_days,
+                    'keep_top_n': keep_top_n},
+            queue=bulk_queue(self.name)
+        )
+        logger.info(f"JobMatch compaction {run}: {total} rows reclaimed so far {deleted}, continuing in {phase}")
+        return {'status': 'in_progress', 'run': run, 'phase': phase, 'deleted': deleted, 'total': total}
+    
     except Exception as e:
-        logger.error(f"Error matching jobs for candidate {candidate_id}: {str(e)}")
+        logger.error(f"Error compacting job matches ({run}): {str(e)}")
         db.rollback()
         return {
             'status': 'error',
-            'candidate_id': candidate_id,
+            'run': run,
             'error': str(e)
         }
     finally:
@@ -0,0 +1,207 @@
+"""
+Notification Tasks
+Drains the notification buffer (workers/notifications.py) in bulk
+
+Each flush pops up to NOTIFICATION_FLUSH_SIZE events, folds events sharing a
+user and digest_key into one row, and writes everything in one transaction:
+plain notifications with a single executemany INSERT, digests with one
+INSERT ... ON CONFLICT that adds to the user's unread digest for that key.
+
+If the database rejects the batch, the flush bisects it (each half in its own
+savepoint) until the offending events are isolated; those are dead-lettered
+and the rest are written. Connection errors return the whole batch to the
+buffer and retry the flush up to NOTIFICATION_FLUSH_RETRIES times.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import false, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import InterfaceError, OperationalError
+from workers.celery_app import app
+from workers.notifications import (
+    NOTIFICATION_FLUSH_SIZE, NOTIFICATION_KEY, notification_buffer, notification_debouncer,
+    publish_notifications
+)
+from shared.database import SessionLocal
+from shared import models
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Flush retries after connection errors; the events stay buffered either way
+NOTIFICATION_FLUSH_RETRIES = int(os.getenv("NOTIFICATION_FLUSH_RETRIES", 5))
+
+# Errors that say nothing about the events themselves
+TRANSIENT_ERRORS = (OperationalError, InterfaceError)
+
+_UPSERT_DIALECTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _row(event: dict, now: datetime, digest_count: int = 1) -> dict:
+    return {
+        'id': uuid.uuid4(),
+        'user_id': uuid.UUID(str(event['user_id'])),
+        'type': event['type'],
+        'title': event['title'][:255],
+        'content': event.get('content'),
+        'link': event.get('link'),
+        'digest_key': event.get('digest_key'),
+        'digest_count': digest_count,
+        'is_read': False,
+        'created_at': now
+    }
+
+
+def build_notification_rows(events: list) -> tuple:
+    """
+    Split events into plain rows and folded digest rows
+    
+    Returns:
+        (plain rows, digest rows)
+    """
+    now = datetime.utcnow()
+    plain = []
+    digests = OrderedDict()
+    for event in events:
+        if not event.get('digest_key'):
+            plain.append(_row(event, now))
+            continue
+        key = (str(event['user_id']), event['digest_key'])
+        if key in digests:
+            # Latest event's text wins; the count carries the rest
+            count = digests[key]['digest_count'] + 1
+            digests[key] = _row(event, now, count)
+        else:
+            digests[key] = _row(event, now)
+    return plain, list(digests.values())
+
+
+def write_notifications(db, plain: list, digests: list) -> None:
+    """Write notification rows (no commit)"""
+    table = models.Notification.__table__
+    if plain:
+        db.execute(insert(table), plain)
+    if not digests:
+        return
+    
+    upsert = _UPSERT_DIALECTS.get(db.get_bind().dialect.name)
+    if upsert is None:
+        db.execute(insert(table), digests)
+        return
+    statement = upsert(table).values(digests)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[table.c.user_id, table.c.digest_key],
+        # Same predicate as uq_notifications_unread_digest, so the index is inferred
+        index_where=(table.c.is_read == false()) & table.c.digest_key.isnot(None),
+        set_={
+            'digest_count': table.c.digest_count + statement.excluded.digest_count,
+            'title': statement.excluded.title,
+            'content': statement.excluded.content,
+            'link': statement.excluded.link,
+            'created_at': statement.excluded.created_at
+        }
+    ))
+
+
+@app.task(name='workers.tasks.notifications.publish', ignore_result=True)
+def publish_notifications_task(events: list) -> dict:
+    """
+    Buffer notification events sent over the broker
+    
+    Args:
+        events: Notification event dictionaries
+    
+    Returns:
+        Dictionary with publish status
+    """
+    buffered = publish_notifications(events)
+    return {'status': 'success' if buffered else 'error', 'events': len(events)}
+
+
+def write_isolating(db, events: list, rejected: list) -> int:
+    """
+    Write events, bisecting around the ones that can't be written (no commit)
+    
+    Each attempt runs in a savepoint; a failing group is split in half until
+    single bad events are left, which are appended to rejected with the error.
+    Connection errors are raised, not bisected.
+    
+    Returns:
+        Rows written
+    """
+    try:
+        with db.begin_nested():
+            plain, digests = build_notification_rows(events)
+            write_notifications(db, plain, digests)
+        return len(plain) + len(digests)
+    except TRANSIENT_ERRORS:
+        raise
+    except Exception as e:
+        if len(events) == 1:
+            logger.error(f"Dead-lettering notification event for user {events[0].get('user_id')}: {str(e)}")
+            rejected.append({**events[0], 'error': str(e)})
+            return 0
+    middle = len(events) // 2
+    return write_isolating(db, events[:middle], rejected) + write_isolating(db, events[middle:], rejected)
+
+
+@app.task(name='workers.tasks.notifications.flush_notifications', bind=True, ignore_result=True)
+def flush_notifications_task(self, force: bool = False, batch_size: int = NOTIFICATION_FLUSH_SIZE) -> dict:
+    """
+    Write one batch of buffered notifications
+    
+    Args:
+        force: Flush now even if the debounce window is still open
+        batch_size: Events popped per flush
+    
+    Returns:
+        Dictionary with flush status
+    """
+    if not force:
+        try:
+            remaining = notification_debouncer.claim(NOTIFICATION_KEY)
+        except Exception as e:
+            logger.warning(f"Notification debouncer unavailable, flushing now: {str(e)}")
+            remaining = 0
+        if remaining > 0:
+            self.apply_async(kwargs={'batch_size': batch_size}, countdown=remaining)
+            return {'status': 'deferred', 'countdown': remaining}
+    
+    events = notification_buffer.pop(batch_size)
+    if not events:
+        return {'status': 'success', 'events': 0}
+    
+    rejected = []
+    db = SessionLocal()
+    try:
+        rows = write_isolating(db, events, rejected)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        notification_buffer.push(events)
+        if self.request.retries >= NOTIFICATION_FLUSH_RETRIES:
+            # The next published event schedules another flush
+            logger.error(f"Error writing {len(events)} notifications, left in the buffer: {str(e)}")
+            return {'status': 'error', 'events': len(events), 'error': str(e)}
+        logger.error(f"Error writing {len(events)} notifications, returning them to the buffer: {str(e)}")
+        raise self.retry(exc=e, countdown=30, max_retries=NOTIFICATION_FLUSH_RETRIES)
+    finally:
+        db.close()
+    
+    if rejected:
+        try:
+            notification_buffer.dead_letter(rejected)
+        except Exception as e:
+            logger.error(f"Could not dead-letter {len(rejected)} notification events: {str(e)}")
+    
+    # Keep draining while the buffer is backed up
+    if len(events) == batch_size:
+        self.apply_async(kwargs={'force': True, 'batch_size': batch_size})
+    
+    logger.info(f"Flushed {len(events)} notification events into {rows} rows ({len(rejected)} dead-lettered)")
+    return {'status': 'success', 'events': len(events), 'rows': rows, 'rejected': len(rejected)}
@@ -1,28 +1,233 @@
 """
 Resume Processing Tasks
 Automated resume parsing and candidate profiling
+
+parse_resume_task fetches, decodes and parses in one task. In split deployments
+workers.tasks.extraction.extract_resume decodes documents on the extraction queue
+and hands plain text to parse_resume_text_task here, so NLP workers never wait
+on PDF decoding.
 """
 from celery import Task
+from sqlalchemy import func, or_, update
+from workers.backpressure import (
+    BULK_POLL_SECONDS, BulkProducer, bulk_queue, in_bulk_message, to_bulk
+)
+from workers.blobs import BLOB_TTL, maybe_blob, resolve
 from workers.celery_app import app
-from ml_models.resume_parser.parser import ResumeParser
+from workers import telemetry
+from workers.idempotency import idempotent
+from workers.checkpoints import (
+    advance_checkpoint, complete_checkpoint, is_stalled, load_checkpoint, reset_checkpoint
+)
+from workers.matches import trigger_matching
+from ml_models.resume_parser.cache import build_parse_cache, content_hash, parse_mode
+from ml_models.resume_parser.instrumentation import StageHistograms
+from ml_models.resume_parser.taxonomy import parser_version
 from shared.database import SessionLocal
+from shared.storage import ResumeTooLargeError, StorageError, get_resume_storage, read_resume
 from shared import models
 import logging
+import os
+import time
+import uuid
+from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-# Initialize resume parser
-parser = ResumeParser()
+# Resume parser, loaded on first use (see get_parser)
+_parser = None
+
+# Version stamped on every profile this worker parses
+CURRENT_PARSER_VERSION = parser_version()
+
+# Parse results keyed by file hash + parser version (None when disabled)
+parse_cache = build_parse_cache(CURRENT_PARSER_VERSION)
+
+# Workers parse with the default tiering; cache lookups use the same mode
+PARSE_MODE = parse_mode(tiered=os.getenv("RESUME_PARSER_TIERED", "True") == "True")
+
+# Where resume_url points (local filesystem or S3)
+storage = get_resume_storage()
+
+# Reparse backfill pacing
+BACKFILL_CHUNK_SIZE = int(os.getenv("REPARSE_BACKFILL_CHUNK_SIZE", 200))
+BACKFILL_RATE = float(os.getenv("REPARSE_BACKFILL_RATE", 20))  # profiles per second
+# Seconds without checkpoint progress before the watchdog takes over the chain
+BACKFILL_STALL_SECONDS = int(os.getenv("REPARSE_BACKFILL_STALL_SECONDS", 1800))
+# Failed profile ids kept in the checkpoint state (the count is kept in full)
+BACKFILL_MAX_FAILED_IDS = 500
+
+# Bulk import batching (resumes per batch subtask, errors kept in the report)
+BULK_PARSE_BATCH_SIZE = int(os.getenv("BULK_PARSE_BATCH_SIZE", 25))
+BULK_PARSE_MAX_ERRORS = 100
+# Seconds after an import starts that its report waits for unfinished batches
+# before counting them as missing
+BULK_PARSE_REPORT_TIMEOUT = int(os.getenv("BULK_PARSE_REPORT_TIMEOUT", 24 * 3600))
+# Import items and batch outcomes outlive the report timeout, so the report
+# never reads an expired blob
+BULK_PARSE_BLOB_TTL = BULK_PARSE_REPORT_TIMEOUT + BLOB_TTL
+
+# Per-stage parse latency/size histograms (filled when RESUME_PARSER_INSTRUMENT is on);
+# workers export them through the task metrics endpoint
+stage_histograms = StageHistograms()
+
+
+def get_parser():
+    """
+    Load the resume parser on first use
+    
+    Every worker imports this module through the Celery include list, so the
+    spaCy import and model load are deferred until a worker actually parses.
+    Extraction-only workers never pay for them.
+    """
+    global _parser
+    if _parser is None:
+        from ml_models.resume_parser.parser import ResumeParser
+        _parser = ResumeParser()
+    return _parser
+
+
+def _parse_resume_bytes(data: bytearray) -> tuple:
+    """
+    Parse resume bytes, reusing a cached result for identical files
+    
+    Returns:
+        (parsed data including resume_text, content hash)
+    """
+    def parse(payload):
+        result = get_parser().parse(payload, include_text=True)
+        _observe_metrics(result.pop('metrics', None))
+        return result
+    
+    if parse_cache is not None:
+        return parse_cache.get_or_parse(data, parse, PARSE_MODE)
+    return parse(data), content_hash(data)
+
+
+def _observe_metrics(record: dict) -> None:
+    """Aggregate a parse metrics record and export it to Prometheus"""
+    if not record:
+        return
+    stage_histograms.observe(record)
+    if telemetry.metrics is not None:
+        telemetry.metrics.observe_parse(record)
+
+
+class EmptyResumeError(ValueError):
+    """Raised when a resume yields no text (extraction failed or the file is empty)"""
+
+
+def apply_parsed_resume(db, candidate_id: str, resume_url: str, parsed_data: dict, digest: str,
+                        commit: bool = True) -> bool:
+    """
+    Write parsed resume fields to the candidate profile in one UPDATE
+    
+    Rows already holding this content hash and parser version are left alone,
+    so retries and re-uploads of the same file are no-ops. Pass commit=False to
+    group several updates into the caller's transaction.
+    
+    A parse without text is never stamped with the hash and version, so retries
+    and the reparse backfill still treat the profile as outdated.
+    
+    Returns:
+        True if the profile changed
+    
+    Raises:
+        EmptyResumeError: No text was extracted from the resume
+    """
+    if not (parsed_data.get('resume_text') or '').strip():
+        raise EmptyResumeError(f"No text could be extracted from resume {digest[:12]}")
+    
+    profile = models.CandidateProfile
+    values = {
+        'resume_url': resume_url,
+        'resume_text': parsed_data.get('resume_text'),
+        'resume_content_hash': digest,
+        'parser_version': CURRENT_PARSER_VERSION,
+    }
+    
+    # Only overwrite structured fields the parser actually found
+    if parsed_data.get('skills'):
+        values['skills'] = parsed_data['skills']
+    if parsed_data.get('education'):
+        values['education'] = parsed_data['education']
+    if parsed_data.get('experience'):
+        values['work_experience'] = parsed_data['experience']
+    
+    # Fill name/phone only where the candidate hasn't set them
+    personal = parsed_data.get('personal') or {}
+    if personal.get('name'):
+        names = personal['name'].split(' ', 1)
+        values['first_name'] = func.coalesce(profile.first_name, names[0])
+        if len(names) > 1:
+            values['last_name'] = func.coalesce(profile.last_name, names[1])
+    if personal.get('phone'):
+        values['phone'] = func.coalesce(profile.phone, personal['phone'][:20])
+    
+    result = db.execute(
+        update(profile)
+        .where(profile.id == candidate_id)
+        .where(or_(
+            profile.resume_content_hash.is_(None),
+            profile.resume_content_hash != digest,
+            profile.parser_version.is_(None),
+            profile.parser_version != CURRENT_PARSER_VERSION
+        ))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    if commit:
+        db.commit()
+    return result.rowcount > 0
+
+
+def store_parsed_resume(db, candidate_id: str, resume_url: str, parsed_data: dict, digest: str) -> dict:
+    """
+    Apply a parse result to the profile and hand changed candidates to matching
+    
+    Returns:
+        Task result dictionary
+    """
+    try:
+        updated = apply_parsed_resume(db, candidate_id, resume_url, parsed_data, digest)
+    except EmptyResumeError as e:
+        logger.warning(f"Not storing resume for candidate {candidate_id}: {str(e)}")
+        return {
+            'status': 'error',
+            'candidate_id': candidate_id,
+            'content_hash': digest,
+            'error': str(e)
+        }
+    
+    if updated:
+        logger.info(f"Successfully updated candidate {candidate_id}")
+        trigger_matching('candidate', candidate_id)
+    else:
+        logger.info(f"Resume {digest[:12]} already applied to candidate {candidate_id}")
+    
+    return {
+        'status': 'success' if updated else 'unchanged',
+        'candidate_id': candidate_id,
+        'content_hash': digest,
+        'confidence_score': parsed_data.get('confidence_score', 0)
+    }
+
 
+def resume_version(arguments: dict) -> str:
+    """Idempotency version of a stored resume, so a re-upload to the same URL is parsed again"""
+    return storage.version(arguments['resume_url'])
 
-@app.task(name='workers.tasks.resume_processing.parse_resume', bind=True)
+
+@app.task(name='workers.tasks.resume_processing.parse_resume', bind=True, ignore_result=True,
+          max_retries=3, default_retry_delay=30)
+@idempotent("parse:{candidate_id}", version=resume_version)
 def parse_resume_task(self: Task, candidate_id: str, resume_url: str) -> dict:
     """
-    Parse resume and update candidate profile
+    Fetch, parse and store a candidate's resume, then refresh their matches
     
     Args:
         candidate_id: UUID of candidate
-        resume_url: URL/path to resume file
+        resume_url: s3://bucket/key, file:// URL or path relative to the storage root
     
     Returns:
         Dictionary with parsed data and status
@@ -31,49 +236,20 @@ def parse_resume_task(self: Task, candidate_id: str, resume_url: str) -> dict:
     try:
         logger.info(f"Parsing resume for candidate {candidate_id}")
         
-        # Parse resume
-        # In production, fetch file from S3 using resume_url
-        # For now, we'll simulate
-        parsed_data = {
-            "personal": {"name": "Sample", "email": "sample@email.com"},
-            "skills": ["Python", "FastAPI"],
-            "education": [],
-            "experience": [],
-            "confidence_score": 0.8
-        }
-        
-        # Update candidate profile
-        candidate = db.query(models.CandidateProfile).filter(
-            models.CandidateProfile.id == candidate_id
-        ).first()
-        
-        if candidate:
-            # Update skills if parsed successfully
-            if parsed_data.get('skills'):
-                candidate.skills = parsed_data['skills']
-            
-            # Update name if available
-            if parsed_data.get('personal', {}).get('name'):
-                names = parsed_data['personal']['name'].split(' ', 1)
-                candidate.first_name = names[0]
-                if len(names) > 1:
-                    candidate.last_name = names[1]
-            
-            # Update education and experience
-            if parsed_data.get('education'):
-                candidate.education = parsed_data['education']
-            if parsed_data.get('experience'):
-                candidate.work_experience = parsed_data['experience']
-            
-            db.commit()
-            logger.info(f"Successfully updated candidate {candidate_id}")
-        
+        data = read_resume(storage, resume_url)
+        parsed_data, digest = _parse_resume_bytes(data)
+        return store_parsed_resume(db, candidate_id, resume_url, parsed_data, digest)
+    
+    except ResumeTooLargeError as e:
+        logger.warning(f"Rejected resume for candidate {candidate_id}: {str(e)}")
         return {
-            'status': 'success',
+            'status': 'error',
             'candidate_id': candidate_id,
-            'confidence_score': parsed_data.get('confidence_score', 0)
+            'error': str(e)
         }
-        
+    except StorageError as e:
+        logger.warning(f"Storage error for candidate {candidate_id}, retrying: {str(e)}")
+        raise self.retry(exc=e)
     except Exception as e:
         logger.error(f"Error parsing resume for candidate {candidate_id}: {str(e)}")
         db.rollback()
@@ -86,36 +262,527 @@ def parse_resume_task(self: Task, candidate_id: str, resume_url: str) -> dict:
         db.close()
 
 
-@app.task(name='workers.tasks.resume_processing.bulk_parse_resumes')
-def bulk_parse_resumes_task(candidate_resume_pairs: list) -> dict:
+@app.task(name='workers.tasks.resume_processing.parse_resume_text', ignore_result=True)
+@idempotent("parse:{candidate_id}")
+def parse_resume_text_task(candidate_id: str, resume_url: str, text: str, digest: str) -> dict:
     """
-    Parse multiple resumes in batch
+    NLP stage of the split pipeline: parse text decoded by an extraction worker
     
     Args:
-        candidate_resume_pairs: List of (candidate_id, resume_url) tuples
+        candidate_id: UUID of candidate
+        resume_url: Source URL of the resume
+        text: Extracted resume text, or a blob reference for long texts
+        digest: SHA-256 of the original file bytes
     
     Returns:
-        Summary of batch processing
+        Dictionary with parse status
     """
-    results = {
-        'total': len(candidate_resume_pairs),
-        'successful': 0,
-        'failed': 0,
-        'errors': []
+    db = SessionLocal()
+    try:
+        text = resolve(text)
+        parsed_data = get_parser().parse_text(text)
+        _observe_metrics(parsed_data.pop('metrics', None))
+        parsed_data['resume_text'] = text
+        if parse_cache is not None:
+            parse_cache.set(digest, parsed_data, PARSE_MODE)
+        
+        return store_parsed_resume(db, candidate_id, resume_url, parsed_data, digest)
+    
+    except Exception as e:
+        logger.error(f"Error parsing resume text for candidate {candidate_id}: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'candidate_id': candidate_id,
+            'error': str(e)
+        }
+    finally:
+        db.close()
+
+
+def _batch_error(candidate_id: str, error: Exception) -> dict:
+    return {
+        'status': 'error',
+        'candidate_id': candidate_id,
+        'error': str(error)
     }
+
+
+@app.task(name='workers.tasks.resume_processing.bulk_rematch', bind=True, ignore_result=True)
+def bulk_rematch_task(self: Task, candidate_ids: list) -> dict:
+    """
+    Send rematches for candidates changed by bulk work to matching.bulk
+    
+    Sends as many as the queue has room for and re-enqueues itself with a
+    countdown for the rest, so a bulk worker never sits idle waiting for
+    matching.bulk to drain (it may be the worker that drains it).
     
-    for candidate_id, resume_url in candidate_resume_pairs:
+    Args:
+        candidate_ids: Candidate profile ids to rematch
+    
+    Returns:
+        Counts of rematches sent and deferred
+    """
+    producer = BulkProducer('workers.tasks.matching.match_jobs_for_candidate')
+    room = producer.headroom()
+    producer.send_many(candidate_ids[:room], block=False)
+    deferred = candidate_ids[room:]
+    if deferred:
+        self.apply_async(args=[deferred], countdown=BULK_POLL_SECONDS, queue=bulk_queue(self.name))
+    return {'status': 'deferred' if deferred else 'sent', 'sent': len(candidate_ids) - len(deferred),
+            'deferred': len(deferred)}
+
+
+@app.task(name='workers.tasks.resume_processing.parse_resume_batch')
+def parse_resume_batch_task(candidate_resume_pairs: list) -> list:
+    """
+    Parse a batch of resumes with one parser pass and store them in one transaction
+    
+    Batch subtask of bulk_parse_resumes_task. Failures are reported per resume
+    instead of raised, so one bad file never drops a batch from the report.
+    
+    Args:
+        candidate_resume_pairs: List of (candidate_id, resume_url) pairs, or a blob reference
+    
+    Returns:
+        One outcome dictionary per pair (a blob reference when large)
+    """
+    outcomes = []
+    fetched = []
+    for candidate_id, resume_url in resolve(candidate_resume_pairs):
         try:
-            result = parse_resume_task.apply_async(
-                args=[candidate_id, resume_url],
-                queue='resume'
-            )
-            results['successful'] += 1
+            data = read_resume(storage, resume_url)
+        except StorageError as e:
+            logger.warning(f"Skipping resume for candidate {candidate_id}: {str(e)}")
+            outcomes.append(_batch_error(candidate_id, e))
+            continue
+        fetched.append((candidate_id, resume_url, data, content_hash(data)))
+    
+    # Reuse cached results; everything else goes through parse_many together
+    parsed = {}
+    if parse_cache is not None:
+        for index, (_, _, _, digest) in enumerate(fetched):
+            cached = parse_cache.get(digest, PARSE_MODE)
+            if cached is not None:
+                parsed[index] = cached
+    misses = [index for index in range(len(fetched)) if index not in parsed]
+    
+    if misses:
+        try:
+            results = get_parser().parse_many([fetched[index][2] for index in misses], include_text=True)
         except Exception as e:
-            results['failed'] += 1
-            results['errors'].append({
+            logger.error(f"Error parsing resume batch: {str(e)}")
+            results = [e] * len(misses)
+        for index, parsed_data in zip(misses, results):
+            if isinstance(parsed_data, Exception):
+                outcomes.append(_batch_error(fetched[index][0], parsed_data))
+                continue
+            _observe_metrics(parsed_data.pop('metrics', None))
+            if parse_cache is not None:
+                parse_cache.set(fetched[index][3], parsed_data, PARSE_MODE)
+            parsed[index] = parsed_data
+    
+    db = SessionLocal()
+    changed = []
+    try:
+        for index in sorted(parsed):
+            candidate_id, resume_url, _, digest = fetched[index]
+            parsed_data = parsed[index]
+            try:
+                # Savepoint per profile so a bad row doesn't roll back the batch
+                with db.begin_nested():
+                    updated = apply_parsed_resume(db, candidate_id, resume_url, parsed_data, digest,
+                                                  commit=False)
+            except Exception as e:
+                logger.error(f"Error storing resume for candidate {candidate_id}: {str(e)}")
+                outcomes.append(_batch_error(candidate_id, e))
+                continue
+            if updated:
+                changed.append(candidate_id)
+            outcomes.append({
+                'status': 'success' if updated else 'unchanged',
                 'candidate_id': candidate_id,
-                'error': str(e)
+                'content_hash': digest,
+                'confidence_score': parsed_data.get('confidence_score', 0)
             })
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error committing resume batch: {str(e)}")
+        db.rollback()
+        stored = {outcome['candidate_id'] for outcome in outcomes if outcome['status'] != 'error'}
+        outcomes = [outcome for outcome in outcomes if outcome['candidate_id'] not in stored]
+        outcomes.extend(_batch_error(candidate_id, e) for candidate_id in stored)
+        changed = []
+    finally:
+        db.close()
+    
+    # Bulk imports rematch on matching.bulk instead of the interactive debounce path
+    if changed and in_bulk_message():
+        bulk_rematch_task(changed)
+    else:
+        for candidate_id in changed:
+            trigger_matching('candidate', candidate_id)
+    
+    logger.info(f"Parsed resume batch: {len(changed)} updated, {len(outcomes)} total")
+    return maybe_blob(outcomes, ttl_seconds=BULK_PARSE_BLOB_TTL)
+
+
+@app.task(name='workers.tasks.resume_processing.aggregate_bulk_parse', bind=True)
+def aggregate_bulk_parse_task(self: Task, batch_task_ids: list, total: int, started_at: float = None) -> dict:
+    """
+    Build the final import report of bulk_parse_resumes_task
+    
+    Sent once every batch is queued. While batches are still running it
+    re-runs itself every BULK_POLL_SECONDS instead of holding a worker;
+    batches unfinished BULK_PARSE_REPORT_TIMEOUT after the import started
+    count as missing.
+    
+    Args:
+        batch_task_ids: Task ids of the parse_resume_batch_task subtasks
+        total: Number of resumes submitted
+        started_at: Epoch seconds when the import started
+    
+    Returns:
+        Summary with real success/failure counts and confidence statistics
+    """
+    results = [app.AsyncResult(task_id) for task_id in batch_task_ids]
+    if not all(result.ready() for result in results):
+        if started_at is not None and time.time() - started_at < BULK_PARSE_REPORT_TIMEOUT:
+            raise self.retry(countdown=BULK_POLL_SECONDS, max_retries=None)
+        logger.warning("Bulk resume parse report timed out waiting for batches")
+    
+    outcomes = [
+        outcome for result in results if result.successful()
+        for outcome in resolve(result.result)
+    ]
+    failed = [outcome for outcome in outcomes if outcome['status'] == 'error']
+    scores = sorted(outcome['confidence_score'] for outcome in outcomes if outcome['status'] != 'error')
+    
+    report = {
+        'total': total,
+        'successful': sum(1 for outcome in outcomes if outcome['status'] == 'success'),
+        'unchanged': sum(1 for outcome in outcomes if outcome['status'] == 'unchanged'),
+        'failed': len(failed),
+        'missing': total - len(outcomes),
+        'confidence': {
+            'mean': round(sum(scores) / len(scores), 4) if scores else 0.0,
+            'min': scores[0] if scores else 0.0,
+            'median': scores[len(scores) // 2] if scores else 0.0,
+            'max': scores[-1] if scores else 0.0,
+            'low': sum(1 for score in scores if score < 0.5)
+        },
+        'errors': [
+            {'candidate_id': outcome['candidate_id'], 'error': outcome['error']}
+            for outcome in failed[:BULK_PARSE_MAX_ERRORS]
+        ]
+    }
+    logger.info(
+        f"Bulk resume parse finished: {report['successful']} updated, {report['unchanged']} unchanged, "
+        f"{report['failed']} failed of {total} (mean confidence {report['confidence']['mean']})"
+    )
+    return report
+
+
+@app.task(name='workers.tasks.resume_processing.bulk_parse_resumes', bind=True)
+def bulk_parse_resumes_task(self: Task, candidate_resume_pairs: list, batch_size: int = BULK_PARSE_BATCH_SIZE,
+                            offset: int = 0, batch_task_ids: list = None, report_task_id: str = None,
+                            started_at: float = None) -> dict:
+    """
+    Parse multiple resumes in batch
     
+    Resumes are split into batches of batch_size, each parsed by one
+    parse_resume_batch_task on resume.bulk. Only as many batches are sent as
+    the queue has room for; the rest go to a continuation of this task, so a
+    large import never floods the queue or blocks a worker while it drains.
+    The first call stores the import once; continuations carry its reference
+    and the offset of the first pair not yet sent. Once every batch is sent,
+    aggregate_bulk_parse_task builds the final report. Fetch it from the
+    result backend with report_task_id, which the first call already returns.
+    
+    Args:
+        candidate_resume_pairs: List of (candidate_id, resume_url) tuples, or a blob
+                                reference to one (workers.blobs.put_blob) for large imports
+        batch_size: Resumes per subtask
+        offset, batch_task_ids, report_task_id, started_at: Carried between continuations
+    
+    Returns:
+        Dispatch summary
+    """
+    pairs = resolve(candidate_resume_pairs)
+    total = len(pairs)
+    if started_at is None:
+        if not total:
+            return aggregate_bulk_parse_task([], 0)
+        started_at = time.time()
+        # Stored once for every continuation, and kept as long as the report may run
+        candidate_resume_pairs = maybe_blob(pairs, ttl_seconds=BULK_PARSE_BLOB_TTL)
+    batch_task_ids = list(batch_task_ids or [])
+    report_task_id = report_task_id or str(uuid.uuid4())
+    
+    # Bulk imports run on resume.bulk so single uploads never queue behind them
+    producer = BulkProducer(parse_resume_batch_task.name)
+    end = min(offset + producer.headroom() * batch_size, total)
+    sent = producer.send_many(
+        (pairs[start:min(start + batch_size, end)] for start in range(offset, end, batch_size)),
+        build=lambda batch: {'args': [maybe_blob(batch)]},
+        block=False
+    )
+    batch_task_ids.extend(result.id for result in sent)
+    remaining = total - end
+    
+    if remaining:
+        self.apply_async(
+            args=[candidate_resume_pairs],
+            kwargs={
+                'batch_size': batch_size,
+                'offset': end,
+                'batch_task_ids': batch_task_ids,
+                'report_task_id': report_task_id,
+                'started_at': started_at
+            },
+            queue=bulk_queue(self.name),
+            countdown=BULK_POLL_SECONDS
+        )
+    else:
+        to_bulk(aggregate_bulk_parse_task.s(batch_task_ids, total, started_at)).apply_async(task_id=report_task_id)
+    
+    logger.info(
+        f"Dispatched {len(sent)} resume batches ({len(batch_task_ids)} so far), "
+        f"{remaining} of {total} resumes waiting for queue room"
+    )
+    return {
+        'status': 'dispatching' if remaining else 'dispatched',
+        'total': total,
+        'batches': len(batch_task_ids),
+        'remaining': remaining,
+        'report_task_id': report_task_id
+    }
+
+
+def _stored_resume_hash(row) -> str:
+    """
+    Content hash to stamp on a profile reparsed from its stored text
+    
+    Profiles parsed before content hashing have none; their file is read once
+    to hash it, so the next upload of the same file is recognised as unchanged.
+    
+    Returns:
+        The profile's content hash, or None if it has no readable resume file
+    """
+    if row.resume_content_hash or not row.resume_url:
+        return row.resume_content_hash
+    try:
+        return content_hash(read_resume(storage, row.resume_url))
+    except StorageError as e:
+        logger.warning(f"Could not hash resume of profile {row.id}: {str(e)}")
+        return None
+
+
+def _parse_texts_isolated(texts: list) -> list:
+    """
+    Parse stored resume texts in one batch, falling back to one at a time
+    
+    Returns:
+        A parse result or the exception raised for each text, in order
+    """
+    try:
+        return get_parser().parse_texts(texts)
+    except Exception as e:
+        logger.warning(f"Batch reparse failed ({str(e)}), parsing {len(texts)} profiles individually")
+    
+    results = []
+    for text in texts:
+        try:
+            results.append(get_parser().parse_texts([text])[0])
+        except Exception as e:
+            results.append(e)
     return results
+
+
+@app.task(name='workers.tasks.resume_processing.reparse_outdated_profiles', bind=True, ignore_result=True)
+def reparse_outdated_profiles_task(self: Task, chunk_size: int = BACKFILL_CHUNK_SIZE,
+                                   rate_per_second: float = BACKFILL_RATE,
+                                   restart: bool = False, token: str = None,
+                                   resume_only: bool = False) -> dict:
+    """
+    Reparse profiles produced by an older parser version, one keyset chunk per run
+    
+    Each run reparses the chunk after the stored checkpoint through the batched
+    parser path, commits the profile updates together with the checkpoint, and
+    re-enqueues itself on resume.bulk with a countdown that keeps throughput
+    under rate_per_second. Refetches and rematches go to the bulk queues; a
+    chunk is no larger than the room left in either queue, and a run waits
+    while either queue is at its target backlog. Invoking the task
+    again after a restart resumes from the checkpoint.
+    
+    Reparsed profiles are stamped with the parser version and the content
+    hash of their resume file, as a parse of the file itself would be.
+    
+    A profile that fails to parse is skipped and recorded in the checkpoint
+    state (failed_ids) instead of stopping the backfill; it keeps its old
+    parser_version and is picked up again by a restart.
+    
+    A watchdog invocation (resume_only=True, scheduled by beat) continues a
+    backfill whose chain stopped, e.g. after a worker crash. Continuations
+    carry the chain's token, so a chain replaced by the watchdog stops at its
+    next step.
+    
+    Args:
+        chunk_size: Profiles per run
+        rate_per_second: Maximum sustained reparse rate
+        restart: Discard the checkpoint and start from the first profile
+        token: Chain token, set on continuations
+        resume_only: Only continue a started, stalled backfill, never start one
+    
+    Returns:
+        Progress summary for this chunk
+    """
+    checkpoint_name = f"reparse_backfill:{CURRENT_PARSER_VERSION}"
+    continuation = token is not None
+    
+    def continue_after(countdown: float, chain_token: str) -> None:
+        self.apply_async(
+            kwargs={'chunk_size': chunk_size, 'rate_per_second': rate_per_second, 'token': chain_token},
+            countdown=countdown,
+            queue=bulk_queue(self.name)
+        )
+    
+    db = SessionLocal()
+    try:
+        started = time.monotonic()
+        
+        if resume_only:
+            existing = db.query(models.TaskCheckpoint).filter(
+                models.TaskCheckpoint.name == checkpoint_name
+            ).first()
+            if existing is None or existing.completed_at is not None:
+                db.commit()
+                return {'status': 'idle'}
+            if not is_stalled(existing, BACKFILL_STALL_SECONDS):
+                db.commit()
+                return {'status': 'running', 'processed': existing.processed}
+            logger.warning(f"Reparse backfill {checkpoint_name} stalled, resuming from its checkpoint")
+        
+        load_checkpoint(db, checkpoint_name)
+        # Overlapping invocations serialize on the checkpoint row
+        checkpoint = db.query(models.TaskCheckpoint).filter(
+            models.TaskCheckpoint.name == checkpoint_name
+        ).populate_existing().with_for_update().one()
+        if restart:
+            reset_checkpoint(checkpoint)
+        elif checkpoint.completed_at is not None:
+            db.commit()
+            return {'status': 'complete', 'processed': checkpoint.processed}
+        state = dict(checkpoint.state or {})
+        if continuation and state.get('token') != token:
+            db.commit()
+            return {'status': 'superseded'}
+        if not continuation:
+            # A new chain for this backfill; any older chain stops at its next step
+            token = uuid.uuid4().hex
+            state['token'] = token
+        
+        # Refetches and rematches go to the bulk queues, paced by their backlog
+        refetch_producer = BulkProducer(parse_resume_task.name)
+        rematch_producer = BulkProducer('workers.tasks.matching.match_jobs_for_candidate')
+        # Every profile of a chunk may need a refetch or a rematch, so a chunk
+        # never holds more profiles than either queue has room for
+        room = min(refetch_producer.headroom(), rematch_producer.headroom())
+        if not room:
+            # Touch the checkpoint so a throttled chain does not look stalled
+            checkpoint.state = state
+            checkpoint.updated_at = datetime.utcnow()
+            db.commit()
+            continue_after(BULK_POLL_SECONDS, token)
+            return {'status': 'throttled', 'countdown': BULK_POLL_SECONDS}
+        
+        profile = models.CandidateProfile
+        query = db.query(
+            profile.id, profile.resume_text, profile.resume_url, profile.resume_content_hash,
+            profile.skills, profile.education, profile.work_experience
+        ).filter(
+            or_(profile.parser_version.is_(None), profile.parser_version != CURRENT_PARSER_VERSION),
+            or_(profile.resume_text.isnot(None), profile.resume_url.isnot(None))
+        )
+        if checkpoint.last_key:
+            query = query.filter(profile.id > uuid.UUID(checkpoint.last_key))
+        rows = query.order_by(profile.id).limit(min(chunk_size, room)).all()
+        
+        if not rows:
+            checkpoint.state = state
+            complete_checkpoint(checkpoint)
+            db.commit()
+            logger.info(
+                f"Reparse backfill {checkpoint_name} complete: {checkpoint.processed} profiles, "
+                f"{state.get('failed', 0)} failed"
+            )
+            return {'status': 'complete', 'processed': checkpoint.processed, 'failed': state.get('failed', 0)}
+        
+        # Stored text is reparsed in one batch; profiles without it are refetched
+        with_text = [row for row in rows if row.resume_text]
+        refetch = [row for row in rows if not row.resume_text]
+        
+        updates = []
+        rematch = []
+        failed = []
+        parsed_batch = _parse_texts_isolated([row.resume_text for row in with_text])
+        for row, parsed_data in zip(with_text, parsed_batch):
+            if isinstance(parsed_data, Exception):
+                logger.error(f"Reparse of profile {row.id} failed, skipping: {str(parsed_data)}")
+                failed.append(str(row.id))
+                continue
+            _observe_metrics(parsed_data.pop('metrics', None))
+            skills = parsed_data.get('skills') or row.skills
+            updates.append({
+                'id': row.id,
+                'skills': skills,
+                'education': parsed_data.get('education') or row.education,
+                'work_experience': parsed_data.get('experience') or row.work_experience,
+                'resume_content_hash': _stored_resume_hash(row),
+                'parser_version': CURRENT_PARSER_VERSION,
+            })
+            if set(skills or []) != set(row.skills or []):
+                rematch.append(str(row.id))
+        
+        if updates:
+            db.execute(update(profile), updates)
+        state['refetched'] = state.get('refetched', 0) + len(refetch)
+        if failed:
+            state['failed'] = state.get('failed', 0) + len(failed)
+            state['failed_ids'] = (state.get('failed_ids', []) + failed)[-BACKFILL_MAX_FAILED_IDS:]
+        advance_checkpoint(checkpoint, rows[-1].id, len(rows), state)
+        db.commit()
+        
+        for row in refetch:
+            refetch_producer.send(args=[str(row.id), row.resume_url], block=False)
+        for candidate_id in rematch:
+            rematch_producer.send(args=[candidate_id], block=False)
+        
+        elapsed = time.monotonic() - started
+        delay = max(len(rows) / rate_per_second - elapsed, 0)
+        continue_after(delay, token)
+        
+        logger.info(
+            f"Reparse backfill {checkpoint_name}: {len(rows)} profiles in {elapsed:.2f}s "
+            f"({checkpoint.processed} total, {len(failed)} failed), next chunk in {delay:.1f}s"
+        )
+        return {
+            'status': 'in_progress',
+            'chunk': len(rows),
+            'reparsed': len(updates),
+            'refetched': len(refetch),
+            'rematched': len(rematch),
+            'failed': len(failed),
+            'processed': checkpoint.processed
+        }
+    
+    except Exception as e:
+        # The chain stops here; the watchdog resumes from the checkpoint
+        logger.error(f"Error in reparse backfill {checkpoint_name}: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'error': str(e)
+        }
+    finally:
+        db.close()
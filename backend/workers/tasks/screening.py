@@ -0,0 +1,264 @@
+"""
+Application Screening Tasks
+Scores submitted applications against their job and writes screening_score
+and a match summary back in one bulk UPDATE per batch
+
+Flushes are scheduled by workers.screening.trigger_screening. Optional LLM
+summaries run on the rate-limited llm queue and replace the reason-based
+summary when they complete.
+"""
+from collections import OrderedDict
+from sqlalchemy import update
+from workers.celery_app import app
+from workers.automation import publish_automation_events
+from workers.screening import SCREENING_KEY, screening_debouncer
+from workers.tasks.matching import matcher, to_candidate_profile, to_job_posting
+from shared.database import SessionLocal
+from shared import models
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Applications scored per flush; a full batch re-enqueues the flush
+SCREENING_BATCH_SIZE = int(os.getenv("SCREENING_BATCH_SIZE", 200))
+# An application that fails to score this many times stops being retried
+SCREENING_MAX_ATTEMPTS = int(os.getenv("SCREENING_MAX_ATTEMPTS", 3))
+
+# LLM summaries (off unless enabled and an API key is configured)
+SCREENING_LLM_SUMMARIES = os.getenv("SCREENING_LLM_SUMMARIES", "False") == "True"
+SCREENING_LLM_RATE_LIMIT = os.getenv("SCREENING_LLM_RATE_LIMIT", "30/m")
+
+# OpenAI client, created on first use by get_llm_client
+_llm_client = None
+
+# Job features keyed by job id, reused while the job's updated_at is unchanged
+JOB_FEATURE_CACHE_SIZE = 1000
+_job_features = OrderedDict()
+
+
+def job_features(db, job_ids: set) -> dict:
+    """JobPosting features for job ids, loading only jobs changed since they were cached"""
+    versions = db.query(models.Job.id, models.Job.updated_at).filter(models.Job.id.in_(job_ids)).all()
+    stale = [job_id for job_id, updated_at in versions
+             if job_id not in _job_features or _job_features[job_id][0] != updated_at]
+    if stale:
+        for job in db.query(models.Job).filter(models.Job.id.in_(stale)).all():
+            _job_features[job.id] = (job.updated_at, to_job_posting(job))
+    
+    features = {}
+    for job_id, _ in versions:
+        _job_features.move_to_end(job_id)
+        features[job_id] = _job_features[job_id][1]
+    while len(_job_features) > JOB_FEATURE_CACHE_SIZE:
+        _job_features.popitem(last=False)
+    return features
+
+
+def get_llm_client():
+    """Create the OpenAI client on first use, so workers without summaries never import it"""
+    global _llm_client
+    if _llm_client is None:
+        from openai import OpenAI
+        _llm_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _llm_client
+
+
+def summarize_reasons(match_score: float, reasons: list) -> str:
+    """Short summary built from the matcher's reasons"""
+    summary = f"{round(match_score * 100)}% match"
+    return f"{summary}: {'; '.join(reasons)}." if reasons else f"{summary}."
+
+
+def score_applications(db, rows: list) -> tuple:
+    """
+    Score application rows (id, job_id, candidate_id, screening_attempts)
+    
+    A row that fails to score doesn't affect the others; it gets its attempt
+    count raised instead, and a final summary once it reaches
+    SCREENING_MAX_ATTEMPTS.
+    
+    Returns:
+        (bulk UPDATE parameter dicts for scored rows, for failed rows)
+    """
+    jobs = job_features(db, {row.job_id for row in rows})
+    candidate_ids = {row.candidate_id for row in rows}
+    candidates = {
+        candidate.id: to_candidate_profile(candidate)
+        for candidate in db.query(models.CandidateProfile).filter(
+            models.CandidateProfile.id.in_(candidate_ids)
+        ).all()
+    }
+    
+    updates = []
+    failures = []
+    for row in rows:
+        job = jobs.get(row.job_id)
+        candidate = candidates.get(row.candidate_id)
+        if job is None or candidate is None:
+            # Mark as screened so the row doesn't stay pending forever
+            updates.append({'id': row.id, 'screening_score': 0.0,
+                            'ai_summary': 'Job or candidate profile no longer available.'})
+            continue
+        try:
+            match = matcher.calculate_match(candidate, job)
+            updates.append({
+                'id': row.id,
+                'screening_score': round(match['match_score'] * 100, 1),
+                'ai_summary': summarize_reasons(match['match_score'], match['match_reasons'])
+            })
+        except Exception as e:
+            attempts = (row.screening_attempts or 0) + 1
+            logger.error(f"Error screening application {row.id} (attempt {attempts}): {str(e)}")
+            failure = {'id': row.id, 'screening_attempts': attempts}
+            if attempts >= SCREENING_MAX_ATTEMPTS:
+                failure['ai_summary'] = f"Automatic screening failed after {attempts} attempts."
+            failures.append(failure)
+    return updates, failures
+
+
+@app.task(name='workers.tasks.screening.screen_pending_applications', bind=True, ignore_result=True)
+def screen_pending_applications_task(self, batch_size: int = SCREENING_BATCH_SIZE) -> dict:
+    """
+    Screen one micro-batch of unscreened applications
+    
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so concurrent flushes split
+    the backlog instead of scoring the same applications twice.
+    
+    Args:
+        batch_size: Applications per batch
+    
+    Returns:
+        Dictionary with batch status
+    """
+    try:
+        remaining = screening_debouncer.claim(SCREENING_KEY)
+    except Exception as e:
+        logger.warning(f"Screening debouncer unavailable, flushing now: {str(e)}")
+        remaining = 0
+    if remaining > 0:
+        self.apply_async(kwargs={'batch_size': batch_size}, countdown=remaining)
+        return {'status': 'deferred', 'countdown': remaining}
+    
+    db = SessionLocal()
+    try:
+        application = models.Application
+        rows = db.query(
+            application.id, application.job_id, application.candidate_id, application.screening_attempts
+        ).filter(
+            application.screening_score.is_(None),
+            application.screening_attempts < SCREENING_MAX_ATTEMPTS
+        ).order_by(application.applied_at).limit(batch_size).with_for_update(skip_locked=True).all()
+        
+        if not rows:
+            db.commit()
+            return {'status': 'success', 'screened': 0}
+        
+        updates, failures = score_applications(db, rows)
+        employers = {
+            job_id: (employer_id, user_id)
+            for job_id, employer_id, user_id in db.query(
+                models.Job.id, models.Job.employer_id, models.EmployerProfile.user_id
+            ).outerjoin(models.EmployerProfile, models.Job.employer_id == models.EmployerProfile.id).filter(
+                models.Job.id.in_({row.job_id for row in rows})
+            ).all()
+        }
+        candidate_users = dict(db.query(models.CandidateProfile.id, models.CandidateProfile.user_id).filter(
+            models.CandidateProfile.id.in_({row.candidate_id for row in rows})
+        ).all())
+        if updates:
+            db.execute(update(application), updates)
+        if failures:
+            db.execute(update(application), failures)
+        db.commit()
+        logger.info(f"Screened {len(updates)} applications ({len(failures)} failed)")
+        
+        # Let automation workflows act on the scores (e.g. shortlist or reject)
+        by_id = {row.id: row for row in rows}
+        events = []
+        for values in updates:
+            row = by_id[values['id']]
+            employer_id, employer_user_id = employers.get(row.job_id, (None, None))
+            candidate_user_id = candidate_users.get(row.candidate_id)
+            events.append({
+                'trigger_type': 'application_screened',
+                'employer_id': str(employer_id) if employer_id else None,
+                'payload': {
+                    'application_id': str(row.id),
+                    'job_id': str(row.job_id),
+                    'candidate_id': str(row.candidate_id),
+                    'screening_score': values['screening_score'],
+                    'employer_user_id': str(employer_user_id) if employer_user_id else None,
+                    'candidate_user_id': str(candidate_user_id) if candidate_user_id else None
+                }
+            })
+        publish_automation_events(events)
+        
+        if len(rows) == batch_size:
+            self.apply_async(kwargs={'batch_size': batch_size})
+        if SCREENING_LLM_SUMMARIES and os.getenv("OPENAI_API_KEY"):
+            for values in updates:
+                summarize_application_task.apply_async(args=[str(values['id'])])
+        
+        return {'status': 'success', 'screened': len(updates), 'failed': len(failures)}
+    
+    except Exception as e:
+        logger.error(f"Error screening applications: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'error': str(e)
+        }
+    finally:
+        db.close()
+
+
+@app.task(name='workers.tasks.screening.summarize_application', ignore_result=True,
+          rate_limit=SCREENING_LLM_RATE_LIMIT)
+def summarize_application_task(application_id: str) -> dict:
+    """
+    Replace an application's summary with an LLM-written one
+    
+    Args:
+        application_id: UUID of application
+    
+    Returns:
+        Dictionary with summary status
+    """
+    db = SessionLocal()
+    try:
+        application = db.query(models.Application).filter(models.Application.id == application_id).first()
+        if not application or not application.job or not application.candidate:
+            return {'status': 'error', 'message': 'Application not found'}
+        
+        job = application.job
+        candidate = application.candidate
+        prompt = (
+            f"Summarize in two sentences how well this candidate fits the job for a recruiter.\n"
+            f"Job: {job.title}\nRequirements: {', '.join(job.requirements or [])}\n"
+            f"Candidate skills: {', '.join(candidate.skills or [])}\n"
+            f"Experience: {candidate.experience_years or 0} years\n"
+            f"Screening score: {application.screening_score}/100 ({application.ai_summary})"
+        )
+        
+        response = get_llm_client().chat.completions.create(
+            model=os.getenv("AI_MODEL", "gpt-4-turbo-preview"),
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=150,
+            temperature=0.3
+        )
+        application.ai_summary = response.choices[0].message.content.strip()
+        db.commit()
+        
+        return {'status': 'success', 'application_id': application_id}
+    
+    except Exception as e:
+        logger.error(f"Error summarizing application {application_id}: {str(e)}")
+        db.rollback()
+        return {
+            'status': 'error',
+            'application_id': application_id,
+            'error': str(e)
+        }
+    finally:
+        db.close()
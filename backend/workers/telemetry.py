@@ -0,0 +1,238 @@
+"""
+Celery task telemetry
+Per task name (and queue), each worker records:
+    celery_task_queue_wait_seconds   Publish (or ETA) to start of execution
+    celery_task_runtime_seconds      Execution time, labelled with the final state
+    celery_task_payload_bytes        Serialized message body size as received
+    celery_task_retries_total, celery_task_failures_total
+
+Resume parse workers with RESUME_PARSER_INSTRUMENT on also export the
+per-stage parse histograms (ml_models/resume_parser/instrumentation.py):
+    resume_parse_stage_seconds       Time per parser stage
+    resume_parse_seconds             Whole-parse time
+    resume_parse_pages, resume_parse_characters, resume_parse_tokens
+
+Producers stamp a published_at header in before_task_publish; the worker
+measures the rest. Queue wait across hosts assumes reasonably synced clocks.
+
+Each worker serves the metrics for Prometheus on TASK_METRICS_PORT. Prefork
+children write to PROMETHEUS_MULTIPROC_DIR and the parent aggregates them, so
+one endpoint covers the whole pool. Telemetry is off when prometheus_client is
+not installed or TASK_METRICS_PORT is 0.
+"""
+import glob
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from celery.signals import (
+    before_task_publish, task_failure, task_postrun, task_prerun, task_received, task_retry,
+    worker_init, worker_process_shutdown
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_PORT = 9540
+DEFAULT_METRICS_DIR = "/tmp/talentai/prometheus"
+
+QUEUE_WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0)
+RUNTIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+PAYLOAD_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+PUBLISHED_AT_HEADER = "published_at"
+
+# Parse record fields exported as resume_parse_<name> histograms
+PARSE_SIZE_BUCKETS = {
+    "pages": (1, 2, 3, 5, 10, 20, 50),
+    "characters": (1000, 2500, 5000, 10000, 25000, 50000, 100000, 200000),
+    "tokens": (250, 500, 1000, 2500, 5000, 10000, 25000, 50000),
+}
+PARSE_SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class TaskMetrics:
+    """Prometheus collectors for task telemetry"""
+
+    def __init__(self, prometheus_client):
+        labels = ["task", "queue"]
+        self.queue_wait = prometheus_client.Histogram(
+            "celery_task_queue_wait_seconds", "Time from publish (or ETA) to execution start",
+            labels, buckets=QUEUE_WAIT_BUCKETS
+        )
+        self.runtime = prometheus_client.Histogram(
+            "celery_task_runtime_seconds", "Task execution time",
+            labels + ["state"], buckets=RUNTIME_BUCKETS
+        )
+        self.payload_bytes = prometheus_client.Histogram(
+            "celery_task_payload_bytes", "Serialized task message body size",
+            labels, buckets=PAYLOAD_BUCKETS
+        )
+        self.retries = prometheus_client.Counter("celery_task_retries", "Task retries", labels)
+        self.failures = prometheus_client.Counter("celery_task_failures", "Failed tasks", labels)
+
+        self.parse_stage = prometheus_client.Histogram(
+            "resume_parse_stage_seconds", "Resume parser time per stage",
+            ["stage"], buckets=PARSE_SECONDS_BUCKETS
+        )
+        self.parse_total = prometheus_client.Histogram(
+            "resume_parse_seconds", "Resume parser time per parse", buckets=PARSE_SECONDS_BUCKETS
+        )
+        self.parse_sizes = {
+            name: prometheus_client.Histogram(f"resume_parse_{name}", f"Parsed resume {name}", buckets=buckets)
+            for name, buckets in PARSE_SIZE_BUCKETS.items()
+        }
+
+    def observe_parse(self, record: Dict) -> None:
+        """Record one ParseMetrics record (see ParseMetrics.to_dict)"""
+        self.parse_total.observe(record.get("total_seconds", 0.0))
+        for name, entry in record.get("stages", {}).items():
+            self.parse_stage.labels(name).observe(entry["seconds"])
+        for name, histogram in self.parse_sizes.items():
+            if name in record:
+                histogram.observe(record[name])
+
+
+# Created in the worker parent by start_metrics_server (None in producers)
+metrics: Optional[TaskMetrics] = None
+
+# perf_counter at task_prerun, keyed by task id
+_started: Dict[str, float] = {}
+_started_lock = threading.Lock()
+
+
+def _queue(request) -> str:
+    delivery_info = getattr(request, "delivery_info", None) or {}
+    return delivery_info.get("routing_key") or "unknown"
+
+
+def _to_timestamp(value) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if hasattr(value, "timestamp"):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def start_metrics_server(port: Optional[int] = None, multiprocess_dir: Optional[str] = None) -> bool:
+    """
+    Create the collectors and serve them over HTTP
+
+    Must run before the pool forks so children share the multiprocess setup.
+    Defaults come from TASK_METRICS_PORT and PROMETHEUS_MULTIPROC_DIR, read
+    here so values loaded from .env at app import apply.
+
+    Returns:
+        True if metrics are being served
+    """
+    global metrics
+    if port is None:
+        port = int(os.getenv("TASK_METRICS_PORT", DEFAULT_METRICS_PORT))
+    if multiprocess_dir is None:
+        multiprocess_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR", DEFAULT_METRICS_DIR)
+    if metrics is not None or not port:
+        return metrics is not None
+
+    if multiprocess_dir:
+        # prometheus_client reads this on import
+        os.makedirs(multiprocess_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(multiprocess_dir, "*.db")):
+            os.remove(stale)
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = multiprocess_dir
+
+    try:
+        import prometheus_client
+        from prometheus_client import multiprocess
+    except ImportError:
+        logger.warning("prometheus_client is not installed; task telemetry disabled")
+        return False
+
+    metrics = TaskMetrics(prometheus_client)
+    registry = None
+    if multiprocess_dir:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry, path=multiprocess_dir)
+    prometheus_client.start_http_server(port, registry=registry or prometheus_client.REGISTRY)
+    logger.info(f"Serving task metrics on :{port}")
+    return True
+
+
+@worker_init.connect
+def _start_worker_metrics(**kwargs):
+    try:
+        start_metrics_server()
+    except Exception as e:
+        logger.error(f"Could not start task metrics server: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def _mark_child_dead(pid=None, **kwargs):
+    if metrics is None or "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(pid or os.getpid())
+
+
+@before_task_publish.connect
+def _stamp_published_at(headers=None, **kwargs):
+    """Record when the message left the producer"""
+    if headers is not None:
+        headers.setdefault(PUBLISHED_AT_HEADER, time.time())
+
+
+@task_received.connect
+def _observe_payload(request=None, **kwargs):
+    if metrics is None or request is None:
+        return
+    body = getattr(request, "body", None)
+    if isinstance(body, (bytes, bytearray, str)):
+        metrics.payload_bytes.labels(request.name, _queue(request)).observe(len(body))
+
+
+@task_prerun.connect
+def _observe_queue_wait(task_id=None, task=None, **kwargs):
+    if metrics is None or task is None:
+        return
+    now = time.time()
+    with _started_lock:
+        _started[task_id] = time.perf_counter()
+
+    request = task.request
+    published_at = _to_timestamp(getattr(request, PUBLISHED_AT_HEADER, None))
+    if published_at is None:
+        return
+    # Countdown/ETA tasks wait on purpose; only time past the ETA counts
+    eta = _to_timestamp(getattr(request, "eta", None))
+    ready_at = max(published_at, eta) if eta else published_at
+    metrics.queue_wait.labels(task.name, _queue(request)).observe(max(now - ready_at, 0.0))
+
+
+@task_postrun.connect
+def _observe_runtime(task_id=None, task=None, state=None, **kwargs):
+    if metrics is None or task is None:
+        return
+    with _started_lock:
+        started = _started.pop(task_id, None)
+    if started is not None:
+        metrics.runtime.labels(task.name, _queue(task.request), state or "UNKNOWN").observe(
+            time.perf_counter() - started
+        )
+
+
+@task_retry.connect
+def _count_retry(sender=None, request=None, **kwargs):
+    if metrics is not None and sender is not None:
+        metrics.retries.labels(sender.name, _queue(request)).inc()
+
+
+@task_failure.connect
+def _count_failure(sender=None, **kwargs):
+    if metrics is not None and sender is not None:
+        metrics.failures.labels(sender.name, _queue(sender.request)).inc()